@@ -0,0 +1,110 @@
+"""
+Event decode benchmark, eager fixup() against lazy_decode.
+A listing of synthetic events shaped like an events.list response is decoded
+into Event objects both ways.  Reported for each are the decode time, the time
+to then read a couple of fields from every event as a typical consumer would,
+and the memory held by the decoded list as measured by tracemalloc.
+
+    python benchmarks/decode.py [--events N] [--runs N]
+"""
+
+import argparse
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from brettgws.calendar import Event
+from brettgws.resources import GoogleWorkSpaceResourceBase
+
+ZONES = ("America/New_York", "Europe/London", "Asia/Tokyo", "Australia/Sydney")
+
+def listing(count: int) -> list[dict]:
+    items = []
+    for i in range(count):
+        day = 1 + i % 28
+        hour = 8 + i % 10
+        tz = ZONES[i % len(ZONES)]
+        e = {'kind': "calendar#event", 'etag': f'"{3000000000000000 + i}"', 'id': f"evt{i:08d}",
+             'status': "confirmed", 'htmlLink': f"https://www.google.com/calendar/event?eid=evt{i:08d}",
+             'created': "2024-01-02T03:04:05.000Z", 'updated': "2024-02-03T04:05:06.789Z",
+             'summary': f"Meeting {i}", 'creator': {'email': "someone@example.com", 'self': True},
+             'organizer': {'email': "someone@example.com", 'self': True},
+             'iCalUID': f"evt{i:08d}@google.com", 'sequence': 0,
+             'reminders': {'useDefault': True}, 'eventType': "default"}
+        if i % 10 == 0:
+            e['start'] = {'date': f"2024-03-{day:02d}"}
+            e['end'] = {'date': f"2024-03-{day + 1:02d}"}
+        else:
+            e['start'] = {'dateTime': f"2024-03-{day:02d}T{hour:02d}:00:00-05:00", 'timeZone': tz}
+            e['end'] = {'dateTime': f"2024-03-{day:02d}T{hour:02d}:30:00-05:00", 'timeZone': tz}
+        if i % 7 == 0:
+            e['recurringEventId'] = f"rec{i:08d}"
+            e['originalStartTime'] = dict(e['start'])
+        items.append(e)
+    return items
+
+def set_lazy(lazy: bool) -> None:
+    GoogleWorkSpaceResourceBase.lazy_decode = lazy
+
+def decode(items: list[dict]) -> list[Event]:
+    return [Event(**e) for e in items]
+
+def touch(events: list[Event]) -> int:
+    # what a listing consumer typically looks at
+    n = 0
+    for e in events:
+        if e.id and e.start.values()[0] is not None:
+            n += 1
+    return n
+
+def run(items: list[dict], lazy: bool, runs: int) -> dict:
+    set_lazy(lazy)
+    decode_s = []
+    touch_s = []
+    for _ in range(runs):
+        gc.collect()
+        t = time.perf_counter()
+        events = decode(items)
+        decode_s.append(time.perf_counter() - t)
+        t = time.perf_counter()
+        touch(events)
+        touch_s.append(time.perf_counter() - t)
+        del events
+    gc.collect()
+    tracemalloc.start()
+    events = decode(items)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return {'decode': statistics.median(decode_s), 'touch': statistics.median(touch_s), 'memory': held}
+
+def main(argv: list[str]|None = None) -> int:
+    parser = argparse.ArgumentParser(description="brettgws Event decode benchmark")
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    items = listing(args.events)
+    # both paths should agree on every field once decoded
+    set_lazy(False)
+    eager = decode(items[:1000])
+    set_lazy(True)
+    lazy = decode(items[:1000])
+    assert eager == lazy, "lazy decode differs from eager"
+
+    print(f"{args.events} events, median of {args.runs} runs")
+    print(f"{'mode':<8}{'decode s':>10}{'events/s':>12}{'touch s':>10}{'MiB held':>10}")
+    for mode, is_lazy in (("eager", False), ("lazy", True)):
+        r = run(items, is_lazy, args.runs)
+        print(f"{mode:<8}{r['decode']:>10.3f}{args.events / r['decode']:>12.0f}"
+              f"{r['touch']:>10.3f}{r['memory'] / (1 << 20):>10.1f}")
+    set_lazy(False)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Import time benchmark for the brettgws modules.
+Each module is imported in a fresh interpreter under python -X importtime and the
+cumulative time for the module is taken from the last line of the report.  The
+median over a number of runs is reported along with whether any of the heavy
+Google client modules were pulled in.
+
+    python benchmarks/importtime.py [--runs N] [--max-ms MS] [module ...]
+
+Exits non-zero if a module's median is over --max-ms or if it imported one of
+the heavy modules.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+MODULES = (
+    "brettgws",
+    "brettgws.sheets",
+    "brettgws.sheets.a1",
+    "brettgws.sheets.spreadsheet",
+    "brettgws.calendar",
+    "brettgws.access",
+)
+
+# these should only be imported once a connection or service is needed
+HEAVY = (
+    "google.auth",
+    "google.oauth2",
+    "google_auth_oauthlib",
+    "googleapiclient",
+    "httplib2",
+    "requests",
+    "httpx",
+    "asyncio",
+)
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(SRC), env.get("PYTHONPATH", "")) if p)
+    # bytecode should already be there from a warm up run, don't let writing it skew things
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+def import_time_us(module: str) -> int:
+    """
+    Cumulative import time of module in microseconds from a fresh interpreter.
+    """
+    r = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                       env=_env(), capture_output=True, text=True, check=True)
+    last = r.stderr.strip().splitlines()[-1]
+    return int(last.split("|")[1])
+
+def heavy_imports(module: str) -> list[str]:
+    """
+    Which of the heavy modules get imported along with module.
+    """
+    code = (f"import sys, {module}\n"
+            f"print('\\n'.join(m for m in {HEAVY!r} if m in sys.modules))")
+    r = subprocess.run([sys.executable, "-c", code], env=_env(),
+                       capture_output=True, text=True, check=True)
+    return r.stdout.split()
+
+def main(argv: list[str]|None = None) -> int:
+    parser = argparse.ArgumentParser(description="brettgws import time benchmark")
+    parser.add_argument("--runs", type=int, default=11)
+    parser.add_argument("--max-ms", type=float, default=None)
+    parser.add_argument("modules", nargs="*", default=list(MODULES))
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'module':<32}{'median ms':>10}{'min ms':>10}  heavy imports")
+    for m in args.modules:
+        # warm up so bytecode compilation isn't measured
+        import_time_us(m)
+        times = [import_time_us(m) / 1000 for _ in range(args.runs)]
+        heavy = heavy_imports(m)
+        med = statistics.median(times)
+        print(f"{m:<32}{med:>10.1f}{min(times):>10.1f}  {','.join(heavy) if heavy else '-'}")
+        if heavy or (args.max_ms is not None and med > args.max_ms):
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,161 @@
 
 from collections.abc import Iterable
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
+import contextvars
 import json
 import copy
+import datetime
+import logging
+import threading
+import weakref
 from functools import wraps
+from typing import TYPE_CHECKING
 
-import google.auth
-import google.auth.exceptions
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build, Resource
-import googleapiclient.discovery_cache as gws_discovery_cache
+from . import discovery
+from .transport import HttpTransport
+from .aio import AsyncTransport
+from .credstore import CredentialStore
+from .retry import RetryPolicy
+from .quota import QuotaLimiter
+from .metrics import Metrics
+from .etag import ETagCache
+
+# the Google client modules are heavy to import so are only pulled in
+# when actually connecting or building a service
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+    from .aio import AsyncService
+
+class _ServicePool():
+    """
+    Per-thread registry of built services.
+    A googleapiclient Resource owns its own httplib2.Http which is not thread safe, so
+    each thread is handed its own Resource while the credentials are shared.  When a thread
+    exits its services go back to an idle pool, bounded by max_size per service, and are
+    handed to the next thread that asks rather than building a new one.
+    """
+    def __init__(self, max_size: int = 8) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._idle = {}
+        self._generation = 0
+        self.max_size = max_size
+
+    def _release(self, generation: int, services: dict) -> None:
+        """
+        A thread has exited, park its services for reuse if they are still current.
+        """
+        with self._lock:
+            if generation != self._generation:
+                return
+            for id, s in services.items():
+                idle = self._idle.setdefault(id, [])
+                if len(idle) < self.max_size:
+                    idle.append(s)
+
+    @staticmethod
+    def _released(pool: "weakref.ref[_ServicePool]", generation: int, services: dict) -> None:
+        """
+        Thread exit finalizer.  Only holds the pool weakly, otherwise a pool that is dropped
+        would be kept alive along with all of its services by every thread that used it.
+        """
+        p = pool()
+        if p is not None:
+            p._release(generation, services)
+
+    @property
+    def services(self) -> dict:
+        """
+        Services bound to the calling thread.
+        """
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            local.services = {}
+            local.generation = self._generation
+            # thread local storage is released on thread exit, or when the pool goes,
+            # which fires the finalizer
+            local.sentinel = threading.local()
+            weakref.finalize(local.sentinel, _ServicePool._released, weakref.ref(self),
+                             local.generation, local.services)
+        return local.services
+
+    def get(self, id: str) -> "Resource|None":
+        """
+        Service for the calling thread, reusing an idle one if available.
+        """
+        services = self.services
+        s = services.get(id, None)
+        if s is None:
+            with self._lock:
+                idle = self._idle.get(id, None)
+                if idle:
+                    s = idle.pop()
+            if s is not None:
+                services[id] = s
+        return s
+
+    def put(self, id: str, s: "Resource") -> None:
+        self.services[id] = s
+
+    @property
+    def generation(self) -> int:
+        """
+        Bumped by clear(), anything built for an earlier generation is stale.
+        """
+        return self._generation
+
+    def clear(self) -> None:
+        """
+        Drop all services across all threads.
+        Threads pick up the new generation on their next access.
+        """
+        with self._lock:
+            self._generation += 1
+            self._idle = {}
+
+# the impersonated user for the current thread or task, see gws.impersonate()
+_subject = contextvars.ContextVar("brettgws_subject", default=None)
+
+class _Delegate():
+    """
+    Credentials and services for a subject impersonated through domain-wide delegation.
+    """
+    def __init__(self, base, subject: str, pool_size: int) -> None:
+        self.base = base
+        self.creds = base.with_subject(subject)
+        self.pool = _ServicePool(pool_size)
+
+class _Refresher(threading.Thread):
+    """
+    Background thread renewing the access token shortly before it expires
+    so requests never stall on a refresh.
+    """
+    RETRY_INTERVAL = 30
+    IDLE_INTERVAL = 60
+
+    def __init__(self, access, margin: float) -> None:
+        super().__init__(name="gws-refresher", daemon=True)
+        self._access = access
+        self.margin = margin
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        delay = 0
+        while not self._stop_event.wait(delay):
+            try:
+                self._access.renew(self.margin)
+                delay = self._access.renew_due(self.margin)
+                if delay is None:
+                    delay = self.IDLE_INTERVAL
+            except Exception:
+                logging.getLogger(__name__).warning("background credential refresh failed, retrying in %ss",
+                                                    self.RETRY_INTERVAL, exc_info=True)
+                delay = self.RETRY_INTERVAL
 
 class __GWSAccess():
     """
@@ -123,7 +267,7 @@ class __GWSAccess():
         """Reset the access state."""
         self.__creds = None
         self.__scopes = []
-        self.__services = {}
+        self.__clear_services()
 
     @property
     def connected(self) -> bool:
@@ -173,7 +317,7 @@ class __GWSAccess():
             self.refresh()
         else:
             self.__creds = None
-            self.__services = {}
+            self.__clear_services()
     
     def append_scopes(self, *args) -> bool:
         """
@@ -204,11 +348,284 @@ class __GWSAccess():
         return self.__creds
     
     @property
-    def services(self) -> dict[str,dict]:
+    def services(self) -> "dict[str,Resource]":
+        """
+        Current active services for the calling thread.  Can be empty.
+        """
+        return self.__pool.services
+
+    def __clear_services(self) -> None:
+        """
+        Drop every built service, including those of impersonated subjects.
+        """
+        self.__pool.clear()
+        with self.__delegate_lock:
+            self.__delegates.clear()
+        self.__etag_cache.clear()
+
+    @property
+    def service_pool_size(self) -> int:
+        """
+        Maximum number of idle services kept per service for reuse by new threads.
+        """
+        return self.__pool.max_size
+
+    @service_pool_size.setter
+    def service_pool_size(self, value: int) -> None:
+        self.__pool.max_size = max(0, int(value))
+
+    @property
+    def transport(self) -> HttpTransport:
+        """
+        The HTTP transport services are built on.
+        """
+        return self.__transport
+
+    @transport.setter
+    def transport(self, value: HttpTransport|dict|str|None) -> None:
+        """
+        Set the transport from an instance, a type name or a config dict.
+        Services already built stay on the old transport so drop them.
+        """
+        t = HttpTransport.from_config(value)
+        if t is not self.__transport:
+            self.__clear_services()
+            self.__transport.close()
+            self.__transport = t
+
+    @property
+    def service_account_file(self) -> Path|None:
+        """
+        Path to a service account key file.  When set the service account is used
+        for authentication in place of the client secrets and OAuth flow.
+        """
+        return self.__service_account
+
+    @service_account_file.setter
+    def service_account_file(self, value: Path|str|None) -> None:
+        val = value if value is None or isinstance(value, Path) else Path(str(value))
+        if val != self.__service_account:
+            self.__service_account = val
+            if self.connected:
+                self.connect()
+
+    @property
+    def subject(self) -> str|None:
+        """
+        User the service account acts as by default through domain-wide delegation.
+        """
+        return self.__subject
+
+    @subject.setter
+    def subject(self, value: str|None) -> None:
+        val = value if value is None else str(value)
+        if val != self.__subject:
+            self.__subject = val
+            if self.connected and self.__service_account is not None:
+                self.connect()
+
+    @property
+    def subject_pool_size(self) -> int:
+        """
+        Maximum number of impersonated subjects whose credentials and services
+        are kept, the least recently used are dropped past this.
+        """
+        return self.__subject_pool_size
+
+    @subject_pool_size.setter
+    def subject_pool_size(self, value: int) -> None:
+        self.__subject_pool_size = max(1, int(value))
+        with self.__delegate_lock:
+            self.__evict_delegates()
+
+    def __evict_delegates(self) -> None:
+        """
+        Drop the least recently used subjects past subject_pool_size along with
+        their services.  Call with the delegate lock held.
+        """
+        while len(self.__delegates) > self.__subject_pool_size:
+            subject, d = self.__delegates.popitem(last=False)
+            d.pool.clear()
+            for services in list(self.__async_services.values()):
+                for key in [k for k in list(services) if k[0] == subject]:
+                    services.pop(key, None)
+
+    @contextmanager
+    def impersonate(self, subject: str|None):
+        """
+        Context manager for making requests as another user of the domain via
+        domain-wide delegation of the service account.  Applies to the current
+        thread or asyncio task, so workers serving different users can run side by side:
+
+            with gws.impersonate('someone@example.com'):
+                events = Event.list()
+        """
+        token = _subject.set(None if subject is None else str(subject))
+        try:
+            yield self
+        finally:
+            _subject.reset(token)
+
+    def __session(self) -> tuple:
+        """
+        Credentials, service pool and subject for the calling context.
+        """
+        subject = _subject.get()
+        if subject is None or subject == self.__subject:
+            return self.__creds, self.__pool, None
+        base = self.__creds
+        if not hasattr(base, 'with_subject'):
+            raise ValueError("Impersonating a subject requires service account credentials")
+        with self.__delegate_lock:
+            d = self.__delegates.get(subject, None)
+            if d is None or d.base is not base:
+                d = _Delegate(base, subject, self.__pool.max_size)
+                self.__delegates[subject] = d
+                self.__evict_delegates()
+            else:
+                self.__delegates.move_to_end(subject)
+        return d.creds, d.pool, subject
+
+    @property
+    def async_transport(self) -> AsyncTransport:
+        """
+        The async HTTP transport used by services from get_async_service().
+        """
+        return self.__async_transport
+
+    @async_transport.setter
+    def async_transport(self, value: AsyncTransport|dict|None) -> None:
+        self.__async_transport = AsyncTransport.from_config(value)
+        self.__async_services = weakref.WeakKeyDictionary()
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
         """
-        Current active services.  Can be empty.
+        How requests sent through execute() and the async services are retried,
+        see brettgws.retry.  Set with a RetryPolicy or a dict of its arguments.
         """
-        return self.__services
+        return self.__retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, value: RetryPolicy|dict|None) -> None:
+        self.__retry_policy = RetryPolicy.from_config(value)
+
+    @property
+    def quota(self) -> QuotaLimiter:
+        """
+        The client side quota limiter requests are paced by, see brettgws.quota.
+        Set with a QuotaLimiter or a dict of its arguments.
+        """
+        return self.__quota
+
+    @quota.setter
+    def quota(self, value: QuotaLimiter|dict|None) -> None:
+        self.__quota = QuotaLimiter.from_config(value)
+
+    @property
+    def current_subject(self) -> str|None:
+        """
+        The subject impersonated in the calling context, None for the connected user.
+        """
+        subject = _subject.get()
+        return None if subject == self.__subject else subject
+
+    @property
+    def etag_cache(self) -> ETagCache:
+        """
+        Decoded objects by etag for conditional requests, see brettgws.etag.
+        Off until enabled, set with an ETagCache or a dict of its arguments.
+        """
+        return self.__etag_cache
+
+    @etag_cache.setter
+    def etag_cache(self, value: ETagCache|dict|None) -> None:
+        self.__etag_cache = ETagCache.from_config(value)
+
+    @property
+    def metrics(self) -> Metrics:
+        """
+        Where a record of every call sent through execute() and the async services
+        goes, add sinks to it to collect them, see brettgws.metrics.
+        """
+        return self.__metrics
+
+    def execute(self, request, page: int|None = None):
+        """
+        Send a request built from a service, paced by the quota and retrying per
+        the retry_policy.  Use this in place of request.execute().
+        page is the page number for requests that are part of a listing.
+        """
+        policy = self.__retry_policy.for_request(request)
+        quota = self.__quota
+        user = self.current_subject
+        call = self.__metrics.start(request, page)
+        def send():
+            quota.acquire(request, user)
+            if call is not None:
+                call.attempts += 1
+            return request.execute()
+        try:
+            response = policy.call(send)
+        except Exception as e:
+            if call is not None:
+                call.finish(e)
+            raise
+        if call is not None:
+            call.finish()
+        return response
+
+    @property
+    def discovery_dir(self) -> Path|None:
+        """
+        Directory of discovery documents to use ahead of the bundled ones,
+        see brettgws.discovery for regenerating them.
+        """
+        return self.__discovery_dir
+
+    @discovery_dir.setter
+    def discovery_dir(self, value: Path|str|None) -> None:
+        val = value if value is None or isinstance(value, Path) else Path(str(value))
+        if val != self.__discovery_dir:
+            self.__clear_services()
+            self.__discovery_dir = val
+
+    @property
+    def last_refresh(self) -> datetime.datetime|None:
+        """
+        When the access token was last obtained or renewed, UTC.
+        """
+        return self.__last_refresh
+
+    @property
+    def auto_refresh(self) -> bool:
+        """
+        Is the background refresher renewing the access token ahead of expiry?
+        """
+        return self.__refresher is not None
+
+    @auto_refresh.setter
+    def auto_refresh(self, value: bool) -> None:
+        if value:
+            self.start_refresher(self.refresh_margin)
+        else:
+            self.stop_refresher()
+
+    def start_refresher(self, margin: float|None = None) -> None:
+        """
+        Start renewing the access token in the background margin seconds before it expires.
+        The credentials are refreshed in place so services already built keep working.
+        """
+        if margin is not None:
+            self.refresh_margin = float(margin)
+        self.stop_refresher()
+        self.__refresher = _Refresher(self, self.refresh_margin)
+        self.__refresher.start()
+
+    def stop_refresher(self) -> None:
+        if self.__refresher is not None:
+            self.__refresher.stop()
+            self.__refresher = None
 
     @property
     def config(self) -> dict:
@@ -221,7 +638,19 @@ class __GWSAccess():
             'cache': self.__cache,
             'scopes': self.__scopes,
             'server': self.auth_server,
-            'port': self.auth_port
+            'port': self.auth_port,
+            'pool_size': self.service_pool_size,
+            'transport': self.__transport.config,
+            'async_transport': self.__async_transport.config,
+            'retry': self.__retry_policy.config,
+            'quota': self.__quota.config,
+            'etag_cache': self.__etag_cache.config,
+            'discovery_dir': self.__discovery_dir,
+            'auto_refresh': self.auto_refresh,
+            'refresh_margin': self.refresh_margin,
+            'service_account': self.__service_account,
+            'subject': self.__subject,
+            'subject_pool_size': self.__subject_pool_size
         }
         return config
 
@@ -238,6 +667,33 @@ class __GWSAccess():
         v = config.get('server', None)
         if v is not None:
             self.auth_server = str(v)
+        v = config.get('pool_size', None)
+        if v is not None:
+            self.service_pool_size = v
+        v = config.get('transport', None)
+        if v is not None:
+            self.transport = v
+        v = config.get('async_transport', None)
+        if v is not None:
+            self.async_transport = v
+        v = config.get('retry', None)
+        if v is not None:
+            self.retry_policy = v
+        v = config.get('quota', None)
+        if v is not None:
+            self.quota = v
+        v = config.get('etag_cache', None)
+        if v is not None:
+            self.etag_cache = v
+        v = config.get('discovery_dir', None)
+        if v is not None:
+            self.discovery_dir = v
+        v = config.get('refresh_margin', None)
+        if v is not None:
+            self.refresh_margin = float(v)
+        v = config.get('auto_refresh', None)
+        if v is not None:
+            self.auto_refresh = bool(v)
         v = config.get('scopes', [])
         if v:
             self.__scopes = v
@@ -250,6 +706,17 @@ class __GWSAccess():
         if v is not None:
             self.__secrets = Path(v)
             reconnect = True
+        v = config.get('service_account', None)
+        if v is not None:
+            self.__service_account = Path(v)
+            reconnect = True
+        v = config.get('subject', None)
+        if v is not None:
+            self.__subject = str(v)
+            reconnect = True
+        v = config.get('subject_pool_size', None)
+        if v is not None:
+            self.subject_pool_size = v
         v = config.get('auth_prompt_msg', None)
         if v is not None:
             self.auth_prompt_msg = str(v)
@@ -267,7 +734,7 @@ class __GWSAccess():
     def developer_key(self, value: str|None) -> None:
         v = value if value is None else str(value)
         if v != self.__developer_key:
-            self.__services = {}
+            self.__clear_services()
             self.__developer_key = v
 
     
@@ -275,12 +742,31 @@ class __GWSAccess():
         """
         Reset all connection state to defaults.
         """
+        if getattr(self, '_GWSAccess__refresher', None) is not None:
+            self.stop_refresher()
+        self.__refresher = None
+        self.__store = None
+        self.__last_refresh = None
+        self.refresh_margin = 300.0
         self.__secrets = self.__DEFAULT_SECRETS
         self.__cache = self.__DEFAULT_CACHE
-        self.__discovery_cache = gws_discovery_cache.autodetect()
+        self.__discovery_cache = None
+        self.__discovery_dir = None
         self.__creds = None
         self.__scopes = []
-        self.__services = {}
+        self.__pool = _ServicePool()
+        self.__delegates = OrderedDict()
+        self.__delegate_lock = threading.Lock()
+        self.__subject_pool_size = 128
+        self.__service_account = None
+        self.__subject = None
+        self.__transport = HttpTransport.from_config(None)
+        self.async_transport = None
+        self.retry_policy = None
+        self.quota = None
+        self.__metrics = Metrics()
+        self.etag_cache = None
+        self.__lock = threading.RLock()
         self.__developer_key = None
         self.auth_server = 'localhost'
         self.auth_port = 0
@@ -297,82 +783,248 @@ class __GWSAccess():
             return self.connect()
         return True
 
+    def __cred_store(self) -> CredentialStore:
+        """
+        The store for the current cred_cache path.
+        """
+        cache = Path(self.__cache)
+        if self.__store is None or self.__store.path != cache:
+            self.__store = CredentialStore(cache)
+        return self.__store
+
+    def __save_creds(self, store: CredentialStore) -> None:
+        """
+        Write the user credentials to the cache including the access token, so
+        other processes can reuse it until it expires rather than refreshing.
+        Anything without a refresh token (e.g. cloud default credentials) isn't cached.
+        """
+        creds = self.__creds
+        if not getattr(creds, 'refresh_token', None) or not getattr(creds, 'client_id', None):
+            return
+        # whoa it took a while to track through what was needed for a refresh
+        # scopes isnt even necessary, that's just to see what the scopes were
+        # we could feed them back in to from_authorized_user_file but the caller may have different scopes in mind
+        user_info = {'refresh_token': creds.refresh_token, 'client_id': creds.client_id,
+                     'client_secret': creds.client_secret, 'scopes': copy.copy(self.__scopes),
+                     'token': creds.token,
+                     'expiry': creds.expiry.isoformat(timespec='seconds') + 'Z' if creds.expiry else None}
+        store.save(user_info)
+
+    def __adopt_creds(self, info: dict|None, margin: float) -> bool:
+        """
+        Take the access token from cached info if someone else has already refreshed
+        it and it is good for more than margin seconds.
+        """
+        creds = self.__creds
+        if (not info or not info.get('token') or not info.get('expiry') or
+                info.get('token') == creds.token or
+                info.get('refresh_token') != getattr(creds, 'refresh_token', None)):
+            return False
+        expiry = datetime.datetime.fromisoformat(str(info['expiry']).rstrip('Z')).replace(tzinfo=None)
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        if (expiry - now).total_seconds() <= margin:
+            return False
+        creds.token = info['token']
+        creds.expiry = expiry
+        return True
+
+    def renew_due(self, margin: float = 0) -> float|None:
+        """
+        Seconds until the access token should be renewed to keep margin seconds
+        ahead of expiry, 0 if already due or None if there is nothing to renew.
+        """
+        creds = self.__creds
+        if creds is None or getattr(creds, 'expiry', None) is None:
+            return None
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return max(0.0, (creds.expiry - now).total_seconds() - margin)
+
+    def renew(self, margin: float = 0) -> bool:
+        """
+        Refresh the access token in place if it expires within margin seconds.
+        Unlike connect() this keeps the built services, they share the credentials
+        object so pick up the new token.  Returns False if there was nothing to renew.
+        """
+        from google.auth.transport.requests import Request
+        with self.__lock:
+            due = self.renew_due(margin)
+            if due is None:
+                return False
+            if due <= 0 or not self.__creds.valid:
+                store = self.__cred_store()
+                with store.lock():
+                    # another thread or process may have beaten us to it
+                    if not self.__adopt_creds(store.load(), margin):
+                        self.__creds.refresh(Request())
+                        self.__save_creds(store)
+                self.__last_refresh = datetime.datetime.now(datetime.timezone.utc)
+        return self.connected
+
     def connect(self) -> bool:
         """
         Establish a new authentication session.
         If successful will save the credentials in the cache file to reuse
         on subsequent invocations.
         """
-        # TODO: Set up for service accounts
+        with self.__lock:
+            return self.__connect()
+
+    def __connect(self) -> bool:
+        import google.auth
+        import google.auth.exceptions
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         self.__creds = None
-        self.__services = {}
+        self.__clear_services()
         if not self.__scopes:
             return
         requested_scopes = copy.copy(self.__scopes)
-        if (self.__cache.exists() and self.__cache.is_file()):
-            # need to check what scopes are associated with this cache
-            # I'm not sure why GWS doesn't resolve that when you refresh,
-            # but there we are
-            cf = self.__cache.resolve()
-            with open(cf, 'r', encoding='utf-8') as f:
-                j = json.load(f)
+        if self.__service_account is not None:
+            return self.__connect_service_account(requested_scopes)
+        store = self.__cred_store()
+        # hold the cache lock throughout so a connect racing in another thread or
+        # process waits for this one and then picks up the result rather than
+        # going off to refresh or authorize as well
+        with store.lock():
+            j = store.load()
+            if j is not None:
+                # need to check what scopes are associated with this cache
+                # I'm not sure why GWS doesn't resolve that when you refresh,
+                # but there we are
                 scopes = j.get('scopes',[])
                 if not all(s in scopes for s in requested_scopes):
-                    self.__cache.unlink()
+                    store.remove()
                 else:
-                    self.__creds = Credentials.from_authorized_user_file(cf, requested_scopes)
-        if not self.connected:
-            if self.__creds and self.__creds.refresh_token:
-                try:
-                    self.__creds.refresh(Request())
-                except Exception as e:
-                    print(f'failed to refresh stored creds: {str(e)}...deleting cred cache and re-authorizing')
-                finally:
-                    if not self.connected:
-                        self.__cache.unlink()
-
+                    self.__creds = Credentials.from_authorized_user_info(j, requested_scopes)
             if not self.connected:
-                if self.__secrets.exists() and self.__secrets.is_file():
-                    flow = InstalledAppFlow.from_client_secrets_file(self.__secrets, requested_scopes)
-                    self.__creds = flow.run_local_server(self.auth_server, self.auth_port,
-                                                    authorization_prompt_message=self.auth_prompt_msg,
-                                                    success_message=self.auth_flow_success_msg
-                                                    )
-                else:
-                    # final hail mary
+                if self.__creds and self.__creds.refresh_token:
                     try:
-                        # this will look at the GOOGLE_APPLICATION_CREDENTIALS envvar and
-                        # other cloud default locations
-                        self.__creds, _ = google.auth.default(requested_scopes)
-                    except google.auth.exceptions.DefaultCredentialsError:
-                        pass
+                        self.__creds.refresh(Request())
+                    except Exception as e:
+                        print(f'failed to refresh stored creds: {str(e)}...deleting cred cache and re-authorizing')
+                    finally:
+                        if not self.connected:
+                            store.remove()
 
-            if self.connected:
-                # whoa it took a while to track through what was needed for a refresh
-                # scopes isnt even necessary, that's just to see what the scopes were
-                # we could feed them back in to from_authorized_user_file but the caller may have different scopes in mind
-                user_info = {'refresh_token': self.__creds.refresh_token, 'client_id': self.__creds.client_id, 
-                            'client_secret': self.__creds.client_secret, 'scopes': requested_scopes}
-                with open(self.__cache.resolve(), 'w', encoding='utf-8') as f:
-                    json.dump(user_info, f, ensure_ascii=False, indent=2)
+                if not self.connected:
+                    secrets = Path(self.__secrets)
+                    if secrets.exists() and secrets.is_file():
+                        flow = InstalledAppFlow.from_client_secrets_file(secrets, requested_scopes)
+                        self.__creds = flow.run_local_server(self.auth_server, self.auth_port,
+                                                        authorization_prompt_message=self.auth_prompt_msg,
+                                                        success_message=self.auth_flow_success_msg
+                                                        )
+                    else:
+                        # final hail mary
+                        try:
+                            # this will look at the GOOGLE_APPLICATION_CREDENTIALS envvar and
+                            # other cloud default locations
+                            self.__creds, _ = google.auth.default(requested_scopes)
+                        except google.auth.exceptions.DefaultCredentialsError:
+                            pass
+
+                if self.connected:
+                    self.__last_refresh = datetime.datetime.now(datetime.timezone.utc)
+                    self.__save_creds(store)
         return self.connected
     
-    def get_service(self, name: str, version: str) -> Resource|None:
+    def __connect_service_account(self, requested_scopes: list[str]) -> bool:
+        """
+        Service accounts need no flow or cache, just the key file.
+        """
+        from google.auth.transport.requests import Request
+        from google.oauth2 import service_account
+        creds = service_account.Credentials.from_service_account_file(str(self.__service_account),
+                                                                      scopes=requested_scopes)
+        if self.__subject:
+            creds = creds.with_subject(self.__subject)
+        creds.refresh(Request())
+        self.__creds = creds
+        if self.connected:
+            self.__last_refresh = datetime.datetime.now(datetime.timezone.utc)
+        return self.connected
+
+    def __reconnect(self) -> bool:
+        """
+        An expired token is renewed in place, only falling back to a full
+        connect() if that isn't possible.
+        """
+        try:
+            if self.__creds is not None and self.renew():
+                return True
+        except Exception:
+            logging.getLogger(__name__).warning("failed to renew creds, reconnecting", exc_info=True)
+        return self.connect()
+
+    def get_service(self, name: str, version: str) -> "Resource|None":
         """
         Build the requested service if not already available, connecting if required.
+        Each thread gets its own service, sharing the one set of credentials.
+        Within gws.impersonate() the service acts as that subject.
         Can return None if no connection present. 
         """
         if not self.connected:
-            self.connect()
+            with self.__lock:
+                if not self.connected:
+                    self.__reconnect()
         if not self.connected:
             return None
+        creds, pool, _ = self.__session()
         id = f'{name}:{version}'
-        s = self.__services.get(id, None)
+        s = pool.get(id)
         if s is None:
-            s = build(name, version, credentials=self.__creds,
-                      developerKey=self.__developer_key, cache=self.__discovery_cache)
+            s = self.__build(name, version, creds)
             if s:
-                self.__services[id] = s
+                pool.put(id, s)
+        return s
+
+    def __build(self, name: str, version: str, creds) -> "Resource|None":
+        """
+        Build a service on the transport for the credentials.
+        """
+        from googleapiclient.discovery import build, build_from_document
+        http = self.__transport.http(creds)
+        doc = discovery.document(name, version, self.__discovery_dir)
+        if doc is not None:
+            return build_from_document(doc, http=http, developerKey=self.__developer_key)
+        if self.__discovery_cache is None:
+            import googleapiclient.discovery_cache as gws_discovery_cache
+            self.__discovery_cache = gws_discovery_cache.autodetect()
+        return build(name, version, http=http,
+                     developerKey=self.__developer_key, cache=self.__discovery_cache)
+
+    async def get_async_service(self, name: str, version: str) -> "AsyncService|None":
+        """
+        Async counterpart of get_service().  Connecting can block on a refresh or
+        an auth flow, and building the service on reading and parsing the discovery
+        document, so both are done off the event loop.  Each loop gets its own
+        service as it only builds requests, they are sent over the async transport.
+        Can return None if no connection present.
+        """
+        import asyncio
+        from .aio import AsyncService
+        if not self.connected:
+            await asyncio.to_thread(self.get_service, name, version)
+        if not self.connected:
+            return None
+        creds, pool, subject = self.__session()
+        id = f'{name}:{version}'
+        services = self.__async_services.setdefault(asyncio.get_running_loop(), {})
+        built = services.get((subject, id), None)
+        # stale once the services it goes with are cleared
+        if built is None or built[0]() is not pool or built[1] != pool.generation:
+            generation = pool.generation
+            r = await asyncio.to_thread(self.__build, name, version, creds)
+            if r is None:
+                return None
+            built = (weakref.ref(pool), generation, AsyncService(r, creds, self.__async_transport, user=subject))
+            services[(subject, id)] = built
+        s = built[2]
+        s.retry_policy = self.__retry_policy
+        s.quota = self.__quota
+        s.metrics = self.__metrics
         return s
 
 gws = __GWSAccess()
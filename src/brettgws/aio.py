@@ -0,0 +1,172 @@
+"""
+asyncio support for the GWS services.
+The discovery based services are still used to build the requests as that is all
+local, but rather than the blocking .execute() the request is sent over an async
+HTTP client so an event loop can keep many requests in flight at once.
+Requires httpx, which is an optional dependency: pip install brettgws[async]
+asyncio itself is only imported when actually used as it is slow to import.
+"""
+
+import weakref
+
+class AsyncTransport():
+    """
+    Holds an httpx.AsyncClient per event loop as a client cannot be shared across loops.
+    max_connections bounds the requests in flight per loop.
+    """
+    def __init__(self, max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 timeout: float|None = 60) -> None:
+        self.max_connections = int(max_connections)
+        self.max_keepalive_connections = int(max_keepalive_connections)
+        self.timeout = timeout
+        self._clients = weakref.WeakKeyDictionary()
+
+    @property
+    def config(self) -> dict:
+        return {'max_connections': self.max_connections,
+                'max_keepalive_connections': self.max_keepalive_connections,
+                'timeout': self.timeout}
+
+    @staticmethod
+    def from_config(config: dict|None) -> "AsyncTransport":
+        if isinstance(config, AsyncTransport):
+            return config
+        return AsyncTransport(**dict(config if config else {}))
+
+    def client(self):
+        """
+        The client for the running event loop, created on first use.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        c = self._clients.get(loop, None)
+        if c is None:
+            try:
+                import httpx
+            except ImportError as e:
+                raise ImportError("brettgws async support requires httpx: pip install brettgws[async]") from e
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_keepalive_connections)
+            c = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+            self._clients[loop] = c
+        return c
+
+    async def aclose(self) -> None:
+        """
+        Close the client for the running event loop.
+        """
+        import asyncio
+        c = self._clients.pop(asyncio.get_running_loop(), None)
+        if c is not None:
+            await c.aclose()
+
+class AsyncService():
+    """
+    Async counterpart of a service.  Attribute access is passed through to the
+    underlying Resource so requests are built exactly as they are for the sync
+    path, then handed to execute() instead of calling .execute() on them.
+    Failed requests are retried per retry_policy, a brettgws.retry.RetryPolicy,
+    and every request is paced by quota, a brettgws.quota.QuotaLimiter, for user.
+    Calls are recorded to metrics, a brettgws.metrics.Metrics.
+    """
+    def __init__(self, resource, creds, transport: AsyncTransport,
+                 retry_policy=None, quota=None, user: str|None = None,
+                 metrics=None) -> None:
+        import asyncio
+        self._resource = resource
+        self._creds = creds
+        self._transport = transport
+        self.retry_policy = retry_policy
+        self.quota = quota
+        self.user = user
+        self.metrics = metrics
+        self._refresh_lock = asyncio.Lock()
+
+    def __getattr__(self, name: str):
+        return getattr(self._resource, name)
+
+    @property
+    def resource(self):
+        return self._resource
+
+    async def _refresh(self, stale_token: str|None = None) -> None:
+        """
+        Refresh the credentials off the loop.  Only the first of many concurrent
+        callers does the work, the rest see a new token and move on.
+        """
+        import asyncio
+        from google.auth.transport.requests import Request
+        async with self._refresh_lock:
+            if self._creds.valid and self._creds.token != stale_token:
+                return
+            await asyncio.to_thread(self._creds.refresh, Request())
+
+    async def execute(self, request, page: int|None = None):
+        """
+        Async equivalent of HttpRequest.execute().
+        Raises googleapiclient.errors.HttpError on a non 2xx response as the sync path does.
+        page is the page number for requests that are part of a listing.
+        """
+        call = self.metrics.start(request, page) if self.metrics is not None else None
+        async def send():
+            if call is not None:
+                call.attempts += 1
+            return await self._send(request)
+        try:
+            if self.retry_policy is None:
+                response = await send()
+            else:
+                policy = self.retry_policy.for_request(request)
+                response = await policy.acall(send)
+        except Exception as e:
+            if call is not None:
+                call.finish(e)
+            raise
+        if call is not None:
+            call.finish()
+        return response
+
+    async def _send(self, request):
+        import urllib.parse
+        import httplib2
+        from googleapiclient.errors import HttpError
+        from googleapiclient.http import MAX_URI_LENGTH
+
+        if self.quota is not None:
+            await self.quota.aacquire(request, self.user)
+        method = str(request.method)
+        uri = str(request.uri)
+        body = request.body
+        headers = dict(request.headers)
+        # same as HttpRequest.execute(), a GET that is too long becomes a POST
+        if len(uri) > MAX_URI_LENGTH and method == "GET":
+            method = "POST"
+            headers["x-http-method-override"] = "GET"
+            headers["content-type"] = "application/x-www-form-urlencoded"
+            parsed = urllib.parse.urlparse(uri)
+            uri = urllib.parse.urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, None, None))
+            body = parsed.query
+            headers["content-length"] = str(len(body))
+
+        client = self._transport.client()
+        if not self._creds.valid:
+            await self._refresh()
+        for attempt in range(2):
+            token = self._creds.token
+            self._creds.apply(headers)
+            r = await client.request(method, uri, content=body, headers=headers)
+            if r.status_code != 401 or attempt:
+                break
+            # token went stale in flight, refresh and try once more
+            await self._refresh(token)
+
+        info = {k.lower(): v for k, v in r.headers.items()}
+        info.pop('content-encoding', None)
+        info['status'] = str(r.status_code)
+        info['reason'] = r.reason_phrase
+        resp = httplib2.Response(info)
+        content = r.content
+        if resp.status >= 300:
+            raise HttpError(resp, content, uri=uri)
+        return request.postproc(resp, content)
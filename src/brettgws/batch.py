@@ -0,0 +1,164 @@
+"""
+Batching of GWS requests.
+Every request is its own HTTP round trip, so something like deleting thousands of
+events is mostly spent waiting on the network.  Google's batch endpoint takes many
+requests in a single multipart HTTP request, so here requests built from a service
+are collected and sent in batches of up to the maximum the service allows.  Each
+request still counts against the quota so the batch is paced the same as sending
+them one at a time, and a batch that fails as a whole is only sent again if every
+request in it could be.  Sub-requests that fail with something worth retrying are
+then sent again individually through gws.execute(), which for writes is only when
+they were rate limited as they may otherwise have been applied.
+
+    batch = Batch("calendar", "v3")
+    service = gws.get_service("calendar", "v3")
+    for e in stale:
+        batch.add(service.events().delete(calendarId='primary', eventId=e.id))
+    for r in batch.execute():
+        if not r:
+            print(r.exception)
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, List
+
+from .access import gws
+
+# the batch endpoint takes up to 1000 requests, some services allow less
+DEFAULT_MAX_BATCH_SIZE = 1000
+MAX_BATCH_SIZE = {
+    'calendar': 50,
+}
+
+@dataclass
+class BatchResult():
+    """
+    Outcome of one request in a batch, either the response or the exception.
+    """
+    request: Any = field(default=None)
+    response: Any = field(default=None)
+    exception: Exception|None = field(default=None)
+
+    def __bool__(self) -> bool:
+        return self.exception is None
+
+    def result(self) -> Any:
+        """
+        The response, raising the exception if the request failed.
+        """
+        if self.exception is not None:
+            raise self.exception
+        return self.response
+
+class _BatchHttp():
+    """
+    Pass through to the http the batch is sent over that shows the multipart request
+    and response to the _BatchRequest, as metrics would see those of any other request.
+    """
+    def __init__(self, request: "_BatchRequest", http) -> None:
+        self._request = request
+        self._http = http
+
+    def __getattr__(self, name: str):
+        return getattr(self._http, name)
+
+    def request(self, uri: str, method: str = "GET", body=None, headers: dict|None = None, **kwargs):
+        self._request.body = body
+        resp, content = self._http.request(uri, method=method, body=body, headers=headers, **kwargs)
+        self._request.postproc(resp, content)
+        return resp, content
+
+class _BatchRequest():
+    """
+    What gws.execute() is given for a batch, the BatchHttpRequest along with the
+    requests in it for the quota to pace and the retry policy to go by.  body and
+    postproc follow the multipart request and response as for an HttpRequest.
+    """
+    methodId = None
+
+    def __init__(self, batch, requests: list) -> None:
+        self.batch = batch
+        self.requests = requests
+        self.body = None
+
+    def postproc(self, resp, content) -> None:
+        pass
+
+    def execute(self):
+        return self.batch.execute(http=_BatchHttp(self, self.requests[0].http))
+
+class Batch():
+    """
+    Collects requests built from a name:version service to send in batches.
+    convert, if given to add(), is applied to a successful response, for example
+    to turn it into a resource dataclass.
+    With retry_failed, failed requests are sent again where the retry policy allows,
+    set it False to leave even rate limited requests for the caller to deal with.
+    """
+    def __init__(self, name: str, version: str, max_size: int|None = None,
+                 retry_failed: bool = True) -> None:
+        self.name = name
+        self.version = version
+        limit = MAX_BATCH_SIZE.get(name, DEFAULT_MAX_BATCH_SIZE)
+        self.max_size = limit if max_size is None else max(1, min(int(max_size), limit))
+        self.retry_failed = bool(retry_failed)
+        self._requests = []
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __repr__(self) -> str:
+        return f"{str(self.__class__)}:{self.name}:{self.version}:{len(self)}"
+
+    def add(self, request, convert: Callable|None = None) -> "Batch":
+        self._requests.append((request, convert))
+        return self
+
+    def clear(self) -> None:
+        self._requests = []
+
+    def _send(self, chunk: list, results: List[BatchResult], offset: int) -> None:
+        service = gws.get_service(self.name, self.version)
+        if service is None:
+            raise RuntimeError(f"Unable to get the {self.name}:{self.version} service")
+
+        def callback(request_id, response, exception):
+            results[int(request_id)].response = response
+            results[int(request_id)].exception = exception
+
+        batch = service.new_batch_http_request(callback=callback)
+        for i, (request, _) in enumerate(chunk):
+            batch.add(request, request_id=str(offset + i))
+        # every attempt is paced by the quota of each request in it
+        gws.execute(_BatchRequest(batch, [request for request, _ in chunk]))
+
+    def execute(self) -> List[BatchResult]:
+        """
+        Send everything added so far, returning a result per request in the order added.
+        Nothing is raised for individual requests, check each result.
+        """
+        requests, self._requests = self._requests, []
+        results = [BatchResult(r) for r, _ in requests]
+        for start in range(0, len(requests), self.max_size):
+            chunk = requests[start:start + self.max_size]
+            try:
+                self._send(chunk, results, start)
+            except Exception as e:
+                for r in results[start:start + len(chunk)]:
+                    r.exception = e
+        policy = gws.retry_policy
+        for i, (request, convert) in enumerate(requests):
+            r = results[i]
+            if r.exception is not None and self.retry_failed and \
+               policy.for_request(request).retryable(r.exception) and policy.budget.withdraw():
+                try:
+                    r.response = gws.execute(request)
+                    r.exception = None
+                except Exception as e:
+                    r.exception = e
+            if r.exception is None and convert is not None:
+                try:
+                    r.response = convert(r.response)
+                except Exception as e:
+                    r.exception = e
+        return results
@@ -1,17 +1,167 @@
 
-from dataclasses import dataclass, field, asdict
-from typing import List, Self, Tuple
+from dataclasses import dataclass, field
+from typing import Iterable, List, Self, Tuple
 import datetime
 from zoneinfo import ZoneInfo
 from functools import partial
+import contextvars
 
-from .resources import GoogleWorkSpaceResourceBase
+from .resources import GoogleWorkSpaceResourceBase, LazyField
 
 from .access import gws
+from .etag import get as _conditional_get, aget as _aconditional_get
+from .batch import Batch, BatchResult
+from .intervals import Interval, IntervalSet, common_free, to_datetime
 
 # do this as module level or a parent class instance?
 # simpler at module level and achieves the same thing
 _get_service = partial(gws.get_service, "calendar", "v3")
+_get_async_service = partial(gws.get_async_service, "calendar", "v3")
+
+def _parse_datetime(value) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(str(value)).replace(microsecond=0)
+
+def _parse_event_datetime(value) -> "EventDateTime":
+    return EventDateTime(**dict(value))
+
+def _time_zone(tz: str|ZoneInfo|None) -> ZoneInfo|None:
+    return tz if tz is None or isinstance(tz, ZoneInfo) else ZoneInfo(str(tz))
+
+# what a listing needs from the top level of each page besides the items
+_PAGE_FIELDS = ('nextPageToken', 'nextSyncToken')
+
+def _split_fields(fields: str) -> List[str]:
+    """
+    The top level selections of a field mask, 'a,b(c,d)' -> ['a', 'b(c,d)']
+    """
+    parts = []
+    depth = 0
+    start = 0
+    for i, c in enumerate(fields):
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            parts.append(fields[start:i])
+            start = i + 1
+    parts.append(fields[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+def _with_item_id(fields: str) -> str:
+    """
+    A listing's field mask made sure to include the id of each item.
+    """
+    parts = _split_fields(fields)
+    for i, p in enumerate(parts):
+        if p in ('items', 'items/id'):
+            return fields
+        if p.startswith('items(') and p.endswith(')'):
+            if 'id' not in _split_fields(p[6:-1]):
+                parts[i] = f"items(id,{p[6:-1]})"
+            return ','.join(parts)
+    return ','.join(parts + ['items/id'])
+
+def _items_fields(fields: str|List[str], keep: Tuple[str, ...] = _PAGE_FIELDS) -> str:
+    """
+    A list response wraps the resources in items so a field mask for the resource
+    needs to be put inside items() and keep the top level fields in keep, the page
+    and sync tokens by default.  A mask for the whole response gets whichever of
+    those it is missing.
+    """
+    parts = _split_fields(fields if isinstance(fields, str) else ','.join(fields))
+    names = [p.split('(')[0].split('/')[0] for p in parts]
+    if not any(n == 'items' or n in keep for n in names):
+        parts = [f"items({','.join(parts)})"]
+        names = ['items']
+    return ','.join([k for k in keep if k not in names] + parts)
+
+def _pages(resource: str, args: dict, prefetch: bool = False):
+    """
+    Generator of the responses for each page of a listing of resource ('events', 'calendarList').
+    With prefetch the next page is fetched on a worker thread while the current
+    one is being processed.  The request is built in whichever thread sends it
+    as services are per-thread.
+    """
+    def fetch(page_token: str|None, page: int) -> dict:
+        method = getattr(_get_service(), resource)().list
+        return gws.execute(method(pageToken=page_token, **args), page)
+
+    if not prefetch:
+        page_token = None
+        page = 0
+        while True:
+            page += 1
+            response = fetch(page_token, page)
+            yield response
+            page_token = response.get('nextPageToken', None)
+            if not page_token:
+                break
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(1, thread_name_prefix="brettgws-prefetch") as pool:
+        # carry over gws.impersonate() and the like to the worker
+        page = 1
+        future = pool.submit(contextvars.copy_context().run, fetch, None, page)
+        while future is not None:
+            response = future.result()
+            page_token = response.get('nextPageToken', None)
+            future = None
+            if page_token:
+                page += 1
+                future = pool.submit(contextvars.copy_context().run, fetch, page_token, page)
+            yield response
+
+async def _apages(resource: str, args: dict, prefetch: bool = False):
+    """
+    Async version of _pages(), with prefetch the next page is requested as a task.
+    """
+    import asyncio
+    service = await _get_async_service()
+    method = getattr(service, resource)().list
+
+    async def fetch(page_token: str|None, page: int) -> dict:
+        return await service.execute(method(pageToken=page_token, **args), page)
+
+    page = 1
+    pending = fetch(None, page)
+    while pending is not None:
+        response = await pending
+        page_token = response.get('nextPageToken', None)
+        pending = None
+        if page_token:
+            page += 1
+            pending = fetch(page_token, page)
+            if prefetch:
+                pending = asyncio.ensure_future(pending)
+        try:
+            yield response
+        except GeneratorExit:
+            if isinstance(pending, asyncio.Future):
+                pending.cancel()
+            elif pending is not None:
+                pending.close()
+            raise
+
+def _windows(time_min: str, time_max: str, count: int) -> List[Tuple[str,str]]:
+    """
+    Split the [time_min, time_max) range into count contiguous windows of equal length.
+    """
+    start = datetime.datetime.fromisoformat(time_min)
+    end = datetime.datetime.fromisoformat(time_max)
+    if end <= start:
+        return [(time_min, time_max)]
+    count = max(1, int(count))
+    step = (end - start) / count
+    edges = [time_min] + [(start + step * i).replace(microsecond=0).isoformat() for i in range(1, count)] + [time_max]
+    # dedupe edges that collapsed together on short ranges
+    edges = list(dict.fromkeys(edges))
+    return [(edges[i], edges[i + 1]) for i in range(len(edges) - 1)]
+
+def _gone(error: Exception) -> bool:
+    resp = getattr(error, 'resp', None)
+    return resp is not None and getattr(resp, 'status', None) == 410
 
 @dataclass
 class CalendarList(GoogleWorkSpaceResourceBase):
@@ -51,35 +201,47 @@ class CalendarList(GoogleWorkSpaceResourceBase):
     def __repr__(self) -> str:
         return f"{str(self.__class__)}:{str(self)}"
     
+    @staticmethod
+    def _list_args(minAccessRole: str, showDeleted: bool, showHidden: bool,
+                   fields: str|List[str]|None) -> dict:
+        args = {"showDeleted": showDeleted, "showHidden": showHidden}
+        if minAccessRole:
+            if minAccessRole in ["freeBusyReader", "owner", "reader", "writer"]:
+                args["minAccessRole"] = minAccessRole
+            else:
+                raise ValueError(f"Invalid CalendarList::list() minAccessRole: {minAccessRole}")
+        if fields:
+            args["fields"] = _items_fields(fields)
+        return args
+
     @staticmethod
     def list(minAccessRole: str = "",
              showDeleted: bool = False,
-             showHidden: bool = False) -> List[Self]:
+             showHidden: bool = False,
+             fields: str|List[str]|None = None) -> List[Self]:
         """
         Helper wrapper for CalendarList::list
         This is the entry point for pulling out available calendars.  Start here to get
         a list of calendars with their calendIds, which can then be used for further operations.
+        fields is a partial response mask for each entry, see CalendarList.fields_mask()
         https://developers.google.com/calendar/api/v3/reference/calendarList/list
         """
-        page_token = None
-        clist = []
-        args = {"pageToken": page_token, "showDeleted": showDeleted, "showHidden": showHidden}
-        if minAccessRole:
-            if minAccessRole in ["freeBusyReader", "owner", "reader", "writer"]:
-                args["minAccessRole"] = minAccessRole
-            else:
-                raise ValueError(f"Invalid CalendarList::list() minAccessRole: {minAccessRole}")
-        # cache the method locally rather than look up on each loop iteration
-        method = _get_service().calendarList().list
-        while True:
-            response = method(**args).execute()
-            if response:
-                for entry in response['items']:
-                    clist.append(CalendarList(**entry))
-                page_token = response.get('nextPageToken', None)
-                if not page_token:
-                    break
-        return clist
+        return [c for c in CalendarList.stream(minAccessRole, showDeleted, showHidden, fields)]
+
+    @staticmethod
+    def stream(minAccessRole: str = "",
+               showDeleted: bool = False,
+               showHidden: bool = False,
+               fields: str|List[str]|None = None,
+               prefetch: bool = False):
+        """
+        Generator version of CalendarList::list, entries are yielded as each page is decoded.
+        With prefetch the next page is fetched while the current one is worked through.
+        """
+        args = CalendarList._list_args(minAccessRole, showDeleted, showHidden, fields)
+        for response in _pages("calendarList", args, prefetch):
+            for entry in response.get('items', []):
+                yield CalendarList(**entry)
 
 @dataclass
 class Calendar(GoogleWorkSpaceResourceBase):
@@ -111,11 +273,7 @@ class Calendar(GoogleWorkSpaceResourceBase):
     def __repr__(self) -> str:
         return f"{str(self.__class__)}:{str(self)}"
     
-    def to_base(self) -> dict:
-        self.fixup()
-        b = asdict(self)
-        b['timeZone'] = str(self.timeZone) if self.timeZone is not None else None
-        return b
+    encoders = {'timeZone': str}
 
     def fixup(self) -> None:
         if self.timeZone is not None and not isinstance(self.timeZone,ZoneInfo):
@@ -127,20 +285,29 @@ class Calendar(GoogleWorkSpaceResourceBase):
         https://developers.google.com/calendar/api/v3/reference/calendars/get
         Get the calendar entry with the associated ID.  The 'primary' default is
         the currently authenticated user.  Not sure how that works with a service account? 
+        With gws.etag_cache enabled an unchanged calendar comes from the cache.
         """
         i = str(id)
         if i:
-            response = _get_service().calendars().get(calendarId=i).execute()
-            return Calendar(**response)
+            calendar, _ = _conditional_get(_get_service().calendars().get(calendarId=i),
+                                           lambda r: Calendar(**r))
+            return calendar
         return Calendar()
     
-    def refresh(self) -> None:
+    def refresh(self) -> bool:
         """
         Pull from upstream to update any fields that may have changed.
+        With gws.etag_cache enabled nothing is downloaded if the etag still matches.
+        Returns whether anything changed.
         """
         if self.id:
-            response = _get_service().calendars().get(calendarId=str(self.id)).execute()
-            self.update_fields(**response)
+            # decoded the same as Calendar::get as the cache entry is shared with it
+            calendar, changed = _conditional_get(_get_service().calendars().get(calendarId=str(self.id)),
+                                                 lambda r: Calendar(**r), self.etag)
+            if changed:
+                self.update_fields(**vars(calendar))
+            return changed
+        return False
 
     def update(self,
                description: bool = True,
@@ -164,7 +331,7 @@ class Calendar(GoogleWorkSpaceResourceBase):
         if timeZone:
             body['timeZone'] = str(self.timeZone)
         if body:
-            response = _get_service().calendars().get(calendarId=str(self.id), body=body).execute()
+            response = gws.execute(_get_service().calendars().get(calendarId=str(self.id), body=body))
             if response:
                 updated = self.update_fields(**response)
         return updated
@@ -179,9 +346,9 @@ class EventDateTime(GoogleWorkSpaceResourceBase):
     Will default to dateTime when both are specified although that should
     never happen
     """
-    date: datetime.date|str|None = field(default=None)
-    dateTime: datetime.datetime|str|None = field(default=None)
-    timeZone: ZoneInfo|str|None = field(default=None)
+    date: datetime.date|str|None = LazyField(datetime.date, lambda v: datetime.date.fromisoformat(str(v)))
+    dateTime: datetime.datetime|str|None = LazyField(datetime.datetime, _parse_datetime)
+    timeZone: ZoneInfo|str|None = LazyField(ZoneInfo, lambda v: ZoneInfo(str(v)))
 
     def __bool__(self) -> bool:
         return bool(self.date) or bool(self.dateTime)
@@ -197,7 +364,11 @@ class EventDateTime(GoogleWorkSpaceResourceBase):
         return s
 
     def __post_init__(self) -> None:  
-        self.fixup()
+        if not self.lazy_decode:
+            self.fixup()
+        elif self.__dict__.get('dateTime') and self.__dict__.get('date'):
+            # same precedence as fixup() without decoding either
+            self.date = None
 
     def fixup(self) -> None:
         if self.date is not None and not isinstance(self.date, datetime.date):
@@ -233,6 +404,21 @@ class EventDateTime(GoogleWorkSpaceResourceBase):
         return None if not base else base
 
 
+@dataclass
+class EventSyncResult():
+    """
+    Outcome of Event::sync.  events are the new and changed events, cancelled those
+    deleted since the last sync.  Keep sync_token for the next call.  full is True
+    if everything was fetched, either as there was no token or it had expired, in which
+    case anything held locally that isn't in events should be dropped.
+    time_zone is that of the calendar, which all-day event dates are in.
+    """
+    events: List["Event"] = field(default_factory=list)
+    cancelled: List["Event"] = field(default_factory=list)
+    sync_token: str|None = field(default=None)
+    full: bool = field(default=True)
+    time_zone: str|None = field(default=None)
+
 @dataclass
 class Event(GoogleWorkSpaceResourceBase):
     """
@@ -244,20 +430,20 @@ class Event(GoogleWorkSpaceResourceBase):
     id: str|None = field(default=None)
     status: str|None = field(default=None)
     htmlLink: str|None = field(default=None)
-    created: datetime.datetime|str|None = field(default=None)
-    updated: datetime.datetime|str|None = field(default=None)
+    created: datetime.datetime|str|None = LazyField(datetime.datetime, _parse_datetime)
+    updated: datetime.datetime|str|None = LazyField(datetime.datetime, _parse_datetime)
     summary: str|None = field(default=None)
     description: str|None = field(default=None)
     location: str|None = field(default=None)
     colorId: str|None = field(default=None)
     creator: dict[str,str,str,bool]|None = field(default=None)
     organizer: dict[str,str,str,bool]|None = field(default=None)
-    start: EventDateTime|dict|None = field(default=None)
-    end: EventDateTime|dict|None = field(default=None)
+    start: EventDateTime|dict|None = LazyField(EventDateTime, _parse_event_datetime)
+    end: EventDateTime|dict|None = LazyField(EventDateTime, _parse_event_datetime)
     endTimeUnspecified: bool|None = field(default=None)
     recurrence: List[str]|None = field(default=None)
     recurringEventId: str|None = field(default=None)
-    originalStartTime: EventDateTime|dict|None = field(default=None)
+    originalStartTime: EventDateTime|dict|None = LazyField(EventDateTime, _parse_event_datetime)
     transparency: str|None = field(default=None)
     visibility:str|None = field(default=None)
     iCalUID: str|None = field(default=None)
@@ -283,7 +469,8 @@ class Event(GoogleWorkSpaceResourceBase):
     eventType: str|None = field(default=None)
 
     def __post_init__(self) -> None:
-        self.fixup()
+        if not self.lazy_decode:
+            self.fixup()
 
     def fixup(self) -> None:
         if self.created is not None and not isinstance(self.created,datetime.datetime):
@@ -313,15 +500,19 @@ class Event(GoogleWorkSpaceResourceBase):
         """
         Is this an all-day event?  That is, is it just date components and not datetime?
         """
-        return self.start.date is not None and self.end.date is not None
+        return self.start is not None and self.end is not None and \
+               self.start.date is not None and self.end.date is not None
     
     def duration(self) -> Tuple[datetime.date|datetime.datetime|None,ZoneInfo|None,
                                 datetime.date|datetime.datetime|None,ZoneInfo|None]:
         """
         Return the current start/end values.  Because they can be date or datetime
         it does the selection for you.
+        Missing, as when left out of a field mask, is all None.
         """
-        return (*self.start.values(), *self.end.values())
+        start = self.start.values() if self.start is not None else (None, None)
+        end = self.end.values() if self.end is not None else (None, None)
+        return (*start, *end)
     
     def set_duration(self, start: str|datetime.date|datetime.datetime,
                      end: str|datetime.date|datetime.datetime, tz: str|ZoneInfo|None = None) -> None:
@@ -365,82 +556,238 @@ class Event(GoogleWorkSpaceResourceBase):
         self.start = es
         self.end = ee
 
-    def to_base(self) -> dict:
-        """
-        Convert any date/datetime/ZoneInfo into the strings needed by GWS
-        Really annoying that datetime.__str__ returns datetime.isoformat(' ')
-        as GWS needs the 'T' separator
-        """
-        self.fixup()
-        b = asdict(self)
-        if self.start:
-            b['start'] = self.start.to_base()
-        if self.end:
-            b['end'] = self.end.to_base()
-        if self.originalStartTime:
-            b['originalStartTime'] = self.originalStartTime.to_base()
-        if self.created:
-            b['created'] = str(self.created)
-        if self.updated:
-            b['updated'] = str(self.updated)
-        return b
+    # start/end/originalStartTime go through EventDateTime.to_base() for the
+    # date/datetime/ZoneInfo conversions, the timestamps just need to be strings
+    encoders = {'created': str, 'updated': str}
 
     @staticmethod
-    def list(calendar_id: str|Calendar = "primary", **kwargs) -> List[Self]:
+    def _list_args(calendar_id: str|Calendar, kwargs: dict) -> dict:
         """
-        https://developers.google.com/calendar/api/v3/reference/events/list
-        Entry point for all calendar events.  Call this to get the list
-        to then get the ID of a particular event.
-        The calendar ID is required but the kwargs are the very large number
-        of query parameters for this method so check the documentation.
+        Massage the Event::list query parameters into what GWS expects.
         """
-        method = _get_service().events().list
-        page_token = None
-        cid = calendar_id.id if isinstance(calendar_id,Calendar) else str(calendar_id)
+        args = dict(kwargs)
+        args['calendarId'] = calendar_id.id if isinstance(calendar_id,Calendar) else str(calendar_id)
         # we're being lazy with not specifying all of the query parameters
         # so need to ensure this particular one isnt present
-        kwargs.pop('pageToken', None)
+        args.pop('pageToken', None)
+        if args.get('fields', None):
+            # the calendar's timeZone is what all-day dates are in
+            args['fields'] = _items_fields(args['fields'], _PAGE_FIELDS + ('timeZone',))
+        else:
+            args.pop('fields', None)
         # timeMin and timeMax are funny in that they MUST have the tz offset applied
         # so check here and adjust if possible
         tz = None
-        if 'timeZone' in kwargs:
-            kwtz = kwargs['timeZone']
+        if 'timeZone' in args:
+            kwtz = args['timeZone']
             if kwtz:
-                if isinstance(kwtz,ZoneInfo):
-                    tz = kwtz
-                    kwargs['timeZone'] = str(kwtz)
-                else:
-                    tz = ZoneInfo(str(kwtz))
+                tz = _time_zone(kwtz)
+                args['timeZone'] = str(kwtz)
             else:
-                del kwargs['timeZone']
+                del args['timeZone']
         for t in ['timeMin', 'timeMax']:
-            if t in kwargs:
-                tm = kwargs[t]
+            if t in args:
+                tm = args[t]
                 if tm:
-                    tmdt = tm if isinstance(tm, datetime.datetime) else datetime.datetime.fromisoformat(str(tm))
-                    tmdt = tmdt.replace(microsecond=0)
-                    tzinfo = tmdt.tzinfo if hasattr(tmdt, 'tzinfo') else tz if tz is not None else ZoneInfo('UTC')
-                    tstr = tmdt.astimezone(tzinfo).isoformat()
-                    kwargs[t] = tstr
+                    # a naive time is taken to be in the requested timeZone, or UTC
+                    args[t] = to_datetime(tm, tz).replace(microsecond=0).isoformat()
                 else:
-                    del kwargs[t]
+                    del args[t]
+        return args
+
+    @staticmethod
+    def list(calendar_id: str|Calendar = "primary", **kwargs) -> List[Self]:
+        """
+        https://developers.google.com/calendar/api/v3/reference/events/list
+        Entry point for all calendar events.  Call this to get the list
+        to then get the ID of a particular event.
+        The calendar ID is required but the kwargs are the very large number
+        of query parameters for this method so check the documentation.
+        A fields kwarg is a partial response mask for each event, see Event.fields_mask()
+        """
+        return [e for e in Event.stream(calendar_id, **kwargs)]
+
+    @staticmethod
+    def stream(calendar_id: str|Calendar = "primary", prefetch: bool = False, **kwargs):
+        """
+        Generator version of Event::list, events are yielded as each page is decoded
+        so memory stays flat however big the calendar.  With prefetch the next page
+        is fetched while the current one is worked through.
+        """
+        args = Event._list_args(calendar_id, kwargs)
+        for response in _pages("events", args, prefetch):
+            for e in response.get('items', []):
+                yield Event(**e)
+
+    @staticmethod
+    def list_sharded(calendar_id: str|Calendar = "primary", shards: int = 4,
+                     max_workers: int|None = None, **kwargs) -> List[Self]:
+        """
+        Event::list over a long timeMin to timeMax range, split into shards windows that
+        are each paged through in parallel rather than one long serial page chain.
+        timeMin and timeMax are required and normalised the same as Event::list.
+        Events straddling a window edge are returned by both windows so only the first is kept,
+        otherwise the order is that of the windows.  A fields mask always gets the id
+        as that is what they are told apart by.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        args = Event._list_args(calendar_id, kwargs)
+        if 'timeMin' not in args or 'timeMax' not in args:
+            raise ValueError("Event::list_sharded() requires both timeMin and timeMax")
+        if 'fields' in args:
+            args['fields'] = _with_item_id(args['fields'])
+        windows = _windows(args['timeMin'], args['timeMax'], shards)
+
+        def fetch(window: Tuple[str,str]) -> List[Self]:
+            a = dict(args)
+            a['timeMin'], a['timeMax'] = window
+            return [Event(**e) for response in _pages("events", a) for e in response.get('items', [])]
+
+        workers = max(1, min(len(windows), int(max_workers) if max_workers else len(windows)))
+        with ThreadPoolExecutor(workers, thread_name_prefix="brettgws-shard") as pool:
+            futures = [pool.submit(contextvars.copy_context().run, fetch, w) for w in windows]
+            parts = [f.result() for f in futures]
+        seen = set()
         events = []
-        while True:
-            response = method(calendarId=cid, pageToken=page_token, **kwargs).execute()
-            for e in response['items']:
-                events.append(Event(**e))
-            page_token =  response.get('nextPageToken', None)
-            if not page_token:
-                break
+        for part in parts:
+            for e in part:
+                if e.id not in seen:
+                    seen.add(e.id)
+                    events.append(e)
         return events
 
     @staticmethod
-    def get(calendar_id: str|Calendar, event_id: str|Self,
-            maxAttendees: int = 0, timeZone: str|ZoneInfo|None = None) -> Self:
+    def stream_many(calendar_ids: List[str|Calendar|CalendarList], max_workers: int = 8,
+                    return_exceptions: bool = False, **kwargs):
         """
-        https://developers.google.com/calendar/api/v3/reference/events/get
-        Get the event associated with the calendar and event IDs
+        Event::list a number of calendars concurrently on up to max_workers threads,
+        all with the same kwargs.  Yields (calendar id, events) as each calendar completes.
+        Requests still go through the quota limiter and retries so max_workers bounds
+        the parallelism rather than the rate.  With return_exceptions a failed calendar
+        yields the exception in place of the events rather than raising it.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        ids = list(dict.fromkeys(c.id if isinstance(c, (Calendar, CalendarList)) else str(c)
+                                 for c in calendar_ids))
+        if not ids:
+            return
+        with ThreadPoolExecutor(max(1, min(int(max_workers), len(ids))),
+                                thread_name_prefix="brettgws-fetch") as pool:
+            futures = {pool.submit(contextvars.copy_context().run, Event.list, cid, **kwargs): cid
+                       for cid in ids}
+            try:
+                for f in as_completed(futures):
+                    try:
+                        yield futures[f], f.result()
+                    except Exception as e:
+                        if not return_exceptions:
+                            raise
+                        yield futures[f], e
+            finally:
+                for f in futures:
+                    f.cancel()
+
+    @staticmethod
+    def list_many(calendar_ids: List[str|Calendar|CalendarList], max_workers: int = 8,
+                  return_exceptions: bool = False, **kwargs) -> dict:
+        """
+        Event::list a number of calendars concurrently, see Event::stream_many.
+        Returns {calendar id: events} in the order of calendar_ids.
+        """
+        results = dict(Event.stream_many(calendar_ids, max_workers, return_exceptions, **kwargs))
+        ids = [c.id if isinstance(c, (Calendar, CalendarList)) else str(c) for c in calendar_ids]
+        return {cid: results[cid] for cid in dict.fromkeys(ids)}
+
+    @staticmethod
+    async def alist_many(calendar_ids: List[str|Calendar|CalendarList], max_concurrency: int = 8,
+                         return_exceptions: bool = False, **kwargs) -> dict:
+        """
+        Async version of Event::list_many, with up to max_concurrency listings in flight.
+        When one fails without return_exceptions the rest are cancelled before it is raised.
+        """
+        import asyncio
+        ids = list(dict.fromkeys(c.id if isinstance(c, (Calendar, CalendarList)) else str(c)
+                                 for c in calendar_ids))
+        semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+
+        async def fetch(cid: str) -> List[Self]:
+            async with semaphore:
+                return await Event.alist(cid, **kwargs)
+
+        tasks = [asyncio.ensure_future(fetch(cid)) for cid in ids]
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        except BaseException:
+            # same as list_many shutting down its executor, nothing is left running
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return dict(zip(ids, results))
+
+    @staticmethod
+    async def alist(calendar_id: str|Calendar = "primary", **kwargs) -> List[Self]:
         """
+        Async version of Event::list
+        """
+        return [e async for e in Event.astream(calendar_id, **kwargs)]
+
+    @staticmethod
+    async def astream(calendar_id: str|Calendar = "primary", prefetch: bool = False, **kwargs):
+        """
+        Async generator version of Event::stream
+        """
+        args = Event._list_args(calendar_id, kwargs)
+        async for response in _apages("events", args, prefetch):
+            for e in response.get('items', []):
+                yield Event(**e)
+
+    # query parameters that can't be combined with a syncToken
+    SYNC_RESTRICTED = ('iCalUID', 'orderBy', 'privateExtendedProperty', 'q',
+                       'sharedExtendedProperty', 'timeMin', 'timeMax', 'updatedMin')
+
+    @staticmethod
+    def sync(calendar_id: str|Calendar = "primary", sync_token: str|None = None,
+             **kwargs) -> EventSyncResult:
+        """
+        https://developers.google.com/calendar/api/guides/sync
+        Incremental sync of the events in a calendar.  Without a sync_token this is a full
+        listing with the kwargs of Event::list.  With the sync_token from a previous result
+        only the events changed or deleted since are fetched, and any kwargs that can't be
+        used with a token are dropped.  An expired token (410 Gone) falls back to a full sync.
+        """
+        args = Event._list_args(calendar_id, kwargs)
+        full = not sync_token
+        result = None
+        if not full:
+            incremental = {k: v for k,v in args.items() if k not in Event.SYNC_RESTRICTED}
+            incremental['syncToken'] = str(sync_token)
+            try:
+                result = Event._sync_pages(incremental, False)
+            except Exception as e:
+                if not _gone(e):
+                    raise
+        if result is None:
+            result = Event._sync_pages(args, True)
+        return result
+
+    @staticmethod
+    def _sync_pages(args: dict, full: bool) -> EventSyncResult:
+        result = EventSyncResult(full=full)
+        for response in _pages("events", args):
+            for e in response.get('items', []):
+                event = Event(**e)
+                if event.status == 'cancelled':
+                    result.cancelled.append(event)
+                else:
+                    result.events.append(event)
+            result.sync_token = response.get('nextSyncToken', result.sync_token)
+            result.time_zone = response.get('timeZone', result.time_zone)
+        return result
+
+    @staticmethod
+    def _get_args(calendar_id: str|Calendar, event_id: str|Self,
+                  maxAttendees: int, timeZone: str|ZoneInfo|None) -> dict:
         cid = calendar_id.id if isinstance(calendar_id,Calendar) else str(calendar_id)
         eid = event_id.id if isinstance(event_id,Event) else str(event_id)
         request = {'calendarId': cid, 'eventId': eid }
@@ -448,32 +795,63 @@ class Event(GoogleWorkSpaceResourceBase):
             request['maxAttendees'] = maxAttendees
         if timeZone:
             request['timeZone'] = str(timeZone)
-        response = _get_service().events().get(**request).execute()
-        return Event(**response)
-    
+        return request
+
     @staticmethod
-    def delete(calendar_id: str|Calendar, event_id: str|Self,
-               sendUpdates: str = "all") -> None:
+    def get(calendar_id: str|Calendar, event_id: str|Self,
+            maxAttendees: int = 0, timeZone: str|ZoneInfo|None = None) -> Self:
         """
-        https://developers.google.com/calendar/api/v3/reference/events/delete
-        Delete the event with the associated calendar and event IDs
+        https://developers.google.com/calendar/api/v3/reference/events/get
+        Get the event associated with the calendar and event IDs
+        With gws.etag_cache enabled an unchanged event comes from the cache.
+        """
+        request = Event._get_args(calendar_id, event_id, maxAttendees, timeZone)
+        event, _ = _conditional_get(_get_service().events().get(**request), lambda r: Event(**r))
+        return event
+
+    @staticmethod
+    async def aget(calendar_id: str|Calendar, event_id: str|Self,
+                   maxAttendees: int = 0, timeZone: str|ZoneInfo|None = None) -> Self:
+        """
+        Async version of Event::get
         """
+        service = await _get_async_service()
+        request = Event._get_args(calendar_id, event_id, maxAttendees, timeZone)
+        event, _ = await _aconditional_get(service, service.events().get(**request), lambda r: Event(**r))
+        return event
+
+    @staticmethod
+    def _delete_args(calendar_id: str|Calendar, event_id: str|Self, sendUpdates: str) -> dict:
         if sendUpdates not in ["all", "externalOnly", "none"]:
             raise ValueError(f"Invalid Event::delete() sendUpdates value: {sendUpdates}")
         cid = calendar_id.id if isinstance(calendar_id,Calendar) else str(calendar_id)
         eid = event_id.id if isinstance(event_id,Event) else str(event_id)
-        _get_service().events().delete(calendarId = cid, eventId = eid, sendUpdates = sendUpdates).execute()
-        
+        return {'calendarId': cid, 'eventId': eid, 'sendUpdates': sendUpdates}
+
     @staticmethod
-    def insert(calendar_id: str|Calendar, event: Self|dict,
-               sendUpdates: str = "",
-               maxAttendees: int = 0,
-               supportsAttachments: bool = False,
-               conferenceDataVersion: int = 0) -> Self:
+    def delete(calendar_id: str|Calendar, event_id: str|Self,
+               sendUpdates: str = "all") -> None:
         """
-        https://developers.google.com/calendar/api/v3/reference/events/insert
-        Insert a new event into the specified calendar
+        https://developers.google.com/calendar/api/v3/reference/events/delete
+        Delete the event with the associated calendar and event IDs
         """
+        request = Event._delete_args(calendar_id, event_id, sendUpdates)
+        gws.execute(_get_service().events().delete(**request))
+
+    @staticmethod
+    async def adelete(calendar_id: str|Calendar, event_id: str|Self,
+                      sendUpdates: str = "all") -> None:
+        """
+        Async version of Event::delete
+        """
+        service = await _get_async_service()
+        request = Event._delete_args(calendar_id, event_id, sendUpdates)
+        await service.execute(service.events().delete(**request))
+
+    @staticmethod
+    def _insert_args(calendar_id: str|Calendar, event: Self|dict, sendUpdates: str,
+                     maxAttendees: int, supportsAttachments: bool,
+                     conferenceDataVersion: int) -> dict:
         cid = calendar_id.id if isinstance(calendar_id,Calendar) else str(calendar_id)
         request = {"calendarId": cid, "body": event.trim() if isinstance(event,Event) else event,
                    "supportsAttachments" : supportsAttachments,
@@ -484,28 +862,56 @@ class Event(GoogleWorkSpaceResourceBase):
             if sendUpdates not in ["all", "externalOnly", "none"]:
                 raise ValueError(f"Invalid Event::insert() sendUpdates value: {sendUpdates}")
             request['sendUpdates'] = sendUpdates
-        
-        response = _get_service().events().insert(**request).execute()
-        # if an Event was passed in, fill that out, otherwise return a new object
+        return request
+
+    @staticmethod
+    def _filled(event: Self|dict, response: dict) -> Self:
+        """
+        If an Event was passed in, fill that out, otherwise return a new object
+        """
         if isinstance(event, Event):
             event.update_fields(**response)
             return event
-        return Event(**response) 
-    
+        return Event(**response)
+
     @staticmethod
-    def update(calendar_id: str|Calendar, event: Self|dict,
+    def insert(calendar_id: str|Calendar, event: Self|dict,
                sendUpdates: str = "",
                maxAttendees: int = 0,
                supportsAttachments: bool = False,
-               conferenceDataVersion: int = 0) -> None:
+               conferenceDataVersion: int = 0) -> Self:
         """
-        https://developers.google.com/calendar/api/v3/reference/events/update
-        Update the event on the specified calendar.
+        https://developers.google.com/calendar/api/v3/reference/events/insert
+        Insert a new event into the specified calendar
         """
+        request = Event._insert_args(calendar_id, event, sendUpdates, maxAttendees,
+                                     supportsAttachments, conferenceDataVersion)
+        response = gws.execute(_get_service().events().insert(**request))
+        return Event._filled(event, response)
+
+    @staticmethod
+    async def ainsert(calendar_id: str|Calendar, event: Self|dict,
+                      sendUpdates: str = "",
+                      maxAttendees: int = 0,
+                      supportsAttachments: bool = False,
+                      conferenceDataVersion: int = 0) -> Self:
+        """
+        Async version of Event::insert
+        """
+        service = await _get_async_service()
+        request = Event._insert_args(calendar_id, event, sendUpdates, maxAttendees,
+                                     supportsAttachments, conferenceDataVersion)
+        response = await service.execute(service.events().insert(**request))
+        return Event._filled(event, response)
+
+    @staticmethod
+    def _update_args(calendar_id: str|Calendar, event: Self|dict, sendUpdates: str,
+                     maxAttendees: int, supportsAttachments: bool,
+                     conferenceDataVersion: int) -> dict:
         cid = calendar_id.id if isinstance(calendar_id,Calendar) else str(calendar_id)
         body = event.trim() if isinstance(event,Event) else dict(event)
         request = {"calendarId": cid, "eventId": body['id'], "body": body,
-                   "sendUpdates": sendUpdates, "supportsAttachments" : supportsAttachments,
+                   "supportsAttachments" : supportsAttachments,
                    "conferenceDataVersion" : 0 if not conferenceDataVersion else 1}
         if maxAttendees > 0:
             request['maxAttendees'] = maxAttendees
@@ -513,10 +919,159 @@ class Event(GoogleWorkSpaceResourceBase):
             if sendUpdates not in ["all", "externalOnly", "none"]:
                 raise ValueError(f"Invalid Event::update() sendUpdates value: {sendUpdates}")
             request['sendUpdates'] = sendUpdates
-        e = _get_service().events().insert(**request).execute()
-        if isinstance(event,Event):
-            event.update_fields(**e)
-            return event
-        return Event(**e)
-        
+        return request
+
+    @staticmethod
+    def update(calendar_id: str|Calendar, event: Self|dict,
+               sendUpdates: str = "",
+               maxAttendees: int = 0,
+               supportsAttachments: bool = False,
+               conferenceDataVersion: int = 0) -> Self:
+        """
+        https://developers.google.com/calendar/api/v3/reference/events/update
+        Update the event on the specified calendar.
+        """
+        request = Event._update_args(calendar_id, event, sendUpdates, maxAttendees,
+                                     supportsAttachments, conferenceDataVersion)
+        response = gws.execute(_get_service().events().update(**request))
+        return Event._filled(event, response)
+
+    @staticmethod
+    async def aupdate(calendar_id: str|Calendar, event: Self|dict,
+                      sendUpdates: str = "",
+                      maxAttendees: int = 0,
+                      supportsAttachments: bool = False,
+                      conferenceDataVersion: int = 0) -> Self:
+        """
+        Async version of Event::update
+        """
+        service = await _get_async_service()
+        request = Event._update_args(calendar_id, event, sendUpdates, maxAttendees,
+                                     supportsAttachments, conferenceDataVersion)
+        response = await service.execute(service.events().update(**request))
+        return Event._filled(event, response)
+
+    @staticmethod
+    def insert_many(calendar_id: str|Calendar, events: Iterable[Self|dict],
+                    sendUpdates: str = "",
+                    maxAttendees: int = 0,
+                    supportsAttachments: bool = False,
+                    conferenceDataVersion: int = 0) -> List[BatchResult]:
+        """
+        Event::insert a number of events through the batch endpoint.
+        Events passed in are filled out as with Event::insert.  Returns a result per
+        event in order, with the Event as the response or the exception if it failed.
+        Failed inserts are never sent again as they may have been applied anyway,
+        resending those that failed would risk a duplicate.
+        """
+        service = _get_service()
+        batch = Batch("calendar", "v3", retry_failed=False)
+        for event in events:
+            request = Event._insert_args(calendar_id, event, sendUpdates, maxAttendees,
+                                         supportsAttachments, conferenceDataVersion)
+            batch.add(service.events().insert(**request), partial(Event._filled, event))
+        return batch.execute()
 
+    @staticmethod
+    def update_many(calendar_id: str|Calendar, events: Iterable[Self|dict],
+                    sendUpdates: str = "",
+                    maxAttendees: int = 0,
+                    supportsAttachments: bool = False,
+                    conferenceDataVersion: int = 0) -> List[BatchResult]:
+        """
+        Event::update a number of events through the batch endpoint.
+        Events passed in are filled out as with Event::update.  Returns a result per
+        event in order, with the Event as the response or the exception if it failed.
+        """
+        service = _get_service()
+        batch = Batch("calendar", "v3")
+        for event in events:
+            request = Event._update_args(calendar_id, event, sendUpdates, maxAttendees,
+                                         supportsAttachments, conferenceDataVersion)
+            batch.add(service.events().update(**request), partial(Event._filled, event))
+        return batch.execute()
+
+    @staticmethod
+    def delete_many(calendar_id: str|Calendar, event_ids: Iterable[str|Self],
+                    sendUpdates: str = "all") -> List[BatchResult]:
+        """
+        Event::delete a number of events through the batch endpoint.
+        Returns a result per event in order, check each for the exception if it failed.
+        """
+        service = _get_service()
+        batch = Batch("calendar", "v3")
+        for event_id in event_ids:
+            request = Event._delete_args(calendar_id, event_id, sendUpdates)
+            batch.add(service.events().delete(**request))
+        return batch.execute()
+
+@dataclass
+class FreeBusy():
+    """
+    Outcome of FreeBusy::query, the merged busy intervals per calendar within
+    timeMin to timeMax, and the errors for any calendar that couldn't be queried
+    (notFound, internalError, ...).  Those have no busy entry as nothing is known
+    about them, they are not free.
+    """
+    timeMin: datetime.datetime|None = field(default=None)
+    timeMax: datetime.datetime|None = field(default=None)
+    busy: dict[str,IntervalSet] = field(default_factory=dict)
+    errors: dict[str,List[dict]] = field(default_factory=dict)
+
+    # calendars per freebusy.query request
+    MAX_ITEMS = 50
+
+    def free(self, calendar_ids: List[str]|None = None,
+             minimum: datetime.timedelta|None = None) -> List[Interval]:
+        """
+        Windows where all of the calendars (default every one queried without error)
+        are free, optionally only those at least minimum long.
+        Raises ValueError for a calendar that errored or wasn't queried.
+        """
+        ids = self.busy.keys() if calendar_ids is None else calendar_ids
+        for i in ids:
+            if i in self.errors:
+                reasons = ', '.join(str(e.get('reason', e)) for e in self.errors[i])
+                raise ValueError(f"FreeBusy calendar {i} could not be queried: {reasons}")
+            if i not in self.busy:
+                raise ValueError(f"FreeBusy calendar {i} was not queried")
+        return common_free([self.busy[i] for i in ids], self.timeMin, self.timeMax, minimum)
+
+    def first_free(self, duration: datetime.timedelta,
+                   calendar_ids: List[str]|None = None) -> Interval|None:
+        """
+        The earliest slot of duration where all of the calendars are free.
+        Raises ValueError as FreeBusy::free does.
+        """
+        windows = self.free(calendar_ids, duration)
+        return (windows[0][0], windows[0][0] + duration) if windows else None
+
+    @staticmethod
+    def query(calendar_ids: Iterable[str|Calendar|CalendarList],
+              timeMin: datetime.date|datetime.datetime|str,
+              timeMax: datetime.date|datetime.datetime|str,
+              timeZone: str|ZoneInfo|None = None) -> "FreeBusy":
+        """
+        https://developers.google.com/calendar/api/v3/reference/freebusy/query
+        Busy periods for any number of calendars, split into as many requests as
+        the per-request calendar limit needs.  Naive times are taken to be in
+        timeZone, or UTC, as for Event::list.
+        """
+        ids = list(dict.fromkeys(c.id if isinstance(c, (Calendar, CalendarList)) else str(c)
+                                 for c in calendar_ids))
+        tz = _time_zone(timeZone) if timeZone else None
+        result = FreeBusy(to_datetime(timeMin, tz), to_datetime(timeMax, tz))
+        service = _get_service()
+        for i in range(0, len(ids), FreeBusy.MAX_ITEMS):
+            body = {'timeMin': result.timeMin.isoformat(),
+                    'timeMax': result.timeMax.isoformat(),
+                    'items': [{'id': cid} for cid in ids[i:i + FreeBusy.MAX_ITEMS]]}
+            if timeZone:
+                body['timeZone'] = str(timeZone)
+            response = gws.execute(service.freebusy().query(body=body))
+            for cid, cal in response.get('calendars', {}).items():
+                if cal.get('errors', None):
+                    result.errors[cid] = cal['errors']
+                else:
+                    result.busy[cid] = IntervalSet((b['start'], b['end']) for b in cal.get('busy', []))
+        return result
@@ -0,0 +1,134 @@
+"""
+Credential cache shared between threads and processes.
+Many workers starting at once would each read the cache file, refresh the token
+and rewrite (or delete) the file underneath each other.  Here the file is guarded
+by a lock file so only one thread or process refreshes at a time, writes are done
+to a temp file and swapped in atomically, and the parsed contents are held in memory
+and only re-read when the file changes on disk.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import os
+import threading
+
+try:
+    import fcntl
+
+    def _lock_file(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:
+    import msvcrt
+
+    def _lock_file(f) -> None:
+        f.seek(0)
+        # LK_LOCK only retries for 10 seconds so keep at it
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                pass
+
+    def _unlock_file(f) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+class CredentialStore():
+    """
+    A JSON credential cache file with an in-memory copy.
+    Hold lock() around anything that reads, refreshes and writes back so the
+    sequence is atomic across threads and processes.
+    """
+    def __init__(self, path: Path|str) -> None:
+        self._path = path if isinstance(path, Path) else Path(str(path))
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._lock_fd = None
+        self._info = None
+        self._stat = None
+
+    def __repr__(self) -> str:
+        return f"{str(self.__class__)}:{str(self._path)}"
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def lock_path(self) -> Path:
+        return self._path.with_name(self._path.name + '.lock')
+
+    @contextmanager
+    def lock(self):
+        """
+        Exclusive access to the cache across threads and processes.  Reentrant within a thread.
+        """
+        with self._thread_lock:
+            if self._depth == 0:
+                self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+                self._lock_fd = open(self.lock_path, 'a+b')
+                _lock_file(self._lock_fd)
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    _unlock_file(self._lock_fd)
+                    self._lock_fd.close()
+                    self._lock_fd = None
+
+    def _current_stat(self) -> tuple|None:
+        try:
+            st = os.stat(self._path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def load(self) -> dict|None:
+        """
+        The cached credential info, or None if there isn't any.
+        Only goes to disk if the file has changed since last time.
+        """
+        with self._thread_lock:
+            st = self._current_stat()
+            if st != self._stat:
+                info = None
+                if st is not None:
+                    try:
+                        with open(self._path, 'r', encoding='utf-8') as f:
+                            info = json.load(f)
+                    except (OSError, ValueError):
+                        info = None
+                self._info = info
+                self._stat = st
+            return None if self._info is None else dict(self._info)
+
+    def save(self, info: dict) -> None:
+        """
+        Atomically replace the cache contents.
+        """
+        with self._thread_lock:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_name(f"{self._path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(info, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self._path)
+            self._info = dict(info)
+            self._stat = self._current_stat()
+
+    def remove(self) -> None:
+        """
+        Drop the cache.
+        """
+        with self._thread_lock:
+            self._path.unlink(missing_ok=True)
+            self._info = None
+            self._stat = None
@@ -0,0 +1,104 @@
+"""
+Pre-serialized discovery documents for the services brettgws supports.
+build() looks up and parses the discovery document every time a service is built,
+and with per-thread services that is every new thread.  Here the documents brettgws
+was written against ship with the package, are read once per process and services
+are built straight from them with build_from_document().
+To pull fresh copies from the discovery endpoint:
+
+    python -m brettgws.discovery [--dir DIR] [name:version ...]
+
+Writing to somewhere other than the package needs gws.discovery_dir pointed at it.
+"""
+
+from pathlib import Path
+import json
+import threading
+
+DOCUMENT_DIR = Path(__file__).parent
+SERVICES = ("sheets:v4", "calendar:v3")
+
+_documents = {}
+_lock = threading.Lock()
+
+def document_path(name: str, version: str, directory: Path|str|None = None) -> Path:
+    d = DOCUMENT_DIR if directory is None else Path(directory)
+    return d / f"{name}.{version}.json"
+
+def document(name: str, version: str, directory: Path|str|None = None) -> str|None:
+    """
+    The raw JSON discovery document, or None if there isn't one available.
+    Looks in directory if given, then the bundled documents and finally the static
+    documents shipped with the Google client.  Whatever is found is held for the life
+    of the process.  The text rather than the parsed dict is held as the client
+    modifies the parsed document as methods are built.
+    """
+    key = (None if directory is None else str(directory), name, version)
+    doc = _documents.get(key, None)
+    if doc is None:
+        with _lock:
+            doc = _documents.get(key, None)
+            if doc is None:
+                for d in ([directory] if directory is not None else []) + [DOCUMENT_DIR]:
+                    p = document_path(name, version, d)
+                    if p.is_file():
+                        doc = p.read_text(encoding='utf-8')
+                        break
+                if doc is None:
+                    from googleapiclient.discovery_cache import get_static_doc
+                    doc = get_static_doc(name, version)
+                if doc is not None:
+                    _documents[key] = doc
+    return doc
+
+def clear() -> None:
+    """
+    Forget the documents read so far, next access will re-read them.
+    """
+    with _lock:
+        _documents.clear()
+
+def fetch(name: str, version: str, timeout: float = 30) -> dict:
+    """
+    Pull the current discovery document from the discovery endpoint.
+    """
+    from googleapiclient.discovery import DISCOVERY_URI, V2_DISCOVERY_URI
+    import urllib.request
+    import uritemplate
+    error = None
+    for uri in (DISCOVERY_URI, V2_DISCOVERY_URI):
+        url = uritemplate.expand(uri, {"api": name, "apiVersion": version})
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as r:
+                return json.loads(r.read().decode('utf-8'))
+        except Exception as e:
+            error = e
+    raise RuntimeError(f"Unable to fetch discovery document for {name}:{version}") from error
+
+def regenerate(directory: Path|str|None = None,
+               services: list[str]|tuple[str] = SERVICES) -> list[Path]:
+    """
+    Fetch and write out the discovery documents for name:version services.
+    """
+    written = []
+    for s in services:
+        name, version = str(s).split(':')
+        doc = fetch(name, version)
+        p = document_path(name, version, directory)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix('.tmp')
+        tmp.write_text(json.dumps(doc, separators=(',', ':'), sort_keys=True), encoding='utf-8')
+        tmp.replace(p)
+        written.append(p)
+    clear()
+    return written
+
+def main(argv: list[str]|None = None) -> None:
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m brettgws.discovery",
+                                     description="Regenerate the bundled discovery documents")
+    parser.add_argument("--dir", default=None, help="directory to write to, defaults to the package")
+    parser.add_argument("services", nargs="*", default=list(SERVICES), help="name:version, defaults to all supported")
+    args = parser.parse_args(argv)
+    for p in regenerate(args.dir, args.services):
+        print(p)
@@ -0,0 +1,133 @@
+"""
+ETag based conditional requests.
+Calendar resources carry an etag, so a poller re-fetching an object can send it back
+in If-None-Match and get a bodiless 304 if nothing changed rather than the whole
+resource to download and decode again.  The decoded objects are held in a small LRU
+keyed on the request so a get() of an unchanged object is answered from it.
+Opt-in via gws.etag_cache.enabled or the 'etag_cache' key of gws.config.
+Sheets has no etags so this is Calendar only.
+"""
+
+from collections import OrderedDict
+import copy
+import threading
+
+class ETagCache():
+    """
+    LRU of request key to (etag, decoded object).
+    """
+    def __init__(self, max_size: int = 256, enabled: bool = False) -> None:
+        self.max_size = max(1, int(max_size))
+        self.enabled = bool(enabled)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"{str(self.__class__)}:{len(self)}:{self.hits}/{self.misses}"
+
+    @property
+    def config(self) -> dict:
+        return {'max_size': self.max_size, 'enabled': self.enabled}
+
+    @staticmethod
+    def from_config(config: dict|None) -> "ETagCache":
+        if isinstance(config, ETagCache):
+            return config
+        return ETagCache(**dict(config if config else {}))
+
+    def get(self, key) -> tuple|None:
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def put(self, key, etag: str|None, obj) -> None:
+        with self._lock:
+            if not etag:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = (etag, obj)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+def _not_modified(error: Exception) -> bool:
+    resp = getattr(error, 'resp', None)
+    return resp is not None and getattr(resp, 'status', None) == 304
+
+def _prepare(cache: ETagCache, request, subject: str|None, etag: str|None) -> tuple:
+    key = (subject, request.methodId, request.uri)
+    entry = cache.get(key)
+    if etag is None and entry is not None:
+        etag = entry[0]
+    if etag:
+        request.headers['If-None-Match'] = etag
+    return key, entry
+
+def _unchanged(cache: ETagCache, entry: tuple|None, etag: str|None):
+    cache.hit()
+    if etag is None and entry is not None:
+        return copy.deepcopy(entry[1])
+    return None
+
+def _changed(cache: ETagCache, key, response: dict, decode):
+    cache.miss()
+    obj = decode(response)
+    cache.put(key, response.get('etag', None) if response else None, copy.deepcopy(obj))
+    return obj
+
+def get(request, decode, etag: str|None = None) -> tuple:
+    """
+    Send a GET request, conditional on the etag if given or the one cached for the
+    same request otherwise.  Returns (object, changed), where object is decode(response),
+    a copy of the cached object if unchanged, or None if unchanged from the given etag.
+    """
+    from .access import gws
+    cache = gws.etag_cache
+    if not cache.enabled:
+        return decode(gws.execute(request)), True
+    key, entry = _prepare(cache, request, gws.current_subject, etag)
+    try:
+        response = gws.execute(request)
+    except Exception as e:
+        if not _not_modified(e):
+            raise
+        return _unchanged(cache, entry, etag), False
+    return _changed(cache, key, response, decode), True
+
+async def aget(service, request, decode, etag: str|None = None) -> tuple:
+    """
+    Async version of get() sending the request through an async service.
+    """
+    from .access import gws
+    cache = gws.etag_cache
+    if not cache.enabled:
+        return decode(await service.execute(request)), True
+    key, entry = _prepare(cache, request, gws.current_subject, etag)
+    try:
+        response = await service.execute(request)
+    except Exception as e:
+        if not _not_modified(e):
+            raise
+        return _unchanged(cache, entry, etag), False
+    return _changed(cache, key, response, decode), True
@@ -0,0 +1,242 @@
+"""
+Index over a collection of Events for overlap and conflict queries.
+Checking every event against every other with Event.duration() is quadratic.  Here
+the events are normalised to UTC spans once and held in arrays sorted by start and
+by end, with a max-end segment tree over the start order, so overlap queries only
+descend into subtrees holding at least one overlapping span.  Each of the k spans
+found costs at most one walk down the tree, O((k + 1) log n) rather than O(n).
+Inserts and removes are buffered, with removed events tombstoned, and the arrays are
+rebuilt once the buffer grows past about the square root of the index size, which
+is how much a query also scans on top of the tree and the most tombstones it can
+step over.
+All-day events have no timezone of their own so their dates are taken as midnight
+in all_day_tz, UTC by default.  Naive dateTimes use the event's timeZone, or UTC.
+"""
+
+from collections.abc import Iterable
+from typing import List, Tuple
+from zoneinfo import ZoneInfo
+import bisect
+import datetime
+
+from .calendar import Event, EventDateTime
+
+_NEG_INF = float('-inf')
+
+class EventIndex():
+    """
+    Events indexed by their [start, end) span.  Events are keyed by id, inserting
+    an event with the id of one already there replaces it.
+    """
+    def __init__(self, events: Iterable[Event] = (),
+                 all_day_tz: ZoneInfo|str|None = None) -> None:
+        tz = all_day_tz if all_day_tz is None or isinstance(all_day_tz, ZoneInfo) else ZoneInfo(str(all_day_tz))
+        self.all_day_tz = tz if tz is not None else datetime.timezone.utc
+        self._live = {}
+        for e in events:
+            span = self.span(e)
+            if span is not None:
+                self._live[self._key(e)] = (span[0], span[1], e)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, event: Event|str) -> bool:
+        return self._key(event) in self._live
+
+    def __iter__(self):
+        return (e for _, _, e in sorted(self._live.values(), key=lambda x: (x[0], x[1])))
+
+    def __repr__(self) -> str:
+        return f"{str(self.__class__)}:{len(self)}"
+
+    @staticmethod
+    def _key(event: Event|str):
+        if isinstance(event, Event):
+            return event.id if event.id else id(event)
+        return str(event)
+
+    def _edge(self, edt: EventDateTime) -> float|None:
+        if edt.dateTime is not None:
+            dt = edt.dateTime
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=edt.timeZone if edt.timeZone is not None else datetime.timezone.utc)
+            return dt.timestamp()
+        if edt.date is not None:
+            return datetime.datetime.combine(edt.date, datetime.time.min, tzinfo=self.all_day_tz).timestamp()
+        return None
+
+    def span(self, event: Event) -> Tuple[float,float]|None:
+        """
+        (start, end) of the event as POSIX timestamps, None if it has no start.
+        A missing end is taken as the start.
+        """
+        if event.start is None:
+            return None
+        start = self._edge(event.start)
+        if start is None:
+            return None
+        end = self._edge(event.end) if event.end is not None else None
+        return (start, max(start, end if end is not None else start))
+
+    @staticmethod
+    def _timestamp(when: datetime.date|datetime.datetime|str|float) -> float:
+        if isinstance(when, (int, float)):
+            return float(when)
+        if isinstance(when, str):
+            when = datetime.datetime.fromisoformat(when)
+        if not isinstance(when, datetime.datetime):
+            when = datetime.datetime.combine(when, datetime.time.min)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=datetime.timezone.utc)
+        return when.timestamp()
+
+    def _build(self) -> None:
+        entries = sorted(self._live.items(), key=lambda kv: (kv[1][0], kv[1][1]))
+        self._keys = [k for k, _ in entries]
+        self._starts = [v[0] for _, v in entries]
+        self._ends = [v[1] for _, v in entries]
+        self._events = [v[2] for _, v in entries]
+        by_end = sorted(range(len(entries)), key=lambda i: self._ends[i])
+        self._by_end = by_end
+        self._end_sorted = [self._ends[i] for i in by_end]
+        size = 1
+        while size < len(entries):
+            size *= 2
+        tree = [_NEG_INF] * (2 * size)
+        tree[size:size + len(entries)] = self._ends
+        for i in range(size - 1, 0, -1):
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+        self._size = size
+        self._tree = tree
+        self._pending = {}
+        self._dead = set()
+
+    def _maybe_rebuild(self) -> None:
+        if len(self._pending) + len(self._dead) > max(32, int(len(self._live) ** 0.5)):
+            self._build()
+
+    def insert(self, event: Event) -> None:
+        """
+        Add or replace an event.  Events with no start are not indexed.
+        """
+        key = self._key(event)
+        self.remove(key)
+        span = self.span(event)
+        if span is None:
+            return
+        self._live[key] = (span[0], span[1], event)
+        self._pending[key] = self._live[key]
+        self._maybe_rebuild()
+
+    def remove(self, event: Event|str) -> bool:
+        """
+        Drop an event by object or id, returning whether it was there.
+        """
+        key = self._key(event)
+        if self._live.pop(key, None) is None:
+            return False
+        if self._pending.pop(key, None) is None:
+            self._dead.add(key)
+        self._maybe_rebuild()
+        return True
+
+    def _static_overlapping(self, qs: float, qe: float) -> List[int]:
+        """
+        Indices into the built arrays of spans with start < qe and end > qs, in start order.
+        """
+        hi = bisect.bisect_left(self._starts, qe)
+        found = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, lo, top = stack.pop()
+            if lo >= hi or self._tree[node] <= qs:
+                continue
+            if top - lo == 1:
+                found.append(lo)
+                continue
+            mid = (lo + top) // 2
+            stack.append((2 * node + 1, mid, top))
+            stack.append((2 * node, lo, mid))
+        return found
+
+    def _overlapping(self, qs: float, qe: float) -> List[Tuple[float,float,Event]]:
+        hits = [(self._starts[i], self._ends[i], self._events[i]) for i in self._static_overlapping(qs, qe)
+                if self._keys[i] not in self._dead]
+        if self._pending:
+            hits.extend(v for v in self._pending.values() if v[0] < qe and v[1] > qs)
+            hits.sort(key=lambda x: (x[0], x[1]))
+        return hits
+
+    def overlapping(self, start: datetime.date|datetime.datetime|str|float,
+                    end: datetime.date|datetime.datetime|str|float) -> List[Event]:
+        """
+        Events overlapping [start, end), in start order.
+        """
+        return [e for _, _, e in self._overlapping(self._timestamp(start), self._timestamp(end))]
+
+    def at(self, when: datetime.date|datetime.datetime|str|float) -> List[Event]:
+        """
+        Events in progress at a point in time.
+        """
+        t = self._timestamp(when)
+        return [e for s, _, e in self._overlapping(t, t + 1e-6) if s <= t]
+
+    def within(self, start: datetime.date|datetime.datetime|str|float,
+               end: datetime.date|datetime.datetime|str|float) -> List[Event]:
+        """
+        Events that start and end inside [start, end).
+        """
+        qs, qe = self._timestamp(start), self._timestamp(end)
+        return [e for s, f, e in self._overlapping(qs, qe) if s >= qs and f <= qe]
+
+    def conflicts(self, event: Event) -> List[Event]:
+        """
+        Other events overlapping the given one.
+        """
+        span = self.span(event)
+        if span is None or span[0] == span[1]:
+            return []
+        key = self._key(event)
+        return [e for _, _, e in self._overlapping(*span) if self._key(e) != key]
+
+    def nearest(self, when: datetime.date|datetime.datetime|str|float, count: int = 1) -> List[Event]:
+        """
+        The count events closest to a point in time, those in progress first then
+        by the gap to their start or end.
+        """
+        t = self._timestamp(when)
+        ranked = [(0.0, s, e) for s, _, e in self._overlapping(t, t + 1e-6) if s <= t]
+        # the next to start after and the last to end before, skipping tombstones
+        i = bisect.bisect_right(self._starts, t)
+        taken = 0
+        while i < len(self._starts) and taken < count:
+            if self._keys[i] not in self._dead:
+                ranked.append((self._starts[i] - t, self._starts[i], self._events[i]))
+                taken += 1
+            i += 1
+        j = bisect.bisect_right(self._end_sorted, t) - 1
+        taken = 0
+        while j >= 0 and taken < count:
+            k = self._by_end[j]
+            if self._keys[k] not in self._dead:
+                ranked.append((t - self._ends[k], self._starts[k], self._events[k]))
+                taken += 1
+            j -= 1
+        for s, f, e in self._pending.values():
+            if s > t:
+                ranked.append((s - t, s, e))
+            elif f <= t:
+                ranked.append((t - f, s, e))
+        ranked.sort(key=lambda x: (x[0], x[1]))
+        found = []
+        seen = set()
+        for _, _, e in ranked:
+            key = self._key(e)
+            if key not in seen:
+                seen.add(key)
+                found.append(e)
+            if len(found) >= count:
+                break
+        return found
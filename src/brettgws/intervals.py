@@ -0,0 +1,160 @@
+"""
+Sorted, merged time intervals for availability queries.
+Busy periods from any number of sources are sorted and merged once, O(n log n),
+into disjoint intervals.  From there the free windows within a range, the first
+free slot of a given length and point/overlap checks are all linear or binary
+searches over the merged list.
+Times are timezone aware datetimes.  Naive datetimes are taken as UTC and dates
+as UTC midnight so everything compares.
+"""
+
+from collections.abc import Iterable
+from typing import List, Tuple
+import bisect
+import datetime
+
+Interval = Tuple[datetime.datetime, datetime.datetime]
+
+def to_datetime(value: datetime.date|datetime.datetime|str,
+                tz: datetime.tzinfo|None = None) -> datetime.datetime:
+    """
+    A timezone aware datetime from a datetime, date or ISO string.
+    Naive values are taken to be in tz, or UTC if not given.
+    """
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time.min)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=tz if tz is not None else datetime.timezone.utc)
+    return value
+
+def merge(intervals: Iterable) -> List[Interval]:
+    """
+    Sort and merge (start, end) pairs into disjoint intervals.
+    Touching intervals are merged, empty ones dropped.
+    """
+    spans = sorted((to_datetime(s), to_datetime(e)) for s, e in intervals)
+    merged = []
+    for s, e in spans:
+        if e <= s:
+            continue
+        if merged and s <= merged[-1][1]:
+            if e > merged[-1][1]:
+                merged[-1] = (merged[-1][0], e)
+        else:
+            merged.append((s, e))
+    return merged
+
+class IntervalSet():
+    """
+    A set of disjoint intervals kept sorted, typically busy periods.
+    """
+    def __init__(self, intervals: Iterable = ()) -> None:
+        self._intervals = merge(intervals)
+        self._starts = [s for s, _ in self._intervals]
+
+    def __iter__(self):
+        return iter(self._intervals)
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def __bool__(self) -> bool:
+        return bool(self._intervals)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IntervalSet) and self._intervals == other._intervals
+
+    def __repr__(self) -> str:
+        return f"{str(self.__class__)}:{len(self)}"
+
+    @property
+    def intervals(self) -> List[Interval]:
+        return list(self._intervals)
+
+    def union(self, *others: "IntervalSet") -> "IntervalSet":
+        spans = list(self._intervals)
+        for o in others:
+            spans.extend(o._intervals)
+        return IntervalSet(spans)
+
+    def add(self, start: datetime.date|datetime.datetime|str,
+            end: datetime.date|datetime.datetime|str) -> None:
+        """
+        Add an interval, merging with any it touches.
+        """
+        s, e = to_datetime(start), to_datetime(end)
+        if e <= s:
+            return
+        lo = bisect.bisect_left(self._starts, s)
+        if lo > 0 and self._intervals[lo - 1][1] >= s:
+            lo -= 1
+        hi = bisect.bisect_right(self._starts, e)
+        if lo < hi:
+            s = min(s, self._intervals[lo][0])
+            e = max(e, self._intervals[hi - 1][1])
+        self._intervals[lo:hi] = [(s, e)]
+        self._starts[lo:hi] = [s]
+
+    def contains(self, when: datetime.date|datetime.datetime|str) -> bool:
+        """
+        Whether a point in time falls in one of the intervals, start inclusive, end exclusive.
+        """
+        t = to_datetime(when)
+        i = bisect.bisect_right(self._starts, t) - 1
+        return i >= 0 and t < self._intervals[i][1]
+
+    def overlapping(self, start: datetime.date|datetime.datetime|str,
+                    end: datetime.date|datetime.datetime|str) -> List[Interval]:
+        """
+        The intervals overlapping [start, end).
+        """
+        s, e = to_datetime(start), to_datetime(end)
+        i = max(0, bisect.bisect_right(self._starts, s) - 1)
+        found = []
+        while i < len(self._intervals) and self._intervals[i][0] < e:
+            if self._intervals[i][1] > s:
+                found.append(self._intervals[i])
+            i += 1
+        return found
+
+    def free(self, start: datetime.date|datetime.datetime|str,
+             end: datetime.date|datetime.datetime|str,
+             minimum: datetime.timedelta|None = None) -> List[Interval]:
+        """
+        The gaps within [start, end) not covered by any interval, optionally only
+        those at least minimum long.
+        """
+        s, e = to_datetime(start), to_datetime(end)
+        gaps = []
+        cursor = s
+        for bs, be in self.overlapping(s, e):
+            if bs > cursor:
+                gaps.append((cursor, bs))
+            cursor = max(cursor, be)
+        if cursor < e:
+            gaps.append((cursor, e))
+        if minimum is not None:
+            gaps = [g for g in gaps if g[1] - g[0] >= minimum]
+        return gaps
+
+    def first_free(self, duration: datetime.timedelta,
+                   start: datetime.date|datetime.datetime|str,
+                   end: datetime.date|datetime.datetime|str) -> Interval|None:
+        """
+        The earliest slot of duration within [start, end) that is free, None if there isn't one.
+        """
+        for gs, ge in self.free(start, end):
+            if ge - gs >= duration:
+                return (gs, gs + duration)
+        return None
+
+def common_free(busy: Iterable[IntervalSet],
+                start: datetime.date|datetime.datetime|str,
+                end: datetime.date|datetime.datetime|str,
+                minimum: datetime.timedelta|None = None) -> List[Interval]:
+    """
+    Windows within [start, end) where none of the sets are busy.
+    """
+    return IntervalSet().union(*busy).free(start, end, minimum)
@@ -0,0 +1,274 @@
+"""
+Per-call instrumentation of GWS requests.
+Every request sent through gws.execute() or an async service can produce a
+CallRecord: the service and method, latency, request and response bytes, final
+HTTP status, how many retries it took and which page of a listing it was.  Records
+go to whatever sinks are added to gws.metrics, with an in-memory histogram, a
+Prometheus textfile exporter and a structured log line provided.  With no sinks
+added nothing is measured.
+
+    from brettgws.metrics import HistogramSink
+    hist = gws.metrics.add_sink(HistogramSink())
+    ...
+    print(hist.snapshot())
+"""
+
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+import abc
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+
+# same as the Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+@dataclass
+class CallRecord():
+    """
+    One API call.  Latency covers retries and any quota wait.  status is 0 when
+    no response came back at all.  page is the page number of a listing, from 1,
+    or None for calls that aren't part of one.
+    """
+    service: str = field(default="")
+    method: str = field(default="")
+    latency: float = field(default=0.0)
+    request_bytes: int = field(default=0)
+    response_bytes: int = field(default=0)
+    status: int = field(default=0)
+    retries: int = field(default=0)
+    page: int|None = field(default=None)
+    error: str|None = field(default=None)
+
+class MetricsSink(abc.ABC):
+    """
+    Base class for somewhere to send CallRecords.
+    """
+    @abc.abstractmethod
+    def record(self, record: CallRecord) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+class _Series():
+    def __init__(self, buckets: tuple) -> None:
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+        self.pages = 0
+        self.errors = 0
+        self.statuses = {}
+
+class HistogramSink(MetricsSink):
+    """
+    In-memory latency histogram and totals per service and method.
+    """
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(self, record: CallRecord) -> None:
+        key = (record.service, record.method)
+        with self._lock:
+            s = self._series.get(key, None)
+            if s is None:
+                s = self._series[key] = _Series(self.buckets)
+            s.counts[bisect.bisect_left(self.buckets, record.latency)] += 1
+            s.count += 1
+            s.sum += record.latency
+            s.request_bytes += record.request_bytes
+            s.response_bytes += record.response_bytes
+            s.retries += record.retries
+            if record.page is not None:
+                s.pages += 1
+            if record.error is not None:
+                s.errors += 1
+            s.statuses[record.status] = s.statuses.get(record.status, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series = {}
+
+    def snapshot(self) -> dict:
+        """
+        {(service, method): stats} with cumulative bucket counts keyed on the upper bound.
+        """
+        snap = {}
+        with self._lock:
+            for key, s in self._series.items():
+                cumulative = {}
+                total = 0
+                for bound, c in zip(self.buckets + (float('inf'),), s.counts):
+                    total += c
+                    cumulative[bound] = total
+                snap[key] = {'count': s.count, 'sum': s.sum,
+                             'mean': s.sum / s.count if s.count else 0.0,
+                             'buckets': cumulative,
+                             'request_bytes': s.request_bytes,
+                             'response_bytes': s.response_bytes,
+                             'retries': s.retries, 'pages': s.pages,
+                             'errors': s.errors, 'statuses': dict(s.statuses)}
+        return snap
+
+def _labels(**kwargs) -> str:
+    return ','.join(f'{k}="{str(v)}"' for k,v in kwargs.items())
+
+class PrometheusTextfileSink(HistogramSink):
+    """
+    Writes the histogram out in the Prometheus text format for the node exporter
+    textfile collector.  The file is rewritten at most every interval seconds,
+    and on flush().
+    """
+    def __init__(self, path: Path|str, interval: float = 15.0,
+                 buckets: tuple = DEFAULT_BUCKETS) -> None:
+        super().__init__(buckets)
+        self.path = path if isinstance(path, Path) else Path(str(path))
+        self.interval = float(interval)
+        self._written = 0.0
+
+    def record(self, record: CallRecord) -> None:
+        super().record(record)
+        if time.monotonic() - self._written >= self.interval:
+            self.flush()
+
+    def render(self) -> str:
+        lines = ["# HELP brettgws_request_duration_seconds GWS API call latency including retries.",
+                 "# TYPE brettgws_request_duration_seconds histogram"]
+        snap = self.snapshot()
+        for (service, method), s in sorted(snap.items()):
+            for bound, c in s['buckets'].items():
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                lines.append(f"brettgws_request_duration_seconds_bucket{{{_labels(service=service, method=method, le=le)}}} {c}")
+            lines.append(f"brettgws_request_duration_seconds_sum{{{_labels(service=service, method=method)}}} {s['sum']}")
+            lines.append(f"brettgws_request_duration_seconds_count{{{_labels(service=service, method=method)}}} {s['count']}")
+        for name, key, help in (("brettgws_request_bytes_total", 'request_bytes', "Request body bytes sent."),
+                                ("brettgws_response_bytes_total", 'response_bytes', "Response body bytes received."),
+                                ("brettgws_retries_total", 'retries', "Requests sent again after a failure."),
+                                ("brettgws_pages_total", 'pages', "Pages fetched by listings.")):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} counter")
+            for (service, method), s in sorted(snap.items()):
+                lines.append(f"{name}{{{_labels(service=service, method=method)}}} {s[key]}")
+        lines.append("# HELP brettgws_requests_total GWS API calls by final HTTP status.")
+        lines.append("# TYPE brettgws_requests_total counter")
+        for (service, method), s in sorted(snap.items()):
+            for status, c in sorted(s['statuses'].items()):
+                lines.append(f"brettgws_requests_total{{{_labels(service=service, method=method, status=status)}}} {c}")
+        return '\n'.join(lines) + '\n'
+
+    def flush(self) -> None:
+        self._written = time.monotonic()
+        text = self.render()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(text, encoding='utf-8')
+        os.replace(tmp, self.path)
+
+class LogSink(MetricsSink):
+    """
+    One JSON log line per call.
+    """
+    def __init__(self, logger: logging.Logger|str = "brettgws.metrics",
+                 level: int = logging.INFO) -> None:
+        self.logger = logger if isinstance(logger, logging.Logger) else logging.getLogger(str(logger))
+        self.level = level
+
+    def record(self, record: CallRecord) -> None:
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, json.dumps(asdict(record), separators=(',', ':')))
+
+def _size(data) -> int:
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        return len(data.encode('utf-8'))
+    try:
+        return len(data)
+    except TypeError:
+        return 0
+
+class _Call():
+    """
+    Tracks a call in flight.  The request's postproc is wrapped to see the
+    response as it is decoded, and put back when the call finishes.
+    """
+    def __init__(self, metrics: "Metrics", request, page: int|None) -> None:
+        self._metrics = metrics
+        self._request = request
+        method_id = str(getattr(request, 'methodId', None) or 'batch')
+        service, _, method = method_id.partition('.')
+        self.record = CallRecord(service, method if method else service,
+                                 request_bytes=_size(getattr(request, 'body', None)), page=page)
+        self.attempts = 0
+        postproc = self._postproc = getattr(request, 'postproc', None)
+        if postproc is not None:
+            def counted(resp, content):
+                # a batch only has its body once it is sent
+                self.record.request_bytes = _size(getattr(request, 'body', None))
+                self.record.status = int(resp.status)
+                self.record.response_bytes = _size(content)
+                return postproc(resp, content)
+            request.postproc = counted
+        self._start = time.perf_counter()
+
+    def finish(self, error: Exception|None = None) -> None:
+        if self._postproc is not None:
+            self._request.postproc = self._postproc
+        r = self.record
+        r.latency = time.perf_counter() - self._start
+        r.retries = max(0, self.attempts - 1)
+        if error is not None:
+            r.error = type(error).__name__
+            resp = getattr(error, 'resp', None)
+            if resp is not None and getattr(resp, 'status', None) is not None:
+                r.status = int(resp.status)
+                r.response_bytes = _size(getattr(error, 'content', None))
+        self._metrics.emit(r)
+
+class Metrics():
+    """
+    The sinks CallRecords are sent to.
+    """
+    def __init__(self) -> None:
+        self._sinks = ()
+        self._lock = threading.Lock()
+
+    @property
+    def sinks(self) -> tuple:
+        return self._sinks
+
+    def add_sink(self, sink: MetricsSink) -> MetricsSink:
+        with self._lock:
+            self._sinks = self._sinks + (sink,)
+        return sink
+
+    def remove_sink(self, sink: MetricsSink) -> None:
+        with self._lock:
+            self._sinks = tuple(s for s in self._sinks if s is not sink)
+
+    def start(self, request, page: int|None = None) -> _Call|None:
+        """
+        Start tracking a call, None if there is nowhere to send it.
+        """
+        if not self._sinks:
+            return None
+        return _Call(self, request, page)
+
+    def emit(self, record: CallRecord) -> None:
+        for s in self._sinks:
+            try:
+                s.record(record)
+            except Exception:
+                logging.getLogger(__name__).exception("metrics sink %r failed", s)
+
+    def flush(self) -> None:
+        for s in self._sinks:
+            s.flush()
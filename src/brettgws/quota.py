@@ -0,0 +1,153 @@
+"""
+Client side quota scheduling for GWS requests.
+The APIs enforce per user per minute quotas, Sheets for example allows 60 reads and
+60 writes a minute per user.  Firing requests as fast as they are asked for means a
+burst of 429s, then everything backing off and sitting idle.  Here each service,
+operation class (read or write) and user gets a token bucket refilled at the quota
+rate so requests are paced out to run right at the quota instead.
+Applied to every request sent through gws.execute() and the async services, and
+configured via gws.quota or the 'quota' key of gws.config.
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+# per user per minute defaults
+DEFAULT_LIMITS = {
+    'sheets': {'read': 60, 'write': 60},
+    'calendar': {'read': 600, 'write': 600},
+}
+
+# POSTs that only read
+READ_METHODS = frozenset((
+    'calendar.freebusy.query',
+    'sheets.spreadsheets.getByDataFilter',
+    'sheets.spreadsheets.values.batchGetByDataFilter',
+))
+
+def operation_class(request) -> str:
+    """
+    'read' or 'write' for a request built from a service.
+    """
+    if getattr(request, 'methodId', None) in READ_METHODS:
+        return 'read'
+    return 'read' if str(getattr(request, 'method', 'GET')).upper() == 'GET' else 'write'
+
+class TokenBucket():
+    """
+    rate tokens a second up to capacity.  Callers take a token whether or not one is
+    there and are told how long to wait for it, so waiters queue up in order rather
+    than all waking at once to fight over the next token.
+    """
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{str(self.__class__)}:{self.rate}/s:{self.capacity}"
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, returning the seconds to wait before using them.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+class QuotaLimiter():
+    """
+    A token bucket per service, operation class and user.
+    limits maps service name to {'read': n, 'write': n} requests per period seconds,
+    services or classes not listed are not limited.  burst is how many requests
+    can go straight out before pacing kicks in.  Buckets are kept for at most
+    max_buckets service, class and user combinations, the least recently used are
+    dropped past this as with many impersonated users they would otherwise pile up.
+    """
+    def __init__(self, limits: dict|None = None,
+                 period: float = 60.0,
+                 burst: float = 10.0,
+                 enabled: bool = True,
+                 max_buckets: int = 1024) -> None:
+        self.limits = {k: dict(v) for k,v in (DEFAULT_LIMITS if limits is None else limits).items()}
+        self.period = float(period)
+        self.burst = float(burst)
+        self.enabled = bool(enabled)
+        self.max_buckets = max(1, int(max_buckets))
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{str(self.__class__)}:{str(self.config)}"
+
+    @property
+    def config(self) -> dict:
+        return {'limits': self.limits, 'period': self.period,
+                'burst': self.burst, 'enabled': self.enabled,
+                'max_buckets': self.max_buckets}
+
+    @staticmethod
+    def from_config(config: dict|None) -> "QuotaLimiter":
+        if isinstance(config, QuotaLimiter):
+            return config
+        return QuotaLimiter(**dict(config if config else {}))
+
+    def bucket(self, service: str, op: str, user: str|None = None) -> TokenBucket|None:
+        """
+        The bucket for a service, 'read' or 'write' and user, None if not limited.
+        """
+        limit = self.limits.get(service, {}).get(op, None)
+        if not limit:
+            return None
+        key = (service, op, user)
+        with self._lock:
+            b = self._buckets.get(key, None)
+            if b is None:
+                b = TokenBucket(float(limit) / self.period, min(self.burst, float(limit)))
+                self._buckets[key] = b
+                while len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+        return b
+
+    def delay(self, request, user: str|None = None) -> float:
+        """
+        Take a token for the request, returning the seconds to wait before sending it.
+        """
+        if not self.enabled:
+            return 0.0
+        parts = getattr(request, 'requests', None)
+        if parts is not None:
+            # a batch takes a token for each request in it
+            return max([self.delay(r, user) for r in parts], default=0.0)
+        method_id = getattr(request, 'methodId', None)
+        if not method_id:
+            return 0.0
+        b = self.bucket(str(method_id).split('.', 1)[0], operation_class(request), user)
+        return 0.0 if b is None else b.reserve()
+
+    def acquire(self, request, user: str|None = None) -> None:
+        """
+        Block until the request can be sent.
+        """
+        d = self.delay(request, user)
+        if d > 0:
+            time.sleep(d)
+
+    async def aacquire(self, request, user: str|None = None) -> None:
+        """
+        Async version of acquire()
+        """
+        d = self.delay(request, user)
+        if d > 0:
+            import asyncio
+            await asyncio.sleep(d)
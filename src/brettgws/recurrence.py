@@ -0,0 +1,226 @@
+"""
+Local expansion of recurring events.
+With singleEvents=True GWS sends every instance of a recurring event as a full event,
+so a long running weekly meeting costs a full payload per week.  Listing with
+singleEvents=False instead returns each recurring event once, its recurrence rules
+(RRULE, EXRULE, RDATE, EXDATE) and only the instances that were changed or cancelled,
+and the instances are worked out here for whatever window is needed.  Instances are
+generated lazily in start order.
+Requires python-dateutil, which is an optional dependency: pip install brettgws[recurrence]
+
+    events = Event.list('primary', timeMin=start, timeMax=end, singleEvents=False)
+    for e in expand(events, start, end):
+        ...
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import List, Tuple
+from zoneinfo import ZoneInfo
+import dataclasses
+import datetime
+import heapq
+import re
+
+try:
+    from dateutil import rrule
+except ImportError as e:
+    raise ImportError("brettgws recurrence support requires python-dateutil: pip install brettgws[recurrence]") from e
+
+from .calendar import Calendar, Event, EventDateTime
+from .intervals import to_datetime
+
+_UNTIL = re.compile(r'UNTIL=(\d{8})(T\d{6})?(Z?)', re.IGNORECASE)
+
+def _dtstart(edt: EventDateTime) -> datetime.datetime:
+    """
+    Where the rules are anchored.  Timed events are expanded in their own timeZone so
+    the wall clock time holds across daylight saving changes.  All-day events are naive.
+    """
+    if edt.dateTime is None:
+        return datetime.datetime.combine(edt.date, datetime.time.min)
+    dt = edt.dateTime
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=edt.timeZone if edt.timeZone is not None else datetime.timezone.utc)
+    return dt.astimezone(edt.timeZone) if edt.timeZone is not None else dt
+
+def _fix_until(rule: str, dtstart: datetime.datetime) -> str:
+    """
+    dateutil insists UNTIL is UTC for a timezone aware start and naive otherwise,
+    which GWS doesn't always keep to.
+    """
+    def fix(m: re.Match) -> str:
+        if dtstart.tzinfo is None:
+            return f"UNTIL={m.group(1)}{m.group(2) or ''}"
+        if m.group(3):
+            return m.group(0)
+        until = datetime.datetime.strptime(m.group(1) + (m.group(2) or 'T235959'), '%Y%m%dT%H%M%S')
+        until = until.replace(tzinfo=dtstart.tzinfo).astimezone(datetime.timezone.utc)
+        return f"UNTIL={until.strftime('%Y%m%dT%H%M%S')}Z"
+    return _UNTIL.sub(fix, rule)
+
+def _dates(params: dict, value: str, dtstart: datetime.datetime) -> List[datetime.datetime]:
+    """
+    The values of an RDATE or EXDATE line in the same form as dtstart.
+    """
+    tz = ZoneInfo(params['TZID']) if 'TZID' in params else dtstart.tzinfo
+    dates = []
+    for v in value.split(','):
+        # a PERIOD is start/end or start/duration, only the start matters
+        v = v.strip().split('/')[0]
+        if not v:
+            continue
+        if len(v) == 8:
+            d = datetime.datetime.strptime(v, '%Y%m%d')
+            if dtstart.tzinfo is not None:
+                d = datetime.datetime.combine(d.date(), dtstart.timetz())
+        else:
+            d = datetime.datetime.strptime(v.rstrip('Zz'), '%Y%m%dT%H%M%S')
+            d = d.replace(tzinfo=datetime.timezone.utc if v[-1] in 'Zz' else tz)
+            if dtstart.tzinfo is None:
+                d = datetime.datetime.combine(d.date(), datetime.time.min)
+        dates.append(d)
+    return dates
+
+def rule_set(master: Event) -> Tuple[rrule.rruleset, datetime.datetime]:
+    """
+    The dateutil rruleset for a recurring event's recurrence lines and the start
+    it is anchored on.
+    """
+    dtstart = _dtstart(master.start)
+    rset = rrule.rruleset()
+    for line in master.recurrence if master.recurrence else []:
+        head, _, value = line.partition(':')
+        name, *parms = head.split(';')
+        params = dict(p.split('=', 1) for p in parms if '=' in p)
+        name = name.strip().upper()
+        if name == 'RRULE':
+            rset.rrule(rrule.rrulestr(_fix_until(value, dtstart), dtstart=dtstart))
+        elif name == 'EXRULE':
+            rset.exrule(rrule.rrulestr(_fix_until(value, dtstart), dtstart=dtstart))
+        elif name == 'RDATE':
+            for d in _dates(params, value, dtstart):
+                rset.rdate(d)
+        elif name == 'EXDATE':
+            for d in _dates(params, value, dtstart):
+                rset.exdate(d)
+    # DTSTART is always the first instance, even if the rules don't produce it
+    rset.rdate(dtstart)
+    return rset, dtstart
+
+def _window(value: datetime.date|datetime.datetime|str, floating: bool) -> datetime.datetime:
+    """
+    A window edge in the same form as the instances.  All-day instances have no
+    timezone so they are compared against the wall clock time of the window.
+    """
+    if not floating:
+        return to_datetime(value)
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if not isinstance(value, datetime.datetime):
+        return datetime.datetime.combine(value, datetime.time.min)
+    return value.replace(tzinfo=None)
+
+def _key(edt: EventDateTime|None):
+    """
+    What an instance is matched to its override on, the originalStartTime.
+    """
+    if edt is None:
+        return None
+    if edt.dateTime is not None:
+        return _dtstart(edt).timestamp()
+    return edt.date
+
+def _sort_key(event: Event) -> float:
+    return to_datetime(event.start.values()[0]).timestamp() if event.start else float('-inf')
+
+def _overlaps(event: Event, start: datetime.datetime, end: datetime.datetime) -> bool:
+    if not event.start:
+        return False
+    s = to_datetime(event.start.values()[0])
+    e = to_datetime(event.end.values()[0]) if event.end else s
+    return s < end and (e > start or (s == e and s >= start))
+
+def _instance(master: Event, occurrence: datetime.datetime, length: datetime.timedelta) -> Event:
+    if occurrence.tzinfo is None:
+        day = occurrence.date()
+        start = EventDateTime(date=day)
+        end = EventDateTime(date=day + length)
+        suffix = day.strftime('%Y%m%d')
+    else:
+        tz = master.start.timeZone
+        start = EventDateTime(dateTime=occurrence, timeZone=tz)
+        end = EventDateTime(dateTime=occurrence + length, timeZone=master.end.timeZone if master.end else tz)
+        suffix = occurrence.astimezone(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    return dataclasses.replace(master, id=f"{master.id}_{suffix}", start=start, end=end,
+                               recurrence=None, recurringEventId=master.id,
+                               originalStartTime=EventDateTime(**start.to_base()))
+
+def instances(master: Event, start: datetime.date|datetime.datetime|str,
+              end: datetime.date|datetime.datetime|str,
+              exceptions: Iterable[Event] = ()) -> Iterator[Event]:
+    """
+    Generator of the instances of a recurring event overlapping [start, end), in start
+    order.  exceptions are the changed and cancelled instances GWS sends alongside it,
+    matched on originalStartTime: a changed instance replaces the generated one, and
+    is included if it was moved into the window, and a cancelled one drops it.
+    Instances are shallow copies of master so share its attendees and other lists.
+    """
+    rset, dtstart = rule_set(master)
+    floating = dtstart.tzinfo is None
+    if master.end:
+        length = _dtstart(master.end) - dtstart
+    else:
+        length = datetime.timedelta(0)
+    overrides = {_key(e.originalStartTime): e for e in exceptions}
+    lo, hi = _window(start, floating), _window(end, floating)
+
+    def generated():
+        for occurrence in rset.xafter(lo - length, inc=True):
+            if occurrence >= hi:
+                return
+            if occurrence + length <= lo and not (length == datetime.timedelta(0) and occurrence >= lo):
+                continue
+            key = occurrence.date() if floating else occurrence.timestamp()
+            if key not in overrides:
+                yield _instance(master, occurrence, length)
+
+    ws, we = to_datetime(start), to_datetime(end)
+    moved = sorted((e for e in overrides.values() if e.status != 'cancelled' and _overlaps(e, ws, we)),
+                   key=_sort_key)
+    return heapq.merge(generated(), moved, key=_sort_key)
+
+def expand(events: Iterable[Event], start: datetime.date|datetime.datetime|str,
+           end: datetime.date|datetime.datetime|str) -> Iterator[Event]:
+    """
+    Turn a singleEvents=False listing into the events and instances overlapping
+    [start, end), in start order, much as singleEvents=True would have returned them.
+    Exceptions whose recurring event isn't in events are passed through as is.
+    """
+    masters = {}
+    exceptions = {}
+    singles = []
+    for e in events:
+        if e.recurrence and e.status != 'cancelled':
+            masters[e.id] = e
+        elif e.recurringEventId:
+            exceptions.setdefault(e.recurringEventId, []).append(e)
+        elif e.status != 'cancelled':
+            singles.append(e)
+    for rid, ex in exceptions.items():
+        if rid not in masters:
+            singles.extend(e for e in ex if e.status != 'cancelled')
+    ws, we = to_datetime(start), to_datetime(end)
+    singles = sorted((e for e in singles if _overlaps(e, ws, we)), key=_sort_key)
+    expanded = [instances(m, start, end, exceptions.get(rid, ())) for rid, m in masters.items()]
+    return heapq.merge(singles, *expanded, key=_sort_key)
+
+def list_instances(calendar_id: str|Calendar, timeMin: datetime.date|datetime.datetime|str,
+                   timeMax: datetime.date|datetime.datetime|str, **kwargs) -> Iterator[Event]:
+    """
+    Event::stream with singleEvents=False and the recurring events expanded locally.
+    Any other kwargs go to Event::stream.  orderBy='startTime' needs singleEvents
+    so can't be used, the result is in start order anyway.
+    """
+    kwargs['singleEvents'] = False
+    events = list(Event.stream(calendar_id, timeMin=timeMin, timeMax=timeMax, **kwargs))
+    return expand(events, timeMin, timeMax)
@@ -1,20 +1,123 @@
 from dataclasses import asdict,fields,is_dataclass
 from typing import List
+import re
+
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+_NUMBERS = frozenset((int, bool, float))
+
+def _encode(value):
+    """
+    A field value as the GWS client wants it: resources via their to_base(), lists and
+    dicts rebuilt with their contents encoded, anything else as is.
+    """
+    cls = value.__class__
+    if cls in _SCALARS:
+        return value
+    if isinstance(value, GoogleWorkSpaceResourceBase):
+        return value.to_base()
+    if cls is list or cls is tuple:
+        return [v if v.__class__ in _SCALARS else _encode(v) for v in value]
+    if cls is dict:
+        return {k: v if v.__class__ in _SCALARS else _encode(v) for k,v in value.items()}
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    return value
+
+def _serializer(cls, trim: bool):
+    """
+    Generate a function that turns an instance of the dataclass cls into its request
+    dict in one pass over the fields, so without asdict() deep copying everything
+    only for nested resources to be redone by hand.  Fields named in cls.encoders
+    are put through that rather than the default encoding, provided they are not None.
+    With trim None and empty values are left out as they go, as trim() does.
+    """
+    encoders = {}
+    for c in reversed(cls.__mro__):
+        encoders.update(c.__dict__.get('encoders', {}))
+    env = {'_encode': _encode, '_SCALARS': _SCALARS, '_NUMBERS': _NUMBERS}
+    lines = ["def serialize(self):", "    b = {}"]
+    for f in fields(cls):
+        n = f.name
+        lines.append(f"    v = self.{n}")
+        if n in encoders:
+            env[f"_enc_{n}"] = encoders[n]
+            lines.append(f"    if v is not None:")
+            lines.append(f"        v = _enc_{n}(v)")
+        else:
+            lines.append(f"    if v.__class__ not in _SCALARS:")
+            lines.append(f"        v = _encode(v)")
+        if trim:
+            lines.append(f"    if v is not None and (v.__class__ in _NUMBERS or v):")
+            lines.append(f"        b['{n}'] = v")
+        else:
+            lines.append(f"    b['{n}'] = v")
+    lines.append("    return b")
+    exec('\n'.join(lines), env)
+    return env['serialize']
+
+class LazyField():
+    """
+    Data descriptor for a dataclass field that GWS sends as a string or dict but is
+    held decoded, such as a datetime.  Whatever is assigned is kept as is and only
+    converted by decode the first time it is read, so fields that are never looked
+    at are never parsed.  Used as the field default:
+    updated: datetime.datetime|str|None = LazyField(datetime.datetime, _parse_datetime)
+    """
+    def __init__(self, type_: type, decode, default=None) -> None:
+        self.type = type_
+        self.decode = decode
+        self.default = default
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            # the dataclass picks up the field default from here
+            return self.default
+        d = obj.__dict__
+        value = d.get(self.name, self.default)
+        if value is not None and not isinstance(value, self.type):
+            value = d[self.name] = self.decode(value)
+        return value
+
+    def __set__(self, obj, value) -> None:
+        obj.__dict__[self.name] = value
 
 class GoogleWorkSpaceResourceBase():
     """
     Intended to be subclassed by a dataclass but isnt actually a dataclass.
     Provide a base __post_init__ here to just call fixup or leave it to subclasses?
+    Classes with LazyField fields skip the up front fixup() when lazy_decode is set,
+    either here for all of them or on the class, and decode each field on first use.
     """
+    lazy_decode = False
+
+    # field name to a function encoding its value, for fields that need more than
+    # the default of resources via to_base() and everything else as is
+    encoders = {}
+
+    def _serialize(self, trim: bool) -> dict:
+        cls = self.__class__
+        key = '_trim_serializer' if trim else '_base_serializer'
+        serialize = cls.__dict__.get(key, None)
+        if serialize is None:
+            serialize = _serializer(cls, trim)
+            setattr(cls, key, serialize)
+        return serialize(self)
+
     def to_base(self) -> dict:
         """
         Default just return the dict representation of the object as needed by
-        the GWS client.  Something more complicated can override.
+        the GWS client.  Something more complicated can override, or set encoders
+        for the fields that need it.
         Also with a common base makes it easy to filter with isinstance.
         Call fixup() first to ensure all fields are in correct format.
         """
         self.fixup()
-        return asdict(self)
+        if not is_dataclass(self):
+            return asdict(self)
+        return self._serialize(False)
     
     def trim(self) -> dict|None:
         """
@@ -24,6 +127,10 @@ class GoogleWorkSpaceResourceBase():
         for GWS requests that only want filled-in fields.
         Although doing some probing it turns out the GWS client already trims out fields with None
         """
+        if type(self).to_base is GoogleWorkSpaceResourceBase.to_base and is_dataclass(self):
+            # the generated serializer leaves them out as it goes
+            self.fixup()
+            return self._serialize(True)
         b = self.to_base()
         # now clear out any null (empty) fields as these would translate
         # to nonvalues for optional fields
@@ -39,6 +146,25 @@ class GoogleWorkSpaceResourceBase():
         notify a subclass to do any field adjustments
         """
         pass
+
+    @classmethod
+    def fields_mask(cls, *names: str) -> str:
+        """
+        Build a partial response field mask from attribute names, either as arguments or
+        a single list of them, so only those fields are returned by a request:
+        Event.fields_mask('id', 'start', 'end', 'updated')
+        Sub-fields can be picked out as usual with 'start/dateTime' or 'attendees(email)',
+        only the top level name is checked against the dataclass fields.
+        Anything not in the mask is left at the default when decoded.
+        """
+        if len(names) == 1 and not isinstance(names[0], str):
+            names = tuple(names[0])
+        valid = [f.name for f in fields(cls)] if is_dataclass(cls) else []
+        for n in names:
+            top = re.split(r'[/.(]', str(n), maxsplit=1)[0]
+            if top not in valid:
+                raise ValueError(f"Invalid {cls.__name__} field: {top}")
+        return ','.join(dict.fromkeys(str(n) for n in names))
     
     def update_fields(self, **kwargs) -> List[str]:
         """
@@ -0,0 +1,264 @@
+"""
+Retry policy for GWS requests.
+Quota errors (429 and the rateLimitExceeded/userRateLimitExceeded flavours of 403),
+5xx responses and dropped connections are all transient, so rather than failing
+the whole operation the request is sent again after an exponential backoff with
+full jitter, or whatever the server asked for via Retry-After.  A write that failed
+any other way may still have gone through on the server, so writes are only
+retried when rate limited unless the method is marked idempotent.  A retry budget
+keeps a widespread outage from turning into a retry storm: every request earns
+a fraction of a retry and once the budget is spent requests fail straight away.
+Applied to every request through gws.execute() and the async services, and
+configured via gws.retry_policy or the 'retry' key of gws.config.
+"""
+
+import email.utils
+import json
+import random
+import sys
+import threading
+import time
+
+from .quota import operation_class
+
+RETRY_STATUS = frozenset((408, 429, 500, 502, 503, 504))
+RETRY_REASONS = frozenset(("rateLimitExceeded", "userRateLimitExceeded"))
+
+class RetryBudget():
+    """
+    Token bucket of retries.  Each request deposits ratio tokens and each retry
+    withdraws one, so over time retries are bounded to roughly ratio of the requests
+    sent, with initial tokens to cover the start up and quiet periods.
+    """
+    def __init__(self, ratio: float = 0.2, initial: float = 10.0, capacity: float = 100.0) -> None:
+        self.ratio = float(ratio)
+        self.initial = float(initial)
+        self.capacity = max(float(capacity), self.initial)
+        self._balance = self.initial
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{str(self.__class__)}:{self._balance:.1f}"
+
+    @property
+    def balance(self) -> float:
+        return self._balance
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self.capacity, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Take a retry from the budget, False if there isn't one to take.
+        """
+        with self._lock:
+            if self._balance < 1.0:
+                return False
+            self._balance -= 1.0
+            return True
+
+    @property
+    def config(self) -> dict:
+        return {'ratio': self.ratio, 'initial': self.initial, 'capacity': self.capacity}
+
+def _transient_errors() -> tuple:
+    errors = (ConnectionError, TimeoutError)
+    # only if the requests transport or the async path has already pulled them in,
+    # neither derives its errors from the builtin ones
+    requests = sys.modules.get('requests.exceptions', None)
+    if requests is not None:
+        errors += (requests.ConnectionError, requests.Timeout)
+    httpx = sys.modules.get('httpx', None)
+    if httpx is not None:
+        errors += (httpx.TransportError,)
+    return errors
+
+def _error_reason(content) -> str:
+    """
+    The reason of the first error in a GWS JSON error body, if there is one.
+    """
+    try:
+        data = json.loads(content.decode('utf-8') if isinstance(content, bytes) else content)
+        error = data.get('error', {})
+        errors = error.get('errors', None)
+        if errors:
+            return str(errors[0].get('reason', ''))
+        details = error.get('details', None)
+        if details:
+            return str(details[0].get('reason', ''))
+    except (ValueError, TypeError, AttributeError, IndexError, UnicodeDecodeError):
+        pass
+    return ""
+
+def retry_after(resp) -> float|None:
+    """
+    Seconds from a Retry-After header, either delta seconds or an HTTP date.
+    """
+    value = resp.get('retry-after', None) if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+class RetryPolicy():
+    """
+    How many times and how long to wait before sending a request again.
+    overrides maps a method ID (calendar.events.insert, sheets.spreadsheets.values.batchGet, ...)
+    to a RetryPolicy or a dict of the fields that differ for that method.
+    The budget is shared with the policies made for the overrides.
+    idempotent says whether a request is safe to send again after a 5xx or a dropped
+    connection, None to go by the request: reads are and writes aren't.
+    """
+    def __init__(self, max_retries: int = 5,
+                 initial: float = 1.0,
+                 maximum: float = 64.0,
+                 multiplier: float = 2.0,
+                 max_retry_after: float = 300.0,
+                 budget: RetryBudget|dict|None = None,
+                 overrides: dict|None = None,
+                 idempotent: bool|None = None) -> None:
+        self.max_retries = max(0, int(max_retries))
+        self.initial = float(initial)
+        self.maximum = float(maximum)
+        self.multiplier = float(multiplier)
+        self.max_retry_after = float(max_retry_after)
+        self.idempotent = idempotent if idempotent is None else bool(idempotent)
+        if budget is None or isinstance(budget, RetryBudget):
+            self.budget = budget if budget is not None else RetryBudget()
+        else:
+            self.budget = RetryBudget(**dict(budget))
+        self._overrides = {}
+        for k,v in (overrides or {}).items():
+            self._overrides[str(k)] = v if isinstance(v, RetryPolicy) else self.replace(**dict(v))
+        # for_request() policies by method ID and HTTP method
+        self._requests = {}
+
+    def __repr__(self) -> str:
+        return f"{str(self.__class__)}:{str(self.config)}"
+
+    def replace(self, **kwargs) -> "RetryPolicy":
+        """
+        A copy of this policy with some fields changed, sharing the budget.
+        """
+        args = {'max_retries': self.max_retries, 'initial': self.initial,
+                'maximum': self.maximum, 'multiplier': self.multiplier,
+                'max_retry_after': self.max_retry_after, 'budget': self.budget,
+                'idempotent': self.idempotent}
+        args.update(kwargs)
+        return RetryPolicy(**args)
+
+    def for_method(self, method_id: str|None) -> "RetryPolicy":
+        return self._overrides.get(method_id, self) if method_id else self
+
+    def for_request(self, request) -> "RetryPolicy":
+        """
+        The policy for a request built from a service, that of its method with
+        idempotent filled in from the request if the policy leaves it open.
+        A batch is idempotent if every request in it is.
+        """
+        parts = getattr(request, 'requests', None)
+        if parts is not None:
+            return self.replace(idempotent=all(self.for_request(r).idempotent for r in parts))
+        method_id = getattr(request, 'methodId', None)
+        policy = self.for_method(method_id)
+        if policy.idempotent is not None:
+            return policy
+        key = (method_id, str(getattr(request, 'method', 'GET')).upper())
+        p = self._requests.get(key, None)
+        if p is None:
+            p = policy.replace(idempotent=operation_class(request) == 'read')
+            if method_id:
+                self._requests[key] = p
+        return p
+
+    @property
+    def config(self) -> dict:
+        return {'max_retries': self.max_retries, 'initial': self.initial,
+                'maximum': self.maximum, 'multiplier': self.multiplier,
+                'max_retry_after': self.max_retry_after,
+                'budget': self.budget.config,
+                'idempotent': self.idempotent,
+                'overrides': {k: {'max_retries': v.max_retries, 'initial': v.initial,
+                                  'maximum': v.maximum, 'multiplier': v.multiplier,
+                                  'max_retry_after': v.max_retry_after,
+                                  'idempotent': v.idempotent}
+                              for k,v in self._overrides.items()}}
+
+    @staticmethod
+    def from_config(config: dict|None) -> "RetryPolicy":
+        if isinstance(config, RetryPolicy):
+            return config
+        return RetryPolicy(**dict(config if config else {}))
+
+    def retryable(self, error: Exception, idempotent: bool|None = None) -> bool:
+        """
+        Whether the error is one that is worth sending the request again for.
+        Rate limited requests were turned away so are always worth it, anything else
+        only if the request is idempotent, which defaults to that of the policy or
+        True if that is open.
+        """
+        if idempotent is None:
+            idempotent = self.idempotent is not False
+        resp = getattr(error, 'resp', None)
+        status = getattr(resp, 'status', None)
+        if status is not None:
+            status = int(status)
+            if status == 429:
+                return True
+            if status == 403:
+                return _error_reason(getattr(error, 'content', b'')) in RETRY_REASONS
+            return idempotent and status in RETRY_STATUS
+        return idempotent and isinstance(error, _transient_errors())
+
+    def delay(self, attempt: int, error: Exception|None = None) -> float:
+        """
+        Seconds to wait before retry number attempt (from 0).  Full jitter on the
+        exponential backoff unless the server said how long with Retry-After.
+        """
+        backoff = min(self.maximum, self.initial * (self.multiplier ** attempt))
+        after = retry_after(getattr(error, 'resp', None)) if error is not None else None
+        if after is not None:
+            return min(self.max_retry_after, max(after, backoff * random.random()))
+        return backoff * random.random()
+
+    def _should_retry(self, attempt: int, error: Exception) -> bool:
+        return attempt < self.max_retries and self.retryable(error) and self.budget.withdraw()
+
+    def call(self, f, *args, **kwargs):
+        """
+        Call f, sending it again while it fails with something worth retrying.
+        """
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                return f(*args, **kwargs)
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                time.sleep(self.delay(attempt, e))
+                attempt += 1
+
+    async def acall(self, f, *args, **kwargs):
+        """
+        Async version of call() for a coroutine function.
+        """
+        import asyncio
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                return await f(*args, **kwargs)
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                await asyncio.sleep(self.delay(attempt, e))
+                attempt += 1
@@ -12,23 +12,50 @@ from ..access import gws
 # do this as module level or a parent class instance?
 # simpler at module level and achieves the same thing
 _get_service = partial(gws.get_service, "sheets", "v4")
+_get_async_service = partial(gws.get_async_service, "sheets", "v4")
+
+def _get_args(spreadsheetid: str,
+              ranges : list[GoogleSheetsA1Notation|str],
+              includeGridData: bool,
+              fields: str|None) -> dict:
+    range = [str(r) for r in ranges]
+    args = {'spreadsheetId': spreadsheetid, 'ranges': range, 'includeGridData': includeGridData}
+    if fields:
+        args['fields'] = fields if isinstance(fields, str) else ','.join(fields)
+    return args
 
 def get(spreadsheetid: str,
         ranges : list[GoogleSheetsA1Notation|str] = [],
-        includeGridData: bool = False) -> Spreadsheet:
+        includeGridData: bool = False,
+        fields: str|None = None) -> Spreadsheet:
     """
     Wrapper for calling the get() spreadsheet method.
     See https://developers.google.com/sheets/api/reference/rest/v4/spreadsheets/get
     This is for retrieving spreadsheet properties but can also include data
     if you need it.
+    fields is a partial response mask, such as Spreadsheet.fields_mask('spreadsheetId', 'sheets.properties')
     The decorators will handle requires scopes and building the service.
     """
     ret = Spreadsheet()
     if spreadsheetid:
-        range = [str(r) for r in ranges]
-        response = _get_service().spreadsheets().get(spreadsheetId=spreadsheetid,
-                                                     ranges=range,
-                                                     includeGridData=includeGridData).execute()
+        response = gws.execute(_get_service().spreadsheets().get(**_get_args(spreadsheetid, ranges,
+                                                                             includeGridData, fields)))
+        if response:
+            ret = Spreadsheet(**response)
+    return ret
+
+async def aget(spreadsheetid: str,
+               ranges : list[GoogleSheetsA1Notation|str] = [],
+               includeGridData: bool = False,
+               fields: str|None = None) -> Spreadsheet:
+    """
+    Async version of get()
+    """
+    ret = Spreadsheet()
+    if spreadsheetid:
+        service = await _get_async_service()
+        request = service.spreadsheets().get(**_get_args(spreadsheetid, ranges, includeGridData, fields))
+        response = await service.execute(request)
         if response:
             ret = Spreadsheet(**response)
     return ret
@@ -42,11 +69,19 @@ def create(spreadsheet: Spreadsheet|dict|str) -> Spreadsheet:
     The decorators will handle requires scopes and building the service.
     """
     body = spreadsheet.to_base() if isinstance(spreadsheet,Spreadsheet) else asdict(spreadsheet) if is_dataclass(spreadsheet) else spreadsheet
-    response = _get_service().spreadsheets().create(body=body).execute()
+    response = gws.execute(_get_service().spreadsheets().create(body=body))
     if response:
         return Spreadsheet(**response)
     return Spreadsheet()
 
+def _batchUpdate_body(request: GoogleSheetsUpdateRequest|dict) -> dict:
+    return request.to_base() if isinstance(request, GoogleSheetsUpdateRequest) else asdict(request) if is_dataclass(request) else request
+
+def _batchUpdate_response(response: dict|None) -> GoogleSheetsUpdateRequestResponse:
+    if response:
+        return GoogleSheetsUpdateRequestResponse(**response)
+    return GoogleSheetsUpdateRequestResponse()
+
 def batchUpdate(spreadsheetid: str, request: GoogleSheetsUpdateRequest|dict):
     """
     Wrapper for calling the batchUpdate() spreadsheet method.
@@ -55,14 +90,29 @@ def batchUpdate(spreadsheetid: str, request: GoogleSheetsUpdateRequest|dict):
     which is done from the values() resource.
     The decorators will handle requires scopes and building the service.
     """
-    body = request.to_base() if isinstance(request, GoogleSheetsUpdateRequest) else asdict(request) if is_dataclass(request) else request
-    response = _get_service().spreadsheets().batchUpdate(spreadsheetId=spreadsheetid, body=body).execute()
-    if response:
-        return GoogleSheetsUpdateRequestResponse(**response)
-    return GoogleSheetsUpdateRequestResponse()
+    body = _batchUpdate_body(request)
+    response = gws.execute(_get_service().spreadsheets().batchUpdate(spreadsheetId=spreadsheetid, body=body))
+    return _batchUpdate_response(response)
+
+async def abatchUpdate(spreadsheetid: str, request: GoogleSheetsUpdateRequest|dict):
+    """
+    Async version of batchUpdate()
+    """
+    service = await _get_async_service()
+    body = _batchUpdate_body(request)
+    response = await service.execute(service.spreadsheets().batchUpdate(spreadsheetId=spreadsheetid, body=body))
+    return _batchUpdate_response(response)
     
     # maybe someday getDataByFilter or copyTo
 
+def _clearValues_response(response: ClearValuesRequestResponse, r: dict|None) -> ClearValuesRequestResponse:
+    if r:
+        response.spreadsheetId = r.get('spreadsheetId', "")
+        response.clearedRanges = GoogleSheetsA1Notation.to_a1_list(r.get('clearedRanges', []))
+    else:
+        response.spreadsheetId = ""
+    return response
+
 def clearValues(spreadsheetId: str,
                 ranges: str|list[str|GoogleSheetsA1Notation]) -> ClearValuesRequestResponse:
     """
@@ -76,12 +126,50 @@ def clearValues(spreadsheetId: str,
     range_list = GoogleSheetsA1Notation.to_str_list(ranges)
     if len(range_list) > 0:
         body = {"ranges": range_list}
-        r = values.batchClear(spreadsheetId=spreadsheetId, body=body).execute()
-        if r:
-            response.spreadsheetId = r.get('spreadsheetId', "")
-            response.clearedRanges = GoogleSheetsA1Notation.to_a1_list(r.get('clearedRanges', []))
-        else:
-            response.spreadsheetId = ""
+        r = gws.execute(values.batchClear(spreadsheetId=spreadsheetId, body=body))
+        response = _clearValues_response(response, r)
+    return response
+
+async def aclearValues(spreadsheetId: str,
+                       ranges: str|list[str|GoogleSheetsA1Notation]) -> ClearValuesRequestResponse:
+    """
+    Async version of clearValues()
+    """
+    response = ClearValuesRequestResponse(spreadsheetId)
+    range_list = GoogleSheetsA1Notation.to_str_list(ranges)
+    if len(range_list) > 0:
+        service = await _get_async_service()
+        body = {"ranges": range_list}
+        r = await service.execute(service.spreadsheets().values().batchClear(spreadsheetId=spreadsheetId, body=body))
+        response = _clearValues_response(response, r)
+    return response
+
+def _getValues_args(spreadsheetId: str,
+                    range_list: list[str],
+                    dimension: str,
+                    valueRenderOption: str,
+                    dateTimeRenderOption: str) -> dict:
+    dim = GoogleSheetsEnum.dimension(dimension)
+    if not dim:
+        raise ValueError(f"Invalid majorDimension value: {dimension}")
+    value_render = GoogleSheetsEnum.valueRenderOption(valueRenderOption)
+    if not value_render:
+        raise ValueError(f"Invalid valueRenderOption value: {valueRenderOption}")
+    date_time_render = GoogleSheetsEnum.dateTimeRenderOption(dateTimeRenderOption)
+    if not date_time_render and value_render != "FORMATTED_VALUE":
+        raise ValueError(f"Invalid dateTimeRenderOption value: {dateTimeRenderOption}")
+    return {'spreadsheetId': spreadsheetId,
+            'ranges': range_list,
+            'majorDimension': dim,
+            'valueRenderOption': value_render,
+            'dateTimeRenderOption': date_time_render}
+
+def _getValues_response(response: GetValuesRequestResponse, r: dict|None) -> GetValuesRequestResponse:
+    if r:
+        response.spreadsheetId = r.get('spreadsheetId', "")
+        response.valueRanges = [ValueRange(**vr) for vr in r.get("valueRanges",{})]
+    else:
+        response.spreadsheetId = ""
     return response
 
 def getValues(spreadsheetId: str,
@@ -100,27 +188,60 @@ def getValues(spreadsheetId: str,
     values = _get_service().spreadsheets().values()
     response = GetValuesRequestResponse(spreadsheetId)
     range_list = GoogleSheetsA1Notation.to_str_list(ranges)
-    dim = GoogleSheetsEnum.dimension(dimension)
-    if not dim:
-        raise ValueError(f"Invalid majorDimension value: {dimension}")
+    args = _getValues_args(spreadsheetId, range_list, dimension,
+                           valueRenderOption, dateTimeRenderOption)
+    if len(range_list) > 0:
+        r = gws.execute(values.batchGet(**args))
+        response = _getValues_response(response, r)
+    return response
+
+async def agetValues(spreadsheetId: str,
+                     ranges: str|list[str|GoogleSheetsA1Notation],
+                     dimension: str = "ROWS",
+                     valueRenderOption: str = "FORMATTED",
+                     dateTimeRenderOption: str = "SERIAL") -> GetValuesRequestResponse:
+    """
+    Async version of getValues()
+    """
+    response = GetValuesRequestResponse(spreadsheetId)
+    range_list = GoogleSheetsA1Notation.to_str_list(ranges)
+    args = _getValues_args(spreadsheetId, range_list, dimension,
+                           valueRenderOption, dateTimeRenderOption)
+    if len(range_list) > 0:
+        service = await _get_async_service()
+        r = await service.execute(service.spreadsheets().values().batchGet(**args))
+        response = _getValues_response(response, r)
+    return response
+
+def _updateValues_body(data: ValueRange|list[ValueRange],
+                       valueInputOption: str,
+                       includeValuesInResponse: bool,
+                       valueRenderOption: str,
+                       dateTimeRenderOption: str) -> dict|None:
+    dlist = [d.to_base() for d in data] if isinstance(data, Iterable) else [data.to_base()]
+    value_input = GoogleSheetsEnum.valueInputOption(valueInputOption)
+    if not value_input:
+        raise ValueError(f"Invalid valueInputOption value: {valueInputOption}")
     value_render = GoogleSheetsEnum.valueRenderOption(valueRenderOption)
     if not value_render:
         raise ValueError(f"Invalid valueRenderOption value: {valueRenderOption}")
     date_time_render = GoogleSheetsEnum.dateTimeRenderOption(dateTimeRenderOption)
     if not date_time_render and value_render != "FORMATTED_VALUE":
         raise ValueError(f"Invalid dateTimeRenderOption value: {dateTimeRenderOption}")
+    if len(dlist) > 0:
+        return {
+            "valueInputOption": value_input,
+            "data": dlist,
+            "includeValuesInResponse": includeValuesInResponse,
+            "responseValueRenderOption": value_render,
+            "responseDateTimeRenderOption": date_time_render
+        }
+    return None
 
-    if len(range_list) > 0:
-        r = values.batchGet(spreadsheetId=spreadsheetId,
-                            ranges=range_list,
-                            majorDimension=dim,
-                            valueRenderOption=value_render,
-                            dateTimeRenderOption=date_time_render).execute()
-        if r:
-            response.spreadsheetId = r.get('spreadsheetId', "")
-            response.valueRanges = [ValueRange(**vr) for vr in r.get("valueRanges",{})]
-        else:
-            response.spreadsheetId = ""
+def _updateValues_response(response: UpdateValuesRequestResponse, r: dict|None) -> UpdateValuesRequestResponse:
+    if r:
+        return UpdateValuesRequestResponse(**r)
+    response.spreadsheetId = ""
     return response
 
 def updateValues(spreadsheetId: str,
@@ -137,31 +258,29 @@ def updateValues(spreadsheetId: str,
     with only 1 range is fine.
     The decorators will handle requires scopes and building the service.
     """
-    dlist = [d.to_base() for d in data] if isinstance(data, Iterable) else [data.to_base()]
-    value_input = GoogleSheetsEnum.valueInputOption(valueInputOption)
-    if not value_input:
-        raise ValueError(f"Invalid valueInputOption value: {valueInputOption}")
-    value_render = GoogleSheetsEnum.valueRenderOption(valueRenderOption)
-    if not value_render:
-        raise ValueError(f"Invalid valueRenderOption value: {valueRenderOption}")
-    date_time_render = GoogleSheetsEnum.dateTimeRenderOption(dateTimeRenderOption)
-    if not date_time_render and value_render != "FORMATTED_VALUE":
-        raise ValueError(f"Invalid dateTimeRenderOption value: {dateTimeRenderOption}")
+    body = _updateValues_body(data, valueInputOption, includeValuesInResponse,
+                              valueRenderOption, dateTimeRenderOption)
     values = _get_service().spreadsheets().values()
     response = UpdateValuesRequestResponse(spreadsheetId)
-    if len(dlist) > 0:
-        body = {
-            "valueInputOption": value_input,
-            "data": dlist,
-            "includeValuesInResponse": includeValuesInResponse,
-            "responseValueRenderOption": value_render,
-            "responseDateTimeRenderOption": date_time_render
-        }
-        r = values.batchUpdate(spreadsheetId=spreadsheetId, body=body).execute()
-        if r:
-            response = UpdateValuesRequestResponse(**r)
-        else:
-            response.spreadsheetId = ""
+    if body:
+        r = gws.execute(values.batchUpdate(spreadsheetId=spreadsheetId, body=body))
+        response = _updateValues_response(response, r)
     return response
 
-    
+async def aupdateValues(spreadsheetId: str,
+                        data: ValueRange|list[ValueRange],
+                        valueInputOption: str = "USER",
+                        includeValuesInResponse: bool = False,
+                        valueRenderOption: str = "FORMATTED",
+                        dateTimeRenderOption: str = "SERIAL") -> UpdateValuesRequestResponse:
+    """
+    Async version of updateValues()
+    """
+    body = _updateValues_body(data, valueInputOption, includeValuesInResponse,
+                              valueRenderOption, dateTimeRenderOption)
+    response = UpdateValuesRequestResponse(spreadsheetId)
+    if body:
+        service = await _get_async_service()
+        r = await service.execute(service.spreadsheets().values().batchUpdate(spreadsheetId=spreadsheetId, body=body))
+        response = _updateValues_response(response, r)
+    return response
@@ -123,12 +123,6 @@ class GoogleSheetsUpdateRequestResponse(GoogleWorkSpaceResourceBase):
     def fixup(self) -> None:
         self.updatedSpreadsheet = self.updatedSpreadsheet if isinstance(self.updatedSpreadsheet,Spreadsheet) else Spreadsheet(**dict(self.updatedSpreadsheet))
 
-    def to_base(self) -> dict:
-        self.fixup()
-        b = asdict(self)
-        b['updatedSpreadsheet'] = self.updatedSpreadsheet.to_base()
-        return b
-
 class GoogleSheetsValueRequestBase(GoogleWorkSpaceResourceBase):
     """Common base class for sheets values requests so we can filter them"""
     pass
@@ -203,11 +197,6 @@ class UpdateValuesRequestResponse(GoogleSheetsValueRequestResponseBase):
     def fixup(self) -> None:
         self.responses = [r if isinstance(r,UpdateValuesResponse) else UpdateValuesResponse(**dict(r)) for r in self.responses]
 
-    def to_base(self) -> dict:
-        self.fixup()
-        b = asdict(self)
-        b['responses'] = [r.to_base() for r in self.responses]
-        return b
     
 
 
@@ -9,7 +9,7 @@ So for dataclasses with dataclasses as fields we need to do a distinct
 __init__ which is a bit annoying.
 Not all resources/requests/responses are implemented.
 """
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import List,ClassVar
 
 from ..resources import GoogleWorkSpaceResourceBase
@@ -153,12 +153,6 @@ class SheetProperties(GoogleWorkSpaceResourceBase):
     def fixup(self) -> None:
         self.gridProperties = self.gridProperties if isinstance(self.gridProperties,GridProperties) else GridProperties(**dict(self.gridProperties))
 
-    def to_base(self) -> dict:
-        self.fixup()
-        b = asdict(self)
-        b['gridProperties'] = self.gridProperties.to_base()
-        return b
-
     def __bool__(self) -> bool:
         """
         True if it is valid, which is the ID and index are 0 or positive
@@ -272,11 +266,6 @@ class UpdateValuesResponse(GoogleWorkSpaceResourceBase):
     def __bool__(self) -> bool:
         return bool(self.spreadsheetId) and bool(self.updatedRange)
 
-    def to_base(self) -> dict:
-        self.fixup()
-        b = asdict(self)
-        b['updatedData'] = self.updatedData.to_base()
-        return b
 
 @dataclass
 class Sheet(GoogleWorkSpaceResourceBase):
@@ -306,14 +295,6 @@ class Sheet(GoogleWorkSpaceResourceBase):
         self.data = [gd if isinstance(gd,GridData) else GridData(**dict(gd)) for gd in self.data]
         self.merges = [gr if isinstance(gr,GridRange) else GridRange(**dict(gr)) for gr in self.merges]
 
-    def to_base(self) -> dict:
-        self.fixup()
-        b = asdict(self)
-        b['properties'] = self.properties.to_base()
-        b['data'] = [d.to_base() for d in self.data]
-        b['merges'] = [m.to_base() for m in self.merges]
-        return b
-
     def __bool__(self) -> bool:
         return bool(self.properties)
     
@@ -359,18 +340,10 @@ class Spreadsheet(GoogleWorkSpaceResourceBase):
         self.fixup()
 
     def fixup(self) -> None:
-        self.properties = self.properties if isinstance(self.properties,SheetProperties) else SpreadsheetProperties(**dict(self.properties))
+        self.properties = self.properties if isinstance(self.properties,SpreadsheetProperties) else SpreadsheetProperties(**dict(self.properties))
         self.sheets = [s if isinstance(s,Sheet) else Sheet(**dict(s)) for s in self.sheets]
         self.namedRanges = [nr if isinstance(nr,NamedRange) else NamedRange(**dict(nr)) for nr in self.namedRanges]
 
-    def to_base(self) -> dict:
-        self.fixup()
-        b = asdict(self)
-        b['properties'] = self.properties.to_base()
-        b['sheets'] = [s.to_base() for s in self.sheets]
-        b['namedRanges'] = [nr.to_base() for nr in self.namedRanges]
-        return b
-
 
     def __bool__(self) -> bool:
         return bool(self.spreadsheetId)
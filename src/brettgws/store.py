@@ -0,0 +1,196 @@
+"""
+Local SQLite store of calendar events kept up to date by incremental sync.
+Repeated lookups and time window queries are answered from the store, and a single
+Event::sync call per calendar brings it up to date with only what changed.  Events
+are held as their to_base() JSON alongside the id, iCalUID, start, end and updated
+columns they are looked up by, and each calendar's sync token and time zone are
+kept with them.  All-day events are placed by the calendar's time zone, as are
+dates passed in as query windows.
+
+    store = CalendarStore("events.db")
+    store.sync('primary')
+    todays = store.between('primary', start, end)
+"""
+
+from pathlib import Path
+from typing import List
+from zoneinfo import ZoneInfo
+import datetime
+import json
+import sqlite3
+import threading
+
+from .calendar import Calendar, Event, EventDateTime, EventSyncResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calendars (
+    calendar_id TEXT PRIMARY KEY,
+    sync_token TEXT,
+    synced TEXT,
+    time_zone TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    calendar_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    ical_uid TEXT,
+    start TEXT,
+    end TEXT,
+    updated TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, id)
+);
+CREATE INDEX IF NOT EXISTS events_ical_uid ON events (calendar_id, ical_uid);
+CREATE INDEX IF NOT EXISTS events_start ON events (calendar_id, start);
+CREATE INDEX IF NOT EXISTS events_end ON events (calendar_id, end);
+CREATE INDEX IF NOT EXISTS events_updated ON events (calendar_id, updated);
+"""
+
+def _calendar_id(calendar_id: str|Calendar) -> str:
+    return calendar_id.id if isinstance(calendar_id, Calendar) else str(calendar_id)
+
+def _utc(value: datetime.date|datetime.datetime|str|None,
+         tz: datetime.tzinfo|None = None) -> str|None:
+    """
+    Sortable UTC text for a date or datetime.  All-day dates are taken as midnight
+    in tz, UTC if not given, and naive datetimes as UTC.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time.min, tzinfo=tz)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _edge(edt: EventDateTime|None, tz: datetime.tzinfo) -> str|None:
+    """
+    An event's start or end, an all-day date in its own timeZone if it has one or tz.
+    """
+    if edt is None:
+        return None
+    value, zone = edt.values()
+    return _utc(value, zone if zone is not None else tz)
+
+class CalendarStore():
+    """
+    SQLite backed store of Events per calendar.  path defaults to an in-memory database.
+    Safe to share between threads.
+    """
+    def __init__(self, path: Path|str = ":memory:") -> None:
+        self.path = path
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+            # stores from before time zones were kept
+            columns = [r[1] for r in self._db.execute("PRAGMA table_info(calendars)")]
+            if 'time_zone' not in columns:
+                self._db.execute("ALTER TABLE calendars ADD COLUMN time_zone TEXT")
+
+    def __repr__(self) -> str:
+        return f"{str(self.__class__)}:{str(self.path)}"
+
+    def __enter__(self) -> "CalendarStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def sync_token(self, calendar_id: str|Calendar = "primary") -> str|None:
+        with self._lock:
+            row = self._db.execute("SELECT sync_token FROM calendars WHERE calendar_id = ?",
+                                   (_calendar_id(calendar_id),)).fetchone()
+        return row[0] if row else None
+
+    def time_zone(self, calendar_id: str|Calendar = "primary") -> ZoneInfo:
+        """
+        The calendar's time zone as of the last sync, UTC if not known.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT time_zone FROM calendars WHERE calendar_id = ?",
+                                   (_calendar_id(calendar_id),)).fetchone()
+        return ZoneInfo(row[0]) if row and row[0] else ZoneInfo('UTC')
+
+    def sync(self, calendar_id: str|Calendar = "primary", **kwargs) -> EventSyncResult:
+        """
+        Bring the calendar up to date.  The first call lists everything with the
+        Event::list kwargs, later calls only fetch what changed since.
+        """
+        cid = _calendar_id(calendar_id)
+        result = Event.sync(cid, self.sync_token(cid), **kwargs)
+        self.apply(cid, result)
+        return result
+
+    def apply(self, calendar_id: str|Calendar, result: EventSyncResult) -> None:
+        """
+        Store the outcome of an Event::sync, replacing everything for the calendar on a full sync.
+        """
+        cid = _calendar_id(calendar_id)
+        tz = ZoneInfo(result.time_zone) if result.time_zone else self.time_zone(cid)
+        rows = []
+        for e in result.events:
+            rows.append((cid, e.id, e.iCalUID, _edge(e.start, tz), _edge(e.end, tz),
+                         _utc(e.updated), json.dumps(e.to_base(), separators=(',', ':'))))
+        with self._lock, self._db:
+            if result.full:
+                self._db.execute("DELETE FROM events WHERE calendar_id = ?", (cid,))
+            self._db.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._db.executemany("DELETE FROM events WHERE calendar_id = ? AND id = ?",
+                                 [(cid, e.id) for e in result.cancelled])
+            self._db.execute("INSERT OR REPLACE INTO calendars (calendar_id, sync_token, synced, time_zone) "
+                             "VALUES (?, ?, ?, ?)",
+                             (cid, result.sync_token, _utc(datetime.datetime.now(datetime.timezone.utc)), str(tz)))
+
+    def _query(self, where: str, params: tuple, order: str = "start") -> List[Event]:
+        with self._lock:
+            rows = self._db.execute(f"SELECT data FROM events WHERE {where} ORDER BY {order}", params).fetchall()
+        return [Event(**json.loads(r[0])) for r in rows]
+
+    def get(self, calendar_id: str|Calendar, event_id: str) -> Event|None:
+        events = self._query("calendar_id = ? AND id = ?", (_calendar_id(calendar_id), str(event_id)))
+        return events[0] if events else None
+
+    def events(self, calendar_id: str|Calendar = "primary") -> List[Event]:
+        return self._query("calendar_id = ?", (_calendar_id(calendar_id),))
+
+    def by_ical_uid(self, calendar_id: str|Calendar, ical_uid: str) -> List[Event]:
+        """
+        Events sharing an iCalUID, such as the instances of a recurring event.
+        """
+        return self._query("calendar_id = ? AND ical_uid = ?", (_calendar_id(calendar_id), str(ical_uid)))
+
+    def between(self, calendar_id: str|Calendar,
+                start: datetime.date|datetime.datetime|str,
+                end: datetime.date|datetime.datetime|str) -> List[Event]:
+        """
+        Events overlapping the [start, end) window, in start order.
+        Dates are taken as midnight in the calendar's time zone.
+        """
+        cid = _calendar_id(calendar_id)
+        tz = self.time_zone(cid)
+        return self._query("calendar_id = ? AND start < ? AND end > ?", (cid, _utc(end, tz), _utc(start, tz)))
+
+    def updated_since(self, calendar_id: str|Calendar,
+                      when: datetime.date|datetime.datetime|str) -> List[Event]:
+        cid = _calendar_id(calendar_id)
+        return self._query("calendar_id = ? AND updated > ?", (cid, _utc(when, self.time_zone(cid))),
+                           order="updated")
+
+    def clear(self, calendar_id: str|Calendar|None = None) -> None:
+        """
+        Drop the events and sync token for a calendar, or everything.
+        """
+        with self._lock, self._db:
+            if calendar_id is None:
+                self._db.execute("DELETE FROM events")
+                self._db.execute("DELETE FROM calendars")
+            else:
+                cid = _calendar_id(calendar_id)
+                self._db.execute("DELETE FROM events WHERE calendar_id = ?", (cid,))
+                self._db.execute("DELETE FROM calendars WHERE calendar_id = ?", (cid,))
@@ -0,0 +1,191 @@
+"""
+HTTP transports for the GWS services.
+googleapiclient drives everything through an httplib2.Http (or something that acts
+like it) which is handed to build().  By default that is a fresh httplib2.Http per
+service, so every thread pays for its own connection and TLS handshake.  The transports
+here are the pluggable layer that decides what http object a service is built with,
+selected via gws.transport or the 'transport' key of gws.config.
+"""
+
+import abc
+import threading
+
+class HttpTransport(abc.ABC):
+    """
+    Base class for a transport.  Subclasses provide the http object a service is
+    built with for a set of credentials, and whatever usage stats they can gather.
+    """
+    name = ""
+
+    def __init__(self, timeout: float|None = None) -> None:
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._requests = 0
+
+    def __repr__(self) -> str:
+        return f"{str(self.__class__)}:{str(self.stats)}"
+
+    @abc.abstractmethod
+    def http(self, creds):
+        """
+        Return an authorized httplib2.Http compatible object for a service.
+        """
+
+    def _count(self) -> None:
+        with self._lock:
+            self._requests += 1
+
+    @property
+    def stats(self) -> dict:
+        """
+        Usage statistics for the transport.
+        """
+        return {'requests': self._requests}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._requests = 0
+
+    def close(self) -> None:
+        pass
+
+    @property
+    def config(self) -> dict:
+        return {'type': self.name, 'timeout': self.timeout}
+
+    @staticmethod
+    def from_config(config: str|dict|None) -> "HttpTransport":
+        """
+        Build a transport from a type name or a dict with a 'type' key and
+        the transport's keyword arguments.
+        """
+        if isinstance(config, HttpTransport):
+            return config
+        if config is None:
+            return Httplib2Transport()
+        kwargs = {'type': config} if isinstance(config, str) else dict(config)
+        name = str(kwargs.pop('type', Httplib2Transport.name))
+        for cls in (Httplib2Transport, RequestsTransport):
+            if cls.name == name:
+                return cls(**kwargs)
+        raise ValueError(f"Invalid transport type: {name}")
+
+class _CountingHttp():
+    """
+    Thin pass through so the default transport can at least count requests.
+    """
+    def __init__(self, transport: HttpTransport, http) -> None:
+        self._transport = transport
+        self._http = http
+
+    def __getattr__(self, name: str):
+        return getattr(self._http, name)
+
+    def request(self, *args, **kwargs):
+        self._transport._count()
+        return self._http.request(*args, **kwargs)
+
+class Httplib2Transport(HttpTransport):
+    """
+    What build() does on its own, an AuthorizedHttp around a new httplib2.Http per service.
+    Connections are kept alive per service but never shared between them.
+    """
+    name = "httplib2"
+
+    def http(self, creds):
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.http import build_http
+        h = build_http()
+        if self.timeout is not None:
+            h.timeout = self.timeout
+        return _CountingHttp(self, AuthorizedHttp(creds, http=h))
+
+class _RequestsHttp():
+    """
+    httplib2.Http lookalike that googleapiclient can drive but backed by the
+    RequestsTransport session so connections are pooled across services and threads.
+    """
+    def __init__(self, transport: "RequestsTransport", creds) -> None:
+        from google.auth.transport.requests import Request
+        self._transport = transport
+        self._creds = creds
+        self._auth_request = Request(transport.session)
+        # googleapiclient pokes at these on an httplib2.Http
+        self.timeout = transport.timeout
+        self.redirect_codes = set()
+
+    def request(self, uri: str, method: str = "GET", body=None, headers: dict|None = None,
+                redirections: int = 5, connection_type=None):
+        import httplib2
+        h = dict(headers) if headers else {}
+        self._creds.before_request(self._auth_request, method, uri, h)
+        r = self._transport._send(method, uri, body, h, redirections > 0)
+        if r.status_code == 401:
+            # token went stale in flight, refresh and try once more
+            self._creds.refresh(self._auth_request)
+            self._creds.apply(h)
+            r = self._transport._send(method, uri, body, h, redirections > 0)
+        info = {k.lower(): v for k, v in r.headers.items()}
+        # requests has already decoded the body
+        info.pop('content-encoding', None)
+        info['status'] = str(r.status_code)
+        info['reason'] = r.reason
+        return httplib2.Response(info), r.content
+
+    def close(self) -> None:
+        # the session is shared, it is closed with the transport
+        pass
+
+class RequestsTransport(HttpTransport):
+    """
+    Keep-alive connection pooled transport on a single requests.Session shared by every
+    service and thread.  pool_size is the number of connections kept per host.
+    """
+    name = "requests"
+
+    def __init__(self, pool_size: int = 10, timeout: float|None = 60,
+                 pool_block: bool = False) -> None:
+        import requests
+        import requests.adapters
+        super().__init__(timeout)
+        self.pool_size = int(pool_size)
+        self.pool_block = bool(pool_block)
+        self.session = requests.Session()
+        self._adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size,
+                                                      pool_maxsize=self.pool_size,
+                                                      pool_block=self.pool_block)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+    def http(self, creds) -> _RequestsHttp:
+        return _RequestsHttp(self, creds)
+
+    def _send(self, method: str, uri: str, body, headers: dict, allow_redirects: bool):
+        self._count()
+        return self.session.request(method, uri, data=body, headers=headers,
+                                    timeout=self.timeout, allow_redirects=allow_redirects)
+
+    @property
+    def stats(self) -> dict:
+        """
+        Requests sent, connections opened and how many requests went over an existing one.
+        Only counts hosts still held in the pool manager.
+        """
+        pools = self._adapter.poolmanager.pools
+        connections = 0
+        for key in pools.keys():
+            # may have been evicted since
+            p = pools.get(key)
+            if p is not None:
+                connections += p.num_connections
+        requests = self._requests
+        return {'requests': requests, 'connections': connections,
+                'reused': max(0, requests - connections)}
+
+    def close(self) -> None:
+        self.session.close()
+
+    @property
+    def config(self) -> dict:
+        return {'type': self.name, 'timeout': self.timeout,
+                'pool_size': self.pool_size, 'pool_block': self.pool_block}
@@ -0,0 +1,149 @@
+"""
+Shared fixtures.  server stands in for the Google APIs: gws is connected with dummy
+credentials and services are built from the bundled discovery documents on a
+transport that hands every request to server.handler rather than the network.
+"""
+
+from dataclasses import dataclass, field
+from email.parser import FeedParser, Parser
+import datetime
+import json
+import threading
+import urllib.parse
+
+import pytest
+
+from brettgws.access import gws
+from brettgws.transport import HttpTransport
+
+@dataclass
+class Call():
+    """
+    A request as the server saw it, sub-requests of a batch included.
+    """
+    method: str = field(default="GET")
+    path: str = field(default="")
+    params: dict = field(default_factory=dict)
+    body: dict|None = field(default=None)
+    headers: dict = field(default_factory=dict)
+    thread: str = field(default="")
+
+def _response(status: int, payload) -> tuple:
+    import httplib2
+    content = payload if isinstance(payload, bytes) else json.dumps(payload if payload is not None else {}).encode('utf-8')
+    return httplib2.Response({'status': str(status), 'content-type': 'application/json'}), content
+
+def error(status: int, reason: str = "") -> tuple:
+    """
+    A handler result for a GWS style error response.
+    """
+    return status, {'error': {'code': status, 'message': reason or str(status),
+                              'errors': [{'reason': reason, 'message': reason}] if reason else []}}
+
+class _MockHttp():
+    """
+    httplib2.Http lookalike passing everything to the server.
+    """
+    def __init__(self, server: "MockServer") -> None:
+        self._server = server
+        self.timeout = None
+        self.redirect_codes = set()
+
+    def request(self, uri: str, method: str = "GET", body=None, headers: dict|None = None,
+                redirections: int = 5, connection_type=None):
+        return self._server.request(method, uri, body, dict(headers) if headers else {})
+
+    def close(self) -> None:
+        pass
+
+class MockServer(HttpTransport):
+    """
+    handler(call) returns a response body, (status, body), or raises to fail the request.
+    The default answers everything with an empty 200.  Batches are answered in
+    reverse with reverse_batches, and fail as a whole with each of batch_failures.
+    """
+    name = "mock"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.handler = lambda call: {}
+        self.calls = []
+        self.batches = 0
+        self.builds = 0
+        self.build_threads = []
+        self.reverse_batches = False
+        self.batch_failures = []
+
+    def http(self, creds) -> _MockHttp:
+        with self._lock:
+            self.builds += 1
+            self.build_threads.append(threading.current_thread().name)
+        return _MockHttp(self)
+
+    def paths(self, method: str|None = None) -> list:
+        return [c.path for c in self.calls if method is None or c.method == method]
+
+    def _handle(self, method: str, uri: str, body, headers: dict) -> tuple:
+        parsed = urllib.parse.urlparse(uri)
+        if isinstance(body, bytes):
+            body = body.decode('utf-8')
+        call = Call(method, parsed.path, dict(urllib.parse.parse_qsl(parsed.query)),
+                    json.loads(body) if body else None, headers, threading.current_thread().name)
+        with self._lock:
+            self.calls.append(call)
+        result = self.handler(call)
+        return result if isinstance(result, tuple) else (200, result)
+
+    def request(self, method: str, uri: str, body, headers: dict):
+        self._count()
+        if '/batch/' in urllib.parse.urlparse(uri).path:
+            return self._batch(body, headers)
+        return _response(*self._handle(method, uri, body, headers))
+
+    def _batch(self, body: str, headers: dict):
+        import httplib2
+        with self._lock:
+            self.batches += 1
+            if self.batch_failures:
+                return _response(*error(self.batch_failures.pop(0)))
+        parser = FeedParser()
+        parser.feed(f"content-type: {headers['content-type']}\r\n\r\n{body}")
+        parts = []
+        for part in parser.close().get_payload():
+            request_line, rest = part.get_payload().split('\n', 1)
+            method, path, _ = request_line.split(' ', 2)
+            sub = Parser().parsestr(rest)
+            try:
+                status, payload = self._handle(method, f"https://www.googleapis.com{path}",
+                                               sub.get_payload() or None, dict(sub.items()))
+            except Exception as e:
+                status, payload = error(503, str(e))
+            content_id = part['Content-ID'].replace('<', '<response-', 1)
+            parts.append(f"--BOUNDARY\r\nContent-Type: application/http\r\nContent-ID: {content_id}\r\n\r\n"
+                         f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n\r\n"
+                         f"{json.dumps(payload if payload is not None else {})}\r\n")
+        if self.reverse_batches:
+            parts.reverse()
+        content = ''.join(parts) + "--BOUNDARY--\r\n"
+        return (httplib2.Response({'status': '200', 'content-type': 'multipart/mixed; boundary=BOUNDARY'}),
+                content.encode('utf-8'))
+
+def _credentials():
+    from google.oauth2.credentials import Credentials
+    expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(hours=1)
+    return Credentials('token', expiry=expiry)
+
+@pytest.fixture
+def server():
+    """
+    gws connected to a MockServer, with no quota pacing and quick retries.
+    """
+    pytest.importorskip("googleapiclient")
+    gws.reset()
+    s = MockServer()
+    gws.transport = s
+    gws.quota = {'enabled': False}
+    gws.retry_policy = {'initial': 0.001, 'maximum': 0.01}
+    gws._GWSAccess__creds = _credentials()
+    yield s
+    gws.reset()
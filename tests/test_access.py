@@ -0,0 +1,166 @@
+import datetime
+import gc
+import threading
+import time
+import weakref
+
+import pytest
+
+from brettgws.access import gws
+
+def service_account():
+    from google.oauth2 import service_account
+    creds = service_account.Credentials(object(), 'robot@example.iam.gserviceaccount.com',
+                                        'https://oauth2.googleapis.com/token')
+    creds.token = 'token'
+    creds.expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(hours=1)
+    return creds
+
+def test_impersonate(server):
+    gws._GWSAccess__creds = service_account()
+    own = gws.get_service("calendar", "v3")
+    with gws.impersonate('a@example.com'):
+        assert(gws.current_subject == 'a@example.com')
+        a = gws.get_service("calendar", "v3")
+        assert(a is not own and gws.get_service("calendar", "v3") is a)
+        assert(a._http is not own._http)
+        with gws.impersonate(None):
+            assert(gws.get_service("calendar", "v3") is own)
+    assert(gws.current_subject is None and gws.get_service("calendar", "v3") is own)
+    assert(server.builds == 2)
+    # the default subject is the connected user
+    gws._GWSAccess__subject = 'a@example.com'
+    with gws.impersonate('a@example.com'):
+        assert(gws.current_subject is None and gws.get_service("calendar", "v3") is own)
+
+def test_impersonate_requires_service_account(server):
+    with gws.impersonate('a@example.com'):
+        with pytest.raises(ValueError):
+            gws.get_service("calendar", "v3")
+
+def test_subject_eviction(server):
+    gws._GWSAccess__creds = service_account()
+    gws.subject_pool_size = 2
+    refs = {}
+    for subject in ('a@example.com', 'b@example.com', 'c@example.com'):
+        with gws.impersonate(subject):
+            refs[subject] = weakref.ref(gws.get_service("calendar", "v3"))
+    gc.collect()
+    # a was the least recently used and this thread is still alive
+    assert(refs['a@example.com']() is None)
+    assert(refs['b@example.com']() is not None and refs['c@example.com']() is not None)
+    # shrinking drops b as well, including the service parked by a thread that has exited
+    def use():
+        with gws.impersonate('b@example.com'):
+            refs['b thread'] = weakref.ref(gws.get_service("calendar", "v3"))
+    t = threading.Thread(target=use)
+    t.start()
+    t.join()
+    with gws.impersonate('c@example.com'):
+        gws.get_service("calendar", "v3")
+    gws.subject_pool_size = 1
+    gc.collect()
+    assert(refs['b@example.com']() is None and refs['b thread']() is None)
+    assert(refs['c@example.com']() is not None)
+    with gws.impersonate('a@example.com'):
+        gws.get_service("calendar", "v3")
+    assert(server.builds == 5)
+
+def test_service_per_thread(server):
+    barrier = threading.Barrier(4)
+    seen = []
+    def work():
+        s = gws.get_service("calendar", "v3")
+        barrier.wait()
+        seen.append((s, gws.get_service("calendar", "v3")))
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # one build per thread, each kept for the life of the thread
+    assert(server.builds == 4 and all(a is b for a, b in seen))
+    assert(len({id(a) for a, _ in seen}) == 4)
+    del seen
+    # later threads are handed the services the exited ones parked
+    reused = []
+    t = threading.Thread(target=lambda: reused.append(gws.get_service("calendar", "v3")))
+    t.start()
+    t.join()
+    assert(server.builds == 4)
+    gws.get_service("sheets", "v4")
+    assert(server.builds == 5)
+
+def expiring(seconds, refreshes):
+    from google.oauth2.credentials import Credentials
+
+    class Expiring(Credentials):
+        def refresh(self, request):
+            refreshes.append(threading.current_thread().name)
+            self.token = f"token{len(refreshes)}"
+            self.expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(hours=1)
+
+    expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(seconds=seconds)
+    return Expiring('token0', refresh_token='r', client_id='c', client_secret='s', expiry=expiry)
+
+def test_renew(server, tmp_path):
+    refreshes = []
+    gws._GWSAccess__creds = None
+    gws.cred_cache = tmp_path / "tokens.json"
+    gws._GWSAccess__creds = expiring(600, refreshes)
+    service = gws.get_service("calendar", "v3")
+    # not yet within the margin
+    assert(gws.renew(60) and not refreshes and 530 < gws.renew_due(60) <= 540)
+    # refreshed ahead of expiry, in place so the built services carry on
+    assert(gws.renew(900) and len(refreshes) == 1 and gws.creds.token == 'token1')
+    assert(gws.get_service("calendar", "v3") is service and gws.last_refresh is not None)
+    assert(gws.renew_due(900) > 2500)
+    # shared through the cache so another process can adopt it rather than refresh
+    gws._GWSAccess__creds = expiring(600, refreshes)
+    assert(gws.renew(900) and len(refreshes) == 1 and gws.creds.token == 'token1')
+
+def test_refresher(server, tmp_path):
+    refreshes = []
+    gws._GWSAccess__creds = None
+    gws.cred_cache = tmp_path / "tokens.json"
+    gws._GWSAccess__creds = expiring(600, refreshes)
+    gws.start_refresher(900)
+    try:
+        for _ in range(200):
+            if refreshes:
+                break
+            time.sleep(0.01)
+        assert(gws.auto_refresh and refreshes == ['gws-refresher'])
+        assert(gws.creds.valid and gws.creds.token == 'token1')
+    finally:
+        gws.stop_refresher()
+    assert(not gws.auto_refresh)
+
+def test_refresher_failure(server, tmp_path, monkeypatch, caplog, capsys):
+    from brettgws.access import _Refresher
+    monkeypatch.setattr(_Refresher, 'RETRY_INTERVAL', 0.01)
+    refreshes = []
+    gws._GWSAccess__creds = None
+    gws.cred_cache = tmp_path / "tokens.json"
+    creds = expiring(600, refreshes)
+    renew = type(creds).refresh
+    def refresh(request):
+        if not refreshes:
+            refreshes.append('failed')
+            raise OSError("offline")
+        renew(creds, request)
+    creds.refresh = refresh
+    gws._GWSAccess__creds = creds
+    gws.start_refresher(900)
+    try:
+        for _ in range(200):
+            if len(refreshes) > 1:
+                break
+            time.sleep(0.01)
+    finally:
+        gws.stop_refresher()
+    # logged rather than printed, and tried again
+    assert(refreshes == ['failed', 'gws-refresher'] and gws.creds.token == 'token2')
+    failures = [r for r in caplog.records if r.name == 'brettgws.access']
+    assert(failures and failures[0].levelname == 'WARNING' and 'offline' in failures[0].exc_text)
+    assert(capsys.readouterr().out == "")
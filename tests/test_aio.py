@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from brettgws.access import gws
+from brettgws.aio import AsyncService, AsyncTransport
+from brettgws.calendar import Event
+
+class MockAsyncTransport(AsyncTransport):
+    """
+    Answers every request with handler(httpx.Request) rather than the network.
+    """
+    def __init__(self, handler) -> None:
+        super().__init__()
+        self.handler = handler
+        self.requests = []
+
+    def client(self):
+        loop = asyncio.get_running_loop()
+        c = self._clients.get(loop, None)
+        if c is None:
+            async def handle(request):
+                self.requests.append(request)
+                result = self.handler(request)
+                status, body = await result if asyncio.iscoroutine(result) else result
+                return httpx.Response(status, json=body)
+            c = self._clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+        return c
+
+def test_async_service(server):
+    failures = [503]
+    def handler(request):
+        if failures:
+            return failures.pop(0), {'error': {'code': 503, 'message': 'unavailable'}}
+        page = request.url.params.get('pageToken', None)
+        if page is None:
+            return 200, {'items': [{'id': 'a'}, {'id': 'b'}], 'nextPageToken': 'p2'}
+        return 200, {'items': [{'id': 'c'}]}
+    transport = gws.async_transport = MockAsyncTransport(handler)
+
+    async def run():
+        s = await gws.get_async_service("calendar", "v3")
+        assert(isinstance(s, AsyncService) and await gws.get_async_service("calendar", "v3") is s)
+        events = await Event.alist('primary', prefetch=True)
+        gws.developer_key = 'key'
+        return s, events, await gws.get_async_service("calendar", "v3")
+
+    s, events, rebuilt = asyncio.run(run())
+    assert([e.id for e in events] == ['a', 'b', 'c'])
+    # the 503 was retried, and nothing went over the sync transport
+    assert(len(transport.requests) == 3 and not server.calls)
+    assert(transport.requests[0].headers['authorization'] == 'Bearer token')
+    assert(transport.requests[2].url.params['pageToken'] == 'p2')
+    # built off the event loop, and again once the services were dropped
+    assert(rebuilt is not s and server.builds == 2)
+    assert(threading.main_thread().name not in server.build_threads)
+
+def test_alist_many_cancels(server):
+    from googleapiclient.errors import HttpError
+    finished = []
+    async def handler(request):
+        cid = request.url.path.split('/')[-2]
+        if cid == 'missing':
+            return 404, {'error': {'code': 404, 'message': 'notFound'}}
+        await asyncio.sleep(0.05)
+        finished.append(cid)
+        return 200, {'items': [{'id': f"{cid}-e"}]}
+    gws.async_transport = MockAsyncTransport(handler)
+
+    async def run():
+        with pytest.raises(HttpError):
+            await Event.alist_many(['c0', 'missing', 'c1'])
+        # the other listings were stopped rather than left running
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        await asyncio.sleep(0.1)
+        results = await Event.alist_many(['c0', 'missing'], return_exceptions=True)
+        return pending, results
+
+    pending, results = asyncio.run(run())
+    assert(pending == [] and finished == ['c0'])
+    assert([e.id for e in results['c0']] == ['c0-e'] and isinstance(results['missing'], HttpError))
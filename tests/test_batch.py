@@ -0,0 +1,85 @@
+from brettgws.access import gws
+from brettgws.batch import Batch
+from brettgws.quota import QuotaLimiter
+
+from conftest import error
+
+def deletes(count):
+    service = gws.get_service("calendar", "v3")
+    batch = Batch("calendar", "v3")
+    for i in range(count):
+        batch.add(service.events().delete(calendarId='primary', eventId=f"e{i}"))
+    return batch
+
+def event_id(call):
+    return call.path.rsplit('/', 1)[-1]
+
+def test_chunks_and_order(server):
+    server.reverse_batches = True
+    service = gws.get_service("calendar", "v3")
+    batch = Batch("calendar", "v3")
+    for i in range(120):
+        batch.add(service.events().get(calendarId='primary', eventId=f"e{i}"), lambda r: r['id'])
+    server.handler = lambda call: {'id': event_id(call)}
+    results = batch.execute()
+    # calendar takes 50 a batch
+    assert(server.batches == 3 and len(server.calls) == 120 and len(batch) == 0)
+    assert([r.response for r in results] == [f"e{i}" for i in range(120)])
+    assert(all(results))
+
+def test_partial_failure(server):
+    server.handler = lambda call: error(404, "notFound") if event_id(call) in ('e1', 'e3') else {}
+    results = deletes(5).execute()
+    assert([bool(r) for r in results] == [True, False, True, False, True])
+    assert(results[1].exception.resp.status == 404)
+    # not worth retrying
+    assert(len(server.calls) == 5)
+
+def test_retry_failed(server):
+    failed = {'e1': error(503), 'e2': error(429, "rateLimitExceeded")}
+    server.handler = lambda call: failed.pop(event_id(call), {})
+    results = deletes(4).execute()
+    # deletes are writes so only the rate limited one is sent again
+    assert([bool(r) for r in results] == [True, False, True, True])
+    assert([event_id(c) for c in server.calls[4:]] == ['e2'])
+    failed = {'e1': error(429)}
+    results = Batch("calendar", "v3", retry_failed=False).add(
+        gws.get_service("calendar", "v3").events().delete(calendarId='primary', eventId='e1')).execute()
+    assert(not results[0] and len(server.calls) == 6)
+
+def test_whole_batch_retry(server):
+    gws.quota = QuotaLimiter({'calendar': {'read': 60, 'write': 60}}, period=1e9, burst=100)
+    server.batch_failures = [503]
+    service = gws.get_service("calendar", "v3")
+    batch = Batch("calendar", "v3")
+    for i in range(3):
+        batch.add(service.events().get(calendarId='primary', eventId=f"e{i}"))
+    assert(all(batch.execute()))
+    # both attempts took a token per request
+    assert(server.batches == 2)
+    assert(round(gws.quota.bucket('calendar', 'read')._tokens) == 54)
+    # a batch of writes isn't sent again as it may have been applied
+    server.batch_failures = [503]
+    results = deletes(3).execute()
+    assert(server.batches == 3 and not any(results))
+    assert(results[0].exception.resp.status == 503)
+
+def test_metrics(server):
+    from brettgws.metrics import HistogramSink
+    records = []
+    class Sink(HistogramSink):
+        def record(self, record):
+            records.append(record)
+    gws.metrics.add_sink(Sink())
+    failed = {'e1': error(429, "rateLimitExceeded")}
+    server.handler = lambda call: failed.pop(event_id(call), {})
+    batch = deletes(3)
+    resent = batch._requests[1][0]
+    postproc = resent.postproc
+    assert(all(batch.execute()))
+    # the batch went through with a response, then e1 was sent again on its own
+    assert([(r.service, r.method, r.status) for r in records] ==
+           [('batch', 'batch', 200), ('calendar', 'events.delete', 200)])
+    assert(records[0].request_bytes > 0 and records[0].response_bytes > 0 and records[0].error is None)
+    # and each call left the request as it found it
+    assert(resent.postproc is postproc)
@@ -0,0 +1,179 @@
+import datetime
+import time
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from brettgws.calendar import Event, EventDateTime, FreeBusy, _windows
+from brettgws.resources import GoogleWorkSpaceResourceBase
+
+def test_windows():
+    w = _windows("2020-01-01T00:00:00+00:00", "2024-01-01T00:00:00+00:00", 4)
+    assert(len(w) == 4)
+    assert(w[0][0] == "2020-01-01T00:00:00+00:00" and w[-1][1] == "2024-01-01T00:00:00+00:00")
+    # contiguous
+    assert(all(w[i][1] == w[i + 1][0] for i in range(3)))
+    assert(_windows("2020-01-01T00:00:00+00:00", "2020-01-01T00:00:02+00:00", 8) ==
+           [("2020-01-01T00:00:00+00:00", "2020-01-01T00:00:01+00:00"),
+            ("2020-01-01T00:00:01+00:00", "2020-01-01T00:00:02+00:00")])
+
+def test_list_args_timezones():
+    args = Event._list_args("cal", {'timeMin': "2024-01-01T09:00:00", 'timeZone': "America/New_York"})
+    assert(args['calendarId'] == "cal")
+    assert(args['timeMin'] == "2024-01-01T09:00:00-05:00")
+
+def test_lazy_decode():
+    raw = {'id': "e", 'updated': "2024-02-03T04:05:06.789Z",
+           'start': {'dateTime': "2024-03-01T09:00:00-05:00", 'timeZone': "America/New_York"},
+           'end': {'date': "2024-03-02", 'dateTime': "2024-03-01T10:00:00-05:00"}}
+    eager = Event(**raw)
+    GoogleWorkSpaceResourceBase.lazy_decode = True
+    try:
+        lazy = Event(**raw)
+        # kept raw until read
+        assert(lazy.__dict__['updated'] == raw['updated'] and isinstance(lazy.__dict__['start'], dict))
+        assert(isinstance(lazy.start, EventDateTime) and lazy.start.__dict__['timeZone'] == "America/New_York")
+        assert(lazy.start.timeZone == ZoneInfo("America/New_York"))
+        assert(lazy.end.date is None)
+        assert(lazy == eager and lazy.to_base() == eager.to_base())
+    finally:
+        GoogleWorkSpaceResourceBase.lazy_decode = False
+
+def test_freebusy(server):
+    busy = {'c0': [{'start': '2024-01-01T09:00:00Z', 'end': '2024-01-01T10:00:00Z'}],
+            'c1': [{'start': '2024-01-01T09:30:00Z', 'end': '2024-01-01T11:00:00Z'}]}
+    def handler(call):
+        return {'calendars': {i['id']: {'errors': [{'domain': 'global', 'reason': 'notFound'}]}
+                              if i['id'] == 'bad' else {'busy': busy.get(i['id'], [])}
+                              for i in call.body['items']}}
+    server.handler = handler
+    ids = [f"c{i}" for i in range(119)] + ['bad']
+    fb = FreeBusy.query(ids, '2024-01-01T08:00:00+00:00', '2024-01-01T12:00:00+00:00')
+    # 50 calendars a request
+    assert([len(c.body['items']) for c in server.calls] == [50, 50, 20])
+    assert(len(fb.busy) == 119 and 'bad' not in fb.busy and fb.errors['bad'][0]['reason'] == 'notFound')
+    utc = datetime.timezone.utc
+    assert(fb.free() == [(datetime.datetime(2024, 1, 1, 8, tzinfo=utc), datetime.datetime(2024, 1, 1, 9, tzinfo=utc)),
+                         (datetime.datetime(2024, 1, 1, 11, tzinfo=utc), datetime.datetime(2024, 1, 1, 12, tzinfo=utc))])
+    assert(fb.first_free(datetime.timedelta(minutes=90)) is None)
+    assert(fb.first_free(datetime.timedelta(minutes=30), ['c1']) ==
+           (datetime.datetime(2024, 1, 1, 8, tzinfo=utc), datetime.datetime(2024, 1, 1, 8, 30, tzinfo=utc)))
+    assert(fb.first_free(datetime.timedelta(hours=2), ['c2'])[0] == datetime.datetime(2024, 1, 1, 8, tzinfo=utc))
+    # nothing is known about the calendar that errored, so it isn't free
+    with pytest.raises(ValueError, match='notFound'):
+        fb.free(['c0', 'bad'])
+    with pytest.raises(ValueError):
+        fb.first_free(datetime.timedelta(minutes=30), ['unknown'])
+
+def test_freebusy_time_zone(server):
+    server.handler = lambda call: {'calendars': {'c0': {'busy': [{'start': '2024-01-01T14:00:00Z',
+                                                                 'end': '2024-01-01T15:00:00Z'}]}}}
+    # naive times are in the timeZone asked for, 09:00 New York is 14:00Z
+    fb = FreeBusy.query(['c0'], datetime.datetime(2024, 1, 1, 8), '2024-01-01T12:00:00', 'America/New_York')
+    assert(server.calls[0].body['timeMin'] == '2024-01-01T08:00:00-05:00')
+    assert(server.calls[0].body['timeMax'] == '2024-01-01T12:00:00-05:00')
+    utc = datetime.timezone.utc
+    assert(fb.free() == [(datetime.datetime(2024, 1, 1, 13, tzinfo=utc), datetime.datetime(2024, 1, 1, 14, tzinfo=utc)),
+                         (datetime.datetime(2024, 1, 1, 15, tzinfo=utc), datetime.datetime(2024, 1, 1, 17, tzinfo=utc))])
+
+def test_bulk(server):
+    from conftest import error
+    server.reverse_batches = True
+    def handler(call):
+        if call.method == 'POST':
+            if call.body['summary'] == 'bad':
+                return error(400, "invalid")
+            if call.body['summary'] == 'limited':
+                return error(429, "rateLimitExceeded")
+            return dict(call.body, id=f"id-{call.body['summary']}", kind='calendar#event')
+        if call.method == 'PUT':
+            return call.body if call.body['id'] != 'gone' else error(404, "notFound")
+        return {} if not call.path.endswith('/gone') else error(410, "deleted")
+    server.handler = handler
+    events = [Event(summary=str(i)) for i in range(60)]
+    events[7].summary = 'bad'
+    events[41].summary = 'limited'
+    results = Event.insert_many('primary', events)
+    assert(server.batches == 2 and len(server.calls) == 60)
+    assert([bool(r) for r in results] == [i not in (7, 41) for i in range(60)])
+    # results line up with the events passed in, which are filled out
+    assert(results[3].response is events[3] and events[3].id == 'id-3' and events[59].id == 'id-59')
+    assert(results[7].exception.resp.status == 400 and events[7].id is None)
+    assert(results[41].exception.resp.status == 429)
+    results = Event.update_many('primary', [{'id': 'a', 'summary': 'x'}, {'id': 'gone', 'summary': 'y'},
+                                            {'id': 'b', 'summary': 'z'}])
+    assert([r.response.id if r else r.exception.resp.status for r in results] == ['a', 404, 'b'])
+    results = Event.delete_many('primary', ['a', 'gone', Event(id='b')])
+    assert([bool(r) for r in results] == [True, False, True])
+    assert(server.paths('DELETE')[-1].endswith('/events/b'))
+
+def test_stream_close(server):
+    def handler(call):
+        page = int(call.params.get('pageToken', 0))
+        return {'items': [{'id': f"{page}-{i}"} for i in range(2)], 'nextPageToken': str(page + 1)}
+    server.handler = handler
+    for prefetch in (False, True):
+        server.calls.clear()
+        stream = Event.stream('primary', prefetch=prefetch)
+        assert([next(stream).id for _ in range(5)] == ['0-0', '0-1', '1-0', '1-1', '2-0'])
+        stream.close()
+        # the endless listing stops with the consumer, prefetch having at most the next page in flight
+        assert(len(server.calls) == (4 if prefetch else 3))
+        assert(all(c.thread.startswith('brettgws-prefetch') == prefetch for c in server.calls))
+    time.sleep(0.05)
+    assert(len(server.calls) == 4)
+
+def test_list_sharded(server):
+    def handler(call):
+        # each window has its own event and the one straddling every window edge
+        items = [{'id': call.params['timeMin'], 'summary': 'own'}, {'id': 'long', 'summary': 'long'}]
+        if 'id' not in call.params.get('fields', 'id'):
+            items = [{'summary': i['summary']} for i in items]
+        return {'items': items}
+    server.handler = handler
+    events = Event.list_sharded('primary', shards=3, timeMin='2024-01-01T00:00:00+00:00',
+                                timeMax='2024-01-04T00:00:00+00:00')
+    assert(len(server.calls) == 3)
+    assert([e.id for e in events] == ['2024-01-01T00:00:00+00:00', 'long',
+                                      '2024-01-02T00:00:00+00:00', '2024-01-03T00:00:00+00:00'])
+    # a mask without the id still has it asked for so events aren't collapsed into one
+    server.calls.clear()
+    events = Event.list_sharded('primary', shards=3, fields="summary", timeMin='2024-01-01T00:00:00+00:00',
+                                timeMax='2024-01-04T00:00:00+00:00')
+    assert(server.calls[0].params['fields'] == "nextPageToken,nextSyncToken,timeZone,items(id,summary)")
+    assert(len(events) == 4)
+
+def test_fields_mask(server):
+    def handler(call):
+        # the server only sends back the top level fields asked for
+        wanted = call.params['fields'].split('items')[0]
+        page = int(call.params.get('pageToken', 0))
+        response = {'items': [{'id': f"{page}"}], 'timeZone': 'America/New_York'}
+        response['nextPageToken' if page == 0 else 'nextSyncToken'] = str(page + 1)
+        return {k: v for k, v in response.items() if k == 'items' or k in wanted}
+    server.handler = handler
+    assert([e.id for e in Event.list(fields="items(id)")] == ['0', '1'])
+    assert(server.calls[0].params['fields'] == "nextPageToken,nextSyncToken,timeZone,items(id)")
+    result = Event.sync(fields="items(id)")
+    assert(result.sync_token == '2' and result.time_zone == 'America/New_York')
+
+def test_list_many(server):
+    from conftest import error
+    def handler(call):
+        cid = call.path.split('/')[-2]
+        if cid == 'missing':
+            return error(404, "notFound")
+        # the first calendars take longest so finish last
+        time.sleep(0.05 if cid == 'c0' else 0.0)
+        return {'items': [{'id': f"{cid}-e"}]}
+    server.handler = handler
+    ids = [f"c{i}" for i in range(6)]
+    results = Event.list_many(ids, max_workers=3)
+    assert(list(results) == ids and [r[0].id for r in results.values()] == [f"{c}-e" for c in ids])
+    assert(next(Event.stream_many(ids, max_workers=6))[0] != 'c0')
+    with pytest.raises(Exception) as e:
+        Event.list_many(['c1', 'missing', 'c2'])
+    assert(e.value.resp.status == 404)
+    results = Event.list_many(['c1', 'missing', 'c2'], return_exceptions=True)
+    assert(list(results) == ['c1', 'missing', 'c2'] and results['missing'].resp.status == 404)
+    assert(results['c2'][0].id == 'c2-e')
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from brettgws.credstore import CredentialStore
+
+def test_roundtrip(tmp_path):
+    store = CredentialStore(tmp_path / "tokens.json")
+    assert(store.load() is None)
+    info = {'refresh_token': 'r', 'token': 't', 'scopes': ['openid']}
+    with store.lock():
+        with store.lock():
+            store.save(info)
+    assert(store.load() == info)
+    assert(json.loads((tmp_path / "tokens.json").read_text()) == info)
+    assert(not list(tmp_path.glob("*.tmp")))
+
+def test_reload_on_change(tmp_path):
+    path = tmp_path / "tokens.json"
+    store = CredentialStore(path)
+    store.save({'token': 'a'})
+    # another process writes the file
+    other = CredentialStore(path)
+    other.save({'token': 'bb'})
+    assert(store.load() == {'token': 'bb'})
+    store.remove()
+    assert(store.load() is None)
+    assert(not path.exists())
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from brettgws import discovery
+from brettgws.access import gws
+
+@pytest.fixture
+def offline(monkeypatch):
+    """
+    Anything that would go looking for a discovery document over the network fails.
+    """
+    import urllib.request
+    import googleapiclient.discovery
+    def refuse(*args, **kwargs):
+        raise AssertionError("discovery document fetched")
+    monkeypatch.setattr(urllib.request, 'urlopen', refuse)
+    monkeypatch.setattr(googleapiclient.discovery, 'build', refuse)
+    discovery.clear()
+    yield
+    discovery.clear()
+
+def test_bundled(server, offline):
+    for name, version in (s.split(':') for s in discovery.SERVICES):
+        doc = discovery.document(name, version)
+        assert(doc == discovery.document_path(name, version).read_text(encoding='utf-8'))
+        # held for the process rather than read again
+        assert(discovery.document(name, version) is doc)
+        assert(json.loads(doc)['name'] == name and json.loads(doc)['version'] == version)
+    calendar = gws.get_service('calendar', 'v3')
+    request = calendar.events().list(calendarId='primary')
+    assert(request.methodId == 'calendar.events.list')
+    assert(request.uri.startswith('https://www.googleapis.com/calendar/v3/calendars/primary/events'))
+    sheets = gws.get_service('sheets', 'v4')
+    assert(sheets.spreadsheets().get(spreadsheetId='s').methodId == 'sheets.spreadsheets.get')
+
+def test_discovery_dir(server, offline, tmp_path):
+    doc = json.loads(discovery.document('calendar', 'v3'))
+    doc['rootUrl'] = 'https://calendar.example.com/'
+    discovery.document_path('calendar', 'v3', tmp_path).write_text(json.dumps(doc), encoding='utf-8')
+    gws.discovery_dir = tmp_path
+    request = gws.get_service('calendar', 'v3').calendars().get(calendarId='primary')
+    assert(request.uri.startswith('https://calendar.example.com/'))
+    # the bundled documents are still used for whatever isn't in the directory
+    assert(gws.get_service('sheets', 'v4') is not None)
+
+def test_missing_document(server):
+    from googleapiclient.errors import UnknownApiNameOrVersion
+    discovery.clear()
+    assert(discovery.document('nosuchapi', 'v1') is None)
+    # neither bundled nor shipped with the client, build() gives up without fetching
+    with pytest.raises(UnknownApiNameOrVersion):
+        gws.get_service('nosuchapi', 'v1')
+
+def test_regenerate(monkeypatch, tmp_path, capsys):
+    fetched = []
+    def fetch(name, version, timeout=30):
+        fetched.append(f"{name}:{version}")
+        return {'name': name, 'version': version, 'rootUrl': 'https://example.com/', 'resources': {}}
+    monkeypatch.setattr(discovery, 'fetch', fetch)
+    discovery.clear()
+    try:
+        assert(json.loads(discovery.document('calendar', 'v3', tmp_path))['rootUrl'] != 'https://example.com/')
+        written = discovery.regenerate(tmp_path, ['calendar:v3'])
+        assert(written == [tmp_path / 'calendar.v3.json'] and fetched == ['calendar:v3'])
+        # what was written is what is read back, the earlier read having been dropped
+        assert(json.loads(discovery.document('calendar', 'v3', tmp_path)) == fetch('calendar', 'v3'))
+        assert(not list(tmp_path.glob('*.tmp')))
+        discovery.main(['--dir', str(tmp_path), 'sheets:v4'])
+        assert(capsys.readouterr().out.strip() == str(tmp_path / 'sheets.v4.json'))
+    finally:
+        discovery.clear()
+
+def test_fetch_error(monkeypatch):
+    pytest.importorskip("googleapiclient")
+    import urllib.request
+    def unreachable(url, timeout=None):
+        raise OSError(f"unreachable {url}")
+    monkeypatch.setattr(urllib.request, 'urlopen', unreachable)
+    with pytest.raises(RuntimeError, match='calendar:v3') as e:
+        discovery.fetch('calendar', 'v3')
+    assert(isinstance(e.value.__cause__, OSError))
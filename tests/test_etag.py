@@ -0,0 +1,61 @@
+from brettgws.access import gws
+from brettgws.calendar import Calendar
+
+def calendar_server(server, etag):
+    """
+    Answers calendars.get with the calendar at etag[0], or a 304 if the client has it.
+    """
+    def handler(call):
+        if call.headers.get('If-None-Match', None) == etag[0]:
+            return 304, b''
+        return {'kind': "calendar#calendar", 'etag': etag[0], 'id': 'primary',
+                'summary': f"cal {etag[0]}", 'timeZone': 'UTC'}
+    server.handler = handler
+
+def test_hit_and_miss(server):
+    etag = ['"1"']
+    calendar_server(server, etag)
+    gws.etag_cache = {'enabled': True}
+    first = Calendar.get()
+    assert(first.summary == 'cal "1"' and 'If-None-Match' not in server.calls[0].headers)
+    again = Calendar.get()
+    assert(server.calls[1].headers['If-None-Match'] == '"1"')
+    assert(again == first and again is not first)
+    assert((gws.etag_cache.hits, gws.etag_cache.misses) == (1, 1))
+    etag[0] = '"2"'
+    changed = Calendar.get()
+    assert(changed.summary == 'cal "2"' and gws.etag_cache.misses == 2)
+
+def test_get_and_refresh(server):
+    etag = ['"1"']
+    calendar_server(server, etag)
+    gws.etag_cache = {'enabled': True}
+    calendar = Calendar.get()
+    assert(calendar.refresh() is False)
+    etag[0] = '"2"'
+    assert(calendar.refresh() is True)
+    assert(calendar.summary == 'cal "2"' and calendar.etag == '"2"')
+    # the entry refresh() left behind is still a Calendar for get()
+    cached = Calendar.get()
+    assert(isinstance(cached, Calendar) and cached.summary == 'cal "2"')
+    assert(server.calls[-1].headers['If-None-Match'] == '"2"' and gws.etag_cache.hits == 2)
+
+def test_disabled(server):
+    etag = ['"1"']
+    calendar_server(server, etag)
+    calendar = Calendar.get()
+    assert(Calendar.get() == calendar)
+    assert(calendar.refresh() is True)
+    assert(all('If-None-Match' not in c.headers for c in server.calls))
+    assert(len(gws.etag_cache) == 0)
+
+def test_counters_threaded(server):
+    from concurrent.futures import ThreadPoolExecutor
+    from brettgws.etag import ETagCache
+    cache = ETagCache(enabled=True)
+    def count(i):
+        for _ in range(1000):
+            cache.hit() if i % 2 else cache.miss()
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(count, range(8)))
+    assert(cache.hits == 4000 and cache.misses == 4000)
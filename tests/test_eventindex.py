@@ -0,0 +1,56 @@
+import datetime
+import random
+
+from brettgws.calendar import Event
+from brettgws.eventindex import EventIndex
+
+def event(id, start, end):
+    key = 'date' if len(start) == 10 else 'dateTime'
+    return Event(id=id, start={key: start}, end={key: end})
+
+def ids(events):
+    return [e.id for e in events]
+
+def test_queries():
+    index = EventIndex([event('a', '2024-01-01T09:00:00+00:00', '2024-01-01T10:00:00+00:00'),
+                        event('b', '2024-01-01T10:30:00+01:00', '2024-01-01T12:00:00+01:00'),
+                        event('c', '2024-01-01', '2024-01-02'),
+                        event('d', '2024-01-01T15:00:00', '2024-01-01T16:00:00')],
+                       all_day_tz='America/New_York')
+    assert(len(index) == 4)
+    # b is 09:30-11:00 UTC, c is 05:00 UTC to 05:00 UTC the next day
+    assert(ids(index.at('2024-01-01T09:45:00+00:00')) == ['c', 'a', 'b'])
+    assert(ids(index.at('2024-01-01T04:00:00+00:00')) == [])
+    assert(ids(index.overlapping('2024-01-01T10:00:00+00:00', '2024-01-01T15:00:00+00:00')) == ['c', 'b'])
+    assert(ids(index.within('2024-01-01T09:00:00+00:00', '2024-01-01T16:00:00+00:00')) == ['a', 'b', 'd'])
+    assert(ids(index.conflicts(index.at('2024-01-01T09:15:00+00:00')[1])) == ['c', 'b'])
+    assert(ids(index.nearest('2024-01-02T06:00:00+00:00', 2)) == ['c', 'd'])
+
+def test_insert_remove():
+    index = EventIndex()
+    index.insert(event('a', '2024-01-01T09:00:00+00:00', '2024-01-01T10:00:00+00:00'))
+    index.insert(event('a', '2024-01-01T11:00:00+00:00', '2024-01-01T12:00:00+00:00'))
+    assert(len(index) == 1 and ids(index.at('2024-01-01T11:30:00+00:00')) == ['a'])
+    assert(index.at('2024-01-01T09:30:00+00:00') == [])
+    assert(index.remove('a') and not index.remove('a') and 'a' not in index)
+
+def test_against_scan():
+    rng = random.Random(7)
+    base = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    def random_event(id):
+        s = base + datetime.timedelta(minutes=rng.randrange(0, 10000))
+        return event(id, s.isoformat(), (s + datetime.timedelta(minutes=rng.randrange(1, 600))).isoformat())
+    live = {str(i): random_event(str(i)) for i in range(300)}
+    index = EventIndex(live.values())
+    for i in range(300):
+        if rng.random() < 0.5:
+            live[str(i)] = random_event(str(i))
+            index.insert(live[str(i)])
+        else:
+            assert(index.remove(str(i)) == (live.pop(str(i), None) is not None))
+        if i % 25 == 0:
+            s = base + datetime.timedelta(minutes=rng.randrange(0, 10000))
+            e = s + datetime.timedelta(minutes=rng.randrange(1, 300))
+            want = sorted(k for k, ev in live.items() if ev.start.dateTime < e and ev.end.dateTime > s)
+            assert(sorted(ids(index.overlapping(s, e))) == want)
+            assert(len(index) == len(live))
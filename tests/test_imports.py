@@ -0,0 +1,22 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# importing the support modules should not drag in the Google client,
+# that only happens once a connection or service is actually needed
+HEAVY = ["google.auth", "google.oauth2", "google_auth_oauthlib",
+         "googleapiclient", "httplib2", "requests", "httpx", "asyncio"]
+
+def _loaded(module: str) -> list[str]:
+    code = f"import sys, {module}\nprint(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    r = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                       env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+    return r.stdout.split()
+
+@pytest.mark.parametrize("module", ["brettgws.sheets", "brettgws.sheets.a1",
+                                    "brettgws.sheets.spreadsheet", "brettgws.calendar",
+                                    "brettgws.access"])
+def test_lazy_imports(module):
+    assert(_loaded(module) == [])
@@ -0,0 +1,34 @@
+import datetime
+
+from brettgws.intervals import IntervalSet, common_free, merge
+
+def t(h, m=0):
+    return datetime.datetime(2024, 1, 1, h, m, tzinfo=datetime.timezone.utc)
+
+def test_merge():
+    assert(merge([(t(9), t(10)), (t(11), t(12)), (t(9, 30), t(11)), (t(13), t(13))]) == [(t(9), t(12))])
+    # naive and dates compare as UTC
+    assert(merge([("2024-01-01T09:00:00", "2024-01-01T10:00:00+00:00")]) == [(t(9), t(10))])
+    assert(merge([(datetime.date(2024, 1, 1), datetime.date(2024, 1, 2))])[0][0] == t(0))
+
+def test_free():
+    busy = IntervalSet([(t(9), t(10)), (t(12), t(13))])
+    assert(busy.free(t(8), t(14)) == [(t(8), t(9)), (t(10), t(12)), (t(13), t(14))])
+    assert(busy.free(t(9, 30), t(12, 30)) == [(t(10), t(12))])
+    assert(busy.first_free(datetime.timedelta(hours=1, minutes=30), t(8), t(18)) == (t(10), t(11, 30)))
+    assert(busy.first_free(datetime.timedelta(hours=3), t(8), t(14)) is None)
+    assert(busy.contains(t(9, 59)) and not busy.contains(t(10)))
+
+def test_add():
+    busy = IntervalSet([(t(9), t(10)), (t(12), t(13))])
+    busy.add(t(14), t(15))
+    busy.add(t(7), t(8))
+    assert(len(busy) == 4)
+    busy.add(t(9, 30), t(12))
+    assert(busy.intervals == [(t(7), t(8)), (t(9), t(13)), (t(14), t(15))])
+    assert(busy == IntervalSet(busy.intervals))
+
+def test_common_free():
+    a = IntervalSet([(t(9), t(10))])
+    b = IntervalSet([(t(10), t(11)), (t(13), t(14))])
+    assert(common_free([a, b], t(9), t(15), datetime.timedelta(hours=1)) == [(t(11), t(13)), (t(14), t(15))])
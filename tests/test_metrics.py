@@ -0,0 +1,54 @@
+import pytest
+
+from brettgws.metrics import CallRecord, HistogramSink, Metrics, MetricsSink, PrometheusTextfileSink
+
+class FakeResp(dict):
+    def __init__(self, status):
+        super().__init__()
+        self.status = status
+
+class FakeRequest():
+    methodId = 'sheets.spreadsheets.values.batchUpdate'
+    body = '{"data": []}'
+
+    def postproc(self, resp, content):
+        return content
+
+def test_call_record():
+    metrics = Metrics()
+    request = FakeRequest()
+    assert(metrics.start(request) is None)
+    hist = metrics.add_sink(HistogramSink())
+    call = metrics.start(request, page=2)
+    call.attempts = 3
+    assert(request.postproc(FakeResp(200), b'abcd') == b'abcd')
+    call.finish()
+    s = hist.snapshot()[('sheets', 'spreadsheets.values.batchUpdate')]
+    assert(s['count'] == 1)
+    assert(s['request_bytes'] == 12)
+    assert(s['response_bytes'] == 4)
+    assert(s['retries'] == 2)
+    assert(s['pages'] == 1)
+    assert(s['statuses'] == {200: 1})
+
+def test_prometheus(tmp_path):
+    sink = PrometheusTextfileSink(tmp_path / "gws.prom", interval=3600)
+    sink.record(CallRecord('calendar', 'events.list', 0.2, 0, 100, 200, 1, 1))
+    sink.record(CallRecord('calendar', 'events.list', 3.0, 0, 50, 429, 5, None, 'HttpError'))
+    sink.flush()
+    text = (tmp_path / "gws.prom").read_text()
+    assert('brettgws_request_duration_seconds_bucket{service="calendar",method="events.list",le="0.25"} 1' in text)
+    assert('brettgws_request_duration_seconds_count{service="calendar",method="events.list"} 2' in text)
+    assert('brettgws_requests_total{service="calendar",method="events.list",status="429"} 1' in text)
+    assert('brettgws_retries_total{service="calendar",method="events.list"} 6' in text)
+
+def test_sink_base():
+    with pytest.raises(TypeError):
+        MetricsSink()
+    class Sink(MetricsSink):
+        def record(self, record):
+            self.last = record
+    sink = Sink()
+    sink.record(CallRecord('calendar'))
+    sink.flush()
+    assert(sink.last.service == 'calendar')
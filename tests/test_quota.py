@@ -0,0 +1,44 @@
+import pytest
+
+from brettgws.quota import QuotaLimiter, TokenBucket, operation_class
+
+class FakeRequest():
+    def __init__(self, methodId, method="GET"):
+        self.methodId = methodId
+        self.method = method
+
+def test_operation_class():
+    assert(operation_class(FakeRequest('sheets.spreadsheets.values.batchGet')) == 'read')
+    assert(operation_class(FakeRequest('sheets.spreadsheets.values.batchUpdate', 'POST')) == 'write')
+    assert(operation_class(FakeRequest('calendar.events.delete', 'DELETE')) == 'write')
+    assert(operation_class(FakeRequest('calendar.freebusy.query', 'POST')) == 'read')
+
+def test_bucket_paces():
+    b = TokenBucket(rate=10, capacity=2)
+    assert(b.reserve() == 0)
+    assert(b.reserve() == 0)
+    # out of burst, each further token is another 1/rate out
+    assert(b.reserve() == pytest.approx(0.1, abs=0.01))
+    assert(b.reserve() == pytest.approx(0.2, abs=0.01))
+
+def test_limiter_keys():
+    q = QuotaLimiter({'sheets': {'read': 60}}, burst=1)
+    read = FakeRequest('sheets.spreadsheets.get')
+    assert(q.delay(read) == 0)
+    assert(q.delay(read) > 0)
+    # separate buckets per user, and unlisted classes or services are not limited
+    assert(q.delay(read, 'someone@example.com') == 0)
+    assert(q.delay(FakeRequest('sheets.spreadsheets.batchUpdate', 'POST')) == 0)
+    assert(q.delay(FakeRequest('calendar.events.list')) == 0)
+    q.enabled = False
+    assert(q.delay(read) == 0)
+
+def test_bucket_eviction():
+    q = QuotaLimiter({'calendar': {'read': 60}}, burst=1, max_buckets=2)
+    read = FakeRequest('calendar.events.get')
+    for user in ('a', 'b', 'a', 'c'):
+        q.delay(read, user)
+    # b was the least recently used
+    assert(list(q._buckets) == [('calendar', 'read', 'a'), ('calendar', 'read', 'c')])
+    assert(q.delay(read, 'a') > 0 and q.delay(read, 'b') == 0)
+    assert(len(q._buckets) == 2 and q.config['max_buckets'] == 2)
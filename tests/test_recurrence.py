@@ -0,0 +1,48 @@
+import datetime
+
+import pytest
+
+pytest.importorskip("dateutil")
+
+from brettgws.calendar import Event
+from brettgws.recurrence import expand, instances
+
+def weekly(**kwargs):
+    return Event(id='w', status='confirmed', summary='standup',
+                 start={'dateTime': '2024-03-04T09:00:00-05:00', 'timeZone': 'America/New_York'},
+                 end={'dateTime': '2024-03-04T09:30:00-05:00', 'timeZone': 'America/New_York'},
+                 **kwargs)
+
+def starts(events):
+    return [e.start.dateTime.astimezone(datetime.timezone.utc).strftime('%m-%d %H:%M') for e in events]
+
+def test_rules():
+    master = weekly(recurrence=['RRULE:FREQ=WEEKLY;UNTIL=20240401T000000Z',
+                                'EXDATE;TZID=America/New_York:20240318T090000',
+                                'RDATE;TZID=America/New_York:20240320T100000'])
+    got = list(instances(master, '2024-03-01T00:00:00+00:00', '2024-04-30T00:00:00+00:00'))
+    # the wall clock time holds across the DST change on the 10th
+    assert(starts(got) == ['03-04 14:00', '03-11 13:00', '03-20 14:00', '03-25 13:00'])
+    assert(got[1].id == 'w_20240311T130000Z' and got[1].recurringEventId == 'w' and got[1].recurrence is None)
+    assert(got[1].end.dateTime - got[1].start.dateTime == datetime.timedelta(minutes=30))
+    # an instance in progress at the start of the window is included
+    assert(starts(instances(master, '2024-03-11T13:15:00+00:00', '2024-03-12T00:00:00+00:00')) == ['03-11 13:00'])
+
+def test_exceptions():
+    master = weekly(recurrence=['RRULE:FREQ=WEEKLY;COUNT=4'])
+    moved = Event(id='w_20240311T130000Z', recurringEventId='w', status='confirmed', summary='moved',
+                  originalStartTime={'dateTime': '2024-03-11T09:00:00-04:00', 'timeZone': 'America/New_York'},
+                  start={'dateTime': '2024-03-26T15:00:00+00:00'}, end={'dateTime': '2024-03-26T16:00:00+00:00'})
+    cancelled = Event(id='w_20240318T130000Z', recurringEventId='w', status='cancelled',
+                      originalStartTime={'dateTime': '2024-03-18T13:00:00+00:00'})
+    single = Event(id='s', status='confirmed', start={'date': '2024-03-12'}, end={'date': '2024-03-13'})
+    got = list(expand([cancelled, single, master, moved], '2024-03-01', '2024-04-01'))
+    assert([e.id for e in got] == ['w_20240304T140000Z', 's', 'w_20240325T130000Z', 'w_20240311T130000Z'])
+    assert(got[-1].summary == 'moved')
+
+def test_all_day():
+    master = Event(id='a', start={'date': '2024-01-29'}, end={'date': '2024-01-30'},
+                   recurrence=['RRULE:FREQ=DAILY;UNTIL=20240202T000000Z', 'EXDATE;VALUE=DATE:20240131'])
+    got = list(instances(master, '2024-01-30', datetime.date(2024, 2, 10)))
+    assert([e.start.date.isoformat() for e in got] == ['2024-01-30', '2024-02-01', '2024-02-02'])
+    assert(got[0].id == 'a_20240130' and got[0].end.date == datetime.date(2024, 1, 31))
@@ -0,0 +1,49 @@
+from dataclasses import asdict, fields
+
+import pytest
+
+from brettgws.calendar import Event, _items_fields, _with_item_id
+from brettgws.sheets.resources import Spreadsheet
+
+def test_fields_mask():
+    assert(Event.fields_mask('id', 'start', 'end', 'updated') == "id,start,end,updated")
+    assert(Event.fields_mask(['id', 'attendees(email)', 'start/dateTime']) == "id,attendees(email),start/dateTime")
+    assert(Spreadsheet.fields_mask('spreadsheetId', 'sheets.properties') == "spreadsheetId,sheets.properties")
+    with pytest.raises(ValueError):
+        Event.fields_mask('id', 'nope')
+
+def test_items_fields():
+    assert(_items_fields("id,start") == "nextPageToken,nextSyncToken,items(id,start)")
+    assert(_items_fields(["id", "start"]) == "nextPageToken,nextSyncToken,items(id,start)")
+    # a mask for the whole response keeps paging and syncing
+    assert(_items_fields("items(id,start)") == "nextPageToken,nextSyncToken,items(id,start)")
+    assert(_items_fields("nextPageToken,items(id)") == "nextSyncToken,nextPageToken,items(id)")
+    assert(_items_fields("items/id", ('nextPageToken', 'timeZone')) == "nextPageToken,timeZone,items/id")
+    assert(_with_item_id("nextPageToken,items(start,end)") == "nextPageToken,items(id,start,end)")
+    assert(_with_item_id("nextPageToken,items(id,start)") == "nextPageToken,items(id,start)")
+    assert(_with_item_id("nextPageToken,items/start") == "nextPageToken,items/start,items/id")
+
+def test_partial_decode():
+    e = Event(**{'id': 'e1', 'updated': '2024-01-02T03:04:05+00:00'})
+    assert(e.duration() == (None, None, None, None))
+    assert(not e.all_day())
+    s = Spreadsheet(**{'spreadsheetId': 's', 'properties': {'title': 't'}})
+    assert(s.to_base()['properties']['title'] == 't')
+
+def test_serializers():
+    e = Event(id='e1', summary='', sequence=0, locked=False, created='2024-01-02T03:04:05+00:00',
+              start={'dateTime': '2024-03-01T09:00:00-05:00', 'timeZone': 'America/New_York'},
+              attendees=[{'email': 'a@x'}], reminders={})
+    b = e.to_base()
+    assert(list(b) == [f.name for f in fields(Event)])
+    assert(b['created'] == '2024-01-02 03:04:05+00:00' and b['start'] == {'dateTime': '2024-03-01T09:00:00-05:00',
+                                                                           'timeZone': 'America/New_York'})
+    # containers are copies
+    assert(b['attendees'] == e.attendees and b['attendees'] is not e.attendees)
+    # None and empty left out, falsy numbers kept
+    assert(e.trim() == {'id': 'e1', 'created': b['created'], 'start': b['start'], 'sequence': 0, 'locked': False,
+                        'attendees': [{'email': 'a@x'}]})
+    # nested resources without encoders come out as asdict() would
+    s = Spreadsheet(**{'spreadsheetId': 's', 'sheets': [{'properties': {'title': 'a'}, 'merges': [{'sheetId': 1}]}]})
+    sheet = s.to_base()['sheets'][0]
+    assert(sheet['properties'] == asdict(s.sheets[0].properties) and sheet['merges'] == [asdict(s.sheets[0].merges[0])])
@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+import pytest
+
+from brettgws.retry import RetryBudget, RetryPolicy, retry_after
+
+class FakeResp(dict):
+    def __init__(self, status, **headers):
+        super().__init__(headers)
+        self.status = status
+
+class FakeHttpError(Exception):
+    def __init__(self, status, reason="", **headers):
+        self.resp = FakeResp(status, **headers)
+        self.content = json.dumps({'error': {'errors': [{'reason': reason}]}}).encode()
+
+def flaky(errors, result="ok"):
+    calls = []
+    def f():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return f, calls
+
+def test_retryable():
+    policy = RetryPolicy()
+    assert(policy.retryable(FakeHttpError(429)))
+    assert(policy.retryable(FakeHttpError(503)))
+    assert(policy.retryable(FakeHttpError(403, "userRateLimitExceeded")))
+    assert(not policy.retryable(FakeHttpError(403, "forbidden")))
+    assert(not policy.retryable(FakeHttpError(404)))
+    assert(policy.retryable(ConnectionResetError()))
+    assert(not policy.retryable(ValueError()))
+
+def test_call_retries():
+    policy = RetryPolicy(initial=0, maximum=0)
+    f, calls = flaky([FakeHttpError(500), FakeHttpError(429, **{'retry-after': '0'})])
+    assert(policy.call(f) == "ok")
+    assert(len(calls) == 3)
+    f, calls = flaky([FakeHttpError(404)])
+    with pytest.raises(FakeHttpError):
+        policy.call(f)
+    assert(len(calls) == 1)
+
+def test_max_retries_and_overrides():
+    policy = RetryPolicy(max_retries=2, initial=0, maximum=0,
+                         overrides={'calendar.events.insert': {'max_retries': 0}})
+    f, calls = flaky([FakeHttpError(500)] * 5)
+    with pytest.raises(FakeHttpError):
+        policy.call(f)
+    assert(len(calls) == 3)
+    f, calls = flaky([FakeHttpError(500)])
+    with pytest.raises(FakeHttpError):
+        policy.for_method('calendar.events.insert').call(f)
+    assert(len(calls) == 1)
+    assert(policy.for_method('calendar.events.insert').budget is policy.budget)
+
+def test_budget():
+    budget = RetryBudget(ratio=0.5, initial=1, capacity=2)
+    policy = RetryPolicy(initial=0, maximum=0, budget=budget)
+    f, calls = flaky([FakeHttpError(503)] * 10)
+    with pytest.raises(FakeHttpError):
+        policy.call(f)
+    # the initial 1 plus half a retry deposited by the call
+    assert(len(calls) == 2)
+    assert(budget.balance == 0.5)
+
+def test_retry_after():
+    assert(retry_after(FakeResp(429, **{'retry-after': '7'})) == 7.0)
+    assert(retry_after(FakeResp(429, **{'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'})) == 0.0)
+    assert(retry_after(FakeResp(429)) is None)
+    policy = RetryPolicy(max_retry_after=5)
+    assert(policy.delay(0, FakeHttpError(429, **{'retry-after': '30'})) == 5)
+
+def test_acall():
+    policy = RetryPolicy(initial=0, maximum=0)
+    f, calls = flaky([FakeHttpError(502)])
+    async def af():
+        return f()
+    assert(asyncio.run(policy.acall(af)) == "ok")
+    assert(len(calls) == 2)
+
+class FakeRequest():
+    def __init__(self, methodId, method="GET"):
+        self.methodId = methodId
+        self.method = method
+
+def test_idempotent():
+    policy = RetryPolicy(overrides={'calendar.events.update': {'idempotent': True}})
+    insert = policy.for_request(FakeRequest('calendar.events.insert', 'POST'))
+    assert(insert.idempotent is False and insert.budget is policy.budget)
+    assert(not insert.retryable(FakeHttpError(503)))
+    assert(not insert.retryable(TimeoutError()))
+    assert(insert.retryable(FakeHttpError(429)))
+    assert(insert.retryable(FakeHttpError(403, "rateLimitExceeded")))
+    assert(policy.for_request(FakeRequest('calendar.freebusy.query', 'POST')).retryable(FakeHttpError(503)))
+    assert(policy.for_request(FakeRequest('calendar.events.get')).retryable(TimeoutError()))
+    assert(policy.for_request(FakeRequest('calendar.events.update', 'PUT')).retryable(FakeHttpError(503)))
+    assert(policy.config['overrides']['calendar.events.update']['idempotent'] is True)
+
+def test_writes_not_resent(server):
+    from brettgws.access import gws
+    from brettgws.calendar import Event
+    from conftest import error
+    failures = [error(503), TimeoutError("timed out")]
+    def handler(call):
+        if call.method == 'POST' and failures:
+            f = failures.pop(0)
+            if isinstance(f, Exception):
+                raise f
+            return f
+        return {'kind': 'calendar#event', 'id': 'e1'}
+    server.handler = handler
+    with pytest.raises(Exception) as e:
+        Event.insert('primary', {'summary': 'x'})
+    assert(e.value.resp.status == 503)
+    with pytest.raises(TimeoutError):
+        Event.insert('primary', {'summary': 'x'})
+    assert(len(server.paths('POST')) == 2)
+    # reads are still retried
+    failures.extend([error(503), error(503)])
+    server.handler = lambda call: failures.pop(0) if failures else {'kind': 'calendar#event', 'id': 'e1'}
+    assert(Event.get('primary', 'e1').id == 'e1')
+    assert(len(server.paths('GET')) == 3)
+    # unless a write is marked idempotent
+    gws.retry_policy = {'initial': 0.001, 'maximum': 0.01,
+                        'overrides': {'calendar.events.insert': {'idempotent': True}}}
+    failures.append(error(503))
+    assert(Event.insert('primary', {'summary': 'x'}).id == 'e1')
+    assert(len(server.paths('POST')) == 4)
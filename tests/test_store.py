@@ -0,0 +1,86 @@
+import datetime
+
+from brettgws.calendar import Event, EventSyncResult
+from brettgws.store import CalendarStore
+
+def event(id, start, end, **kwargs):
+    return Event(kind="calendar#event", etag="e", id=id, iCalUID=f"{id}@x",
+                 start={'dateTime': start}, end={'dateTime': end},
+                 updated="2024-01-01T00:00:00+00:00", **kwargs)
+
+def test_apply_and_query():
+    store = CalendarStore()
+    store.apply('cal', EventSyncResult([event('a', '2024-01-01T09:00:00+00:00', '2024-01-01T10:00:00+00:00'),
+                                        event('b', '2024-01-01T11:00:00+01:00', '2024-01-01T12:00:00+01:00', summary='b'),
+                                        event('c', '2024-01-02T09:00:00+00:00', '2024-01-02T10:00:00+00:00')],
+                                       [], 'T1', True))
+    assert(store.sync_token('cal') == 'T1')
+    window = store.between('cal', datetime.datetime(2024, 1, 1, 9, 30, tzinfo=datetime.timezone.utc),
+                           '2024-01-01T23:00:00+00:00')
+    assert([e.id for e in window] == ['a', 'b'])
+    b = store.get('cal', 'b')
+    assert(b.summary == 'b' and b.start.dateTime.utcoffset() == datetime.timedelta(hours=1))
+    assert([e.id for e in store.by_ical_uid('cal', 'c@x')] == ['c'])
+    # delta: a cancelled, c changed
+    store.apply('cal', EventSyncResult([event('c', '2024-01-03T09:00:00+00:00', '2024-01-03T10:00:00+00:00')],
+                                       [Event(id='a', status='cancelled')], 'T2', False))
+    assert([e.id for e in store.events('cal')] == ['b', 'c'])
+    assert(store.get('cal', 'c').start.dateTime.day == 3)
+    assert(store.sync_token('cal') == 'T2')
+    # full resync replaces everything
+    store.apply('cal', EventSyncResult([], [], 'T3', True))
+    assert(store.events('cal') == [])
+    store.close()
+
+def test_sync_gone(server):
+    from conftest import error
+    def handler(call):
+        if 'syncToken' in call.params:
+            if call.params['syncToken'] == 'T1':
+                return error(410, "fullSyncRequired")
+            return {'items': [], 'nextSyncToken': 'T3'}
+        if 'pageToken' not in call.params:
+            return {'items': [event('b', '2024-01-02T09:00:00+00:00', '2024-01-02T10:00:00+00:00').to_base()],
+                    'nextPageToken': 'P2'}
+        return {'items': [event('c', '2024-01-03T09:00:00+00:00', '2024-01-03T10:00:00+00:00').to_base()],
+                'nextSyncToken': 'T2'}
+    server.handler = handler
+    store = CalendarStore()
+    store.apply('cal', EventSyncResult([event('a', '2024-01-01T09:00:00+00:00', '2024-01-01T10:00:00+00:00')],
+                                       [], 'T1', True))
+    result = store.sync('cal', q='standup')
+    # the expired token is dropped and everything listed again, with the query
+    assert(result.full and result.sync_token == 'T2')
+    assert([c.params.get('syncToken') for c in server.calls] == ['T1', None, None])
+    assert(server.calls[0].params.get('q') is None and server.calls[1].params['q'] == 'standup')
+    assert([e.id for e in store.events('cal')] == ['b', 'c'] and store.sync_token('cal') == 'T2')
+    result = store.sync('cal', q='standup')
+    assert(not result.full and store.sync_token('cal') == 'T3')
+    assert([e.id for e in store.events('cal')] == ['b', 'c'])
+    store.close()
+
+def test_all_day_time_zone(server, tmp_path):
+    import sqlite3
+    def all_day(id, start, end):
+        return Event(kind="calendar#event", etag="e", id=id, start={'date': start}, end={'date': end},
+                     updated="2024-01-01T00:00:00+00:00").to_base()
+    server.handler = lambda call: {'items': [all_day('a', '2024-01-02', '2024-01-03')],
+                                   'timeZone': 'America/New_York', 'nextSyncToken': 'T1'}
+    # a store from before time zones were kept
+    path = tmp_path / "events.db"
+    with sqlite3.connect(path) as db:
+        db.execute("CREATE TABLE calendars (calendar_id TEXT PRIMARY KEY, sync_token TEXT, synced TEXT)")
+    db.close()
+    store = CalendarStore(path)
+    assert(store.sync('cal').time_zone == 'America/New_York')
+    assert(str(store.time_zone('cal')) == 'America/New_York')
+    # the day runs midnight to midnight New York time, not UTC
+    assert(store.between('cal', '2024-01-02T00:00:00+00:00', '2024-01-02T05:00:00+00:00') == [])
+    assert([e.id for e in store.between('cal', '2024-01-03T00:00:00+00:00', '2024-01-03T05:00:00+00:00')] == ['a'])
+    # as do dates in the window
+    assert(store.between('cal', datetime.date(2024, 1, 3), datetime.date(2024, 1, 4)) == [])
+    assert([e.id for e in store.between('cal', datetime.date(2024, 1, 2), datetime.date(2024, 1, 3))] == ['a'])
+    # a delta without the time zone keeps the one already known
+    store.apply('cal', EventSyncResult([Event(**all_day('b', '2024-01-04', '2024-01-05'))], [], 'T2', False))
+    assert([e.id for e in store.between('cal', '2024-01-04T04:00:00+00:00', '2024-01-04T06:00:00+00:00')] == ['b'])
+    store.close()
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from brettgws.access import gws
+from brettgws.calendar import Calendar
+from brettgws.transport import HttpTransport, Httplib2Transport, RequestsTransport
+
+def test_from_config():
+    assert(type(HttpTransport.from_config(None)) is Httplib2Transport)
+    t = HttpTransport.from_config({'type': 'requests', 'pool_size': 4, 'timeout': 5})
+    assert(isinstance(t, RequestsTransport) and t.pool_size == 4 and t.timeout == 5)
+    assert(HttpTransport.from_config(t.config).config == t.config)
+    assert(HttpTransport.from_config(t) is t)
+    assert(HttpTransport.from_config('httplib2').config == {'type': 'httplib2', 'timeout': None})
+    with pytest.raises(ValueError):
+        HttpTransport.from_config('carrier-pigeon')
+    with pytest.raises(TypeError):
+        HttpTransport()
+
+def test_requests_transport(server):
+    import requests
+    import requests.adapters
+
+    sent = []
+    class Adapter(requests.adapters.BaseAdapter):
+        def send(self, request, **kwargs):
+            sent.append(request)
+            r = requests.models.Response()
+            r.status_code = 200
+            r.headers['Content-Type'] = 'application/json'
+            r._content = json.dumps({'kind': 'calendar#calendar', 'etag': '"1"', 'id': 'primary'}).encode()
+            r.request = request
+            r.url = request.url
+            return r
+
+        def close(self):
+            pass
+
+    gws.transport = 'requests'
+    transport = gws.transport
+    transport.session.mount('https://', Adapter())
+    assert(Calendar.get().id == 'primary')
+    assert(Calendar.get().id == 'primary')
+    # every service shares the one session, with the token applied per request
+    assert(gws.get_service('calendar', 'v3')._http._transport is transport)
+    assert(sent[0].headers['authorization'] == 'Bearer token')
+    assert(server.builds == 0 and transport.stats == {'requests': 2, 'connections': 0, 'reused': 2})
+    transport.reset_stats()
+    assert(transport.stats['requests'] == 0)
+
+def test_requests_transport_retries(server):
+    import requests
+    import requests.adapters
+
+    failures = [requests.exceptions.ConnectionError("connection reset"), requests.exceptions.ReadTimeout("timed out")]
+    sent = []
+    class Adapter(requests.adapters.BaseAdapter):
+        def send(self, request, **kwargs):
+            sent.append(request.method)
+            if failures:
+                raise failures.pop(0)
+            r = requests.models.Response()
+            r.status_code = 200
+            r.headers['Content-Type'] = 'application/json'
+            r._content = json.dumps({'kind': 'calendar#calendar', 'etag': '"1"', 'id': 'primary'}).encode()
+            r.request = request
+            r.url = request.url
+            return r
+
+        def close(self):
+            pass
+
+    gws.transport = 'requests'
+    gws.transport.session.mount('https://', Adapter())
+    # a dropped keep-alive connection and a read timeout are both sent again for a read
+    assert(Calendar.get().id == 'primary')
+    assert(sent == ['GET', 'GET', 'GET'])
+    # but not for a write
+    failures.append(requests.exceptions.ConnectionError("connection reset"))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        gws.execute(gws.get_service('calendar', 'v3').calendars().insert(body={'summary': 'x'}))
+    assert(sent[3:] == ['POST'])